@@ -0,0 +1,34 @@
+"""task query indexes
+
+Revision ID: 9d4b6f2a8c1e
+Revises: 7c2d4e8f1a3b
+Create Date: 2026-10-16 16:05:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "9d4b6f2a8c1e"
+down_revision: Union[str, None] = "7c2d4e8f1a3b"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.drop_index(op.f("ix_tasks_description"), table_name="tasks")
+    op.drop_index(op.f("ix_tasks_id"), table_name="tasks")
+    op.create_index("ix_tasks_user_id_id", "tasks", ["user_id", "id"], unique=False)
+    op.create_index("ix_tasks_user_id_completed_id", "tasks", ["user_id", "completed", "id"], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_tasks_user_id_completed_id", table_name="tasks")
+    op.drop_index("ix_tasks_user_id_id", table_name="tasks")
+    op.create_index(op.f("ix_tasks_id"), "tasks", ["id"], unique=False)
+    op.create_index(op.f("ix_tasks_description"), "tasks", ["description"], unique=False)
@@ -0,0 +1,35 @@
+"""add task search index
+
+Revision ID: b8e3f5a7c9d2
+Revises: 9d4b6f2a8c1e
+Create Date: 2026-10-16 17:20:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "b8e3f5a7c9d2"
+down_revision: Union[str, None] = "9d4b6f2a8c1e"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(
+        "ix_tasks_search",
+        "tasks",
+        [sa.text("to_tsvector('russian', coalesce(title, '') || ' ' || coalesce(description, ''))")],
+        unique=False,
+        postgresql_using="gin",
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_tasks_search", table_name="tasks")
@@ -0,0 +1,31 @@
+"""add row versions
+
+Revision ID: c4a9d2e6f1b3
+Revises: b8e3f5a7c9d2
+Create Date: 2026-10-16 18:10:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "c4a9d2e6f1b3"
+down_revision: Union[str, None] = "b8e3f5a7c9d2"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column("tasks", sa.Column("version", sa.Integer(), server_default="1", nullable=False))
+    op.add_column("users", sa.Column("version", sa.Integer(), server_default="1", nullable=False))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column("users", "version")
+    op.drop_column("tasks", "version")
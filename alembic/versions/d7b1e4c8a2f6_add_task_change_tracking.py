@@ -0,0 +1,59 @@
+"""add task change tracking
+
+Revision ID: d7b1e4c8a2f6
+Revises: c4a9d2e6f1b3
+Create Date: 2026-10-16 19:05:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "d7b1e4c8a2f6"
+down_revision: Union[str, None] = "c4a9d2e6f1b3"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute(sa.schema.CreateSequence(sa.Sequence("task_change_seq")))
+    op.add_column("tasks", sa.Column("change_seq", sa.BigInteger(), nullable=True))
+    op.add_column(
+        "tasks",
+        sa.Column("updated_at", sa.DateTime(timezone=True), server_default=sa.text("now()"), nullable=False),
+    )
+    op.execute("UPDATE tasks SET change_seq = nextval('task_change_seq')")
+    op.alter_column("tasks", "change_seq", nullable=False)
+    op.create_index("ix_tasks_user_id_change_seq", "tasks", ["user_id", "change_seq", "id"], unique=False)
+
+    op.create_table(
+        "task_tombstones",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("task_id", sa.Integer(), nullable=False),
+        sa.Column("user_id", sa.Integer(), nullable=False),
+        sa.Column("change_seq", sa.BigInteger(), nullable=False),
+        sa.Column("deleted_at", sa.DateTime(timezone=True), server_default=sa.text("now()"), nullable=False),
+        sa.ForeignKeyConstraint(["user_id"], ["users.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(
+        "ix_task_tombstones_user_id_change_seq",
+        "task_tombstones",
+        ["user_id", "change_seq", "task_id"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_task_tombstones_user_id_change_seq", table_name="task_tombstones")
+    op.drop_table("task_tombstones")
+    op.drop_index("ix_tasks_user_id_change_seq", table_name="tasks")
+    op.drop_column("tasks", "updated_at")
+    op.drop_column("tasks", "change_seq")
+    op.execute(sa.schema.DropSequence(sa.Sequence("task_change_seq")))
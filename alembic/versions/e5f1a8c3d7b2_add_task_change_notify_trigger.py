@@ -0,0 +1,67 @@
+"""add task change notify trigger
+
+Revision ID: e5f1a8c3d7b2
+Revises: d7b1e4c8a2f6
+Create Date: 2026-10-17 09:20:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "e5f1a8c3d7b2"
+down_revision: Union[str, None] = "d7b1e4c8a2f6"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# Одно событие на владельца и до 500 ID: NOTIFY ограничивает сообщение 8000 байтами.
+NOTIFY_FUNCTION = """
+CREATE FUNCTION notify_task_changes() RETURNS trigger AS $$
+DECLARE
+    kind text := CASE TG_OP WHEN 'INSERT' THEN 'created' WHEN 'UPDATE' THEN 'updated' ELSE 'deleted' END;
+BEGIN
+    PERFORM pg_notify(
+        'task_changes',
+        json_build_object('user_id', chunks.user_id, 'type', kind, 'ids', chunks.ids)::text
+    )
+    FROM (
+        SELECT numbered.user_id, array_agg(numbered.id ORDER BY numbered.id) AS ids
+        FROM (
+            SELECT user_id, id, (row_number() OVER (PARTITION BY user_id ORDER BY id) - 1) / 500 AS chunk
+            FROM changed_tasks
+        ) AS numbered
+        GROUP BY numbered.user_id, numbered.chunk
+    ) AS chunks;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql
+"""
+
+# Триггер с таблицей переходов может обслуживать только одно событие.
+TRIGGERS = {
+    "tasks_notify_insert": ("INSERT", "NEW"),
+    "tasks_notify_update": ("UPDATE", "NEW"),
+    "tasks_notify_delete": ("DELETE", "OLD"),
+}
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute(NOTIFY_FUNCTION)
+    for name, (event, table) in TRIGGERS.items():
+        op.execute(
+            f"CREATE TRIGGER {name} AFTER {event} ON tasks "
+            f"REFERENCING {table} TABLE AS changed_tasks "
+            "FOR EACH STATEMENT EXECUTE FUNCTION notify_task_changes()"
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for name in TRIGGERS:
+        op.execute(f"DROP TRIGGER {name} ON tasks")
+    op.execute("DROP FUNCTION notify_task_changes()")
@@ -0,0 +1,37 @@
+"""add task change horizon
+
+Revision ID: f2c8b4d6e1a9
+Revises: e5f1a8c3d7b2
+Create Date: 2026-10-17 10:05:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "f2c8b4d6e1a9"
+down_revision: Union[str, None] = "e5f1a8c3d7b2"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    horizon = op.create_table(
+        "task_change_horizon",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("change_seq", sa.BigInteger(), server_default=sa.text("0"), nullable=False),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.bulk_insert(horizon, [{"id": 1, "change_seq": 0}])
+    op.create_index("ix_task_tombstones_deleted_at", "task_tombstones", ["deleted_at"], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_task_tombstones_deleted_at", table_name="task_tombstones")
+    op.drop_table("task_change_horizon")
@@ -5,5 +5,7 @@
 
 Каждый модуль внутри отвечает за отдельную сущность или ресурс:
 - `users.py` — эндпоинты для работы с пользователями: получение, обновление, удаление;
-- `tasks.py` — эндпоинты для управления задачами: создание, чтение, обновление, удаление.
+- `tasks.py` — эндпоинты для управления задачами: создание, чтение, обновление, удаление;
+- `conditional.py` — ETag и условные запросы (`If-None-Match`, `If-Match`);
+- `responses.py` — быстрая сериализация JSON для списочных эндпоинтов.
 """
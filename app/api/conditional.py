@@ -0,0 +1,73 @@
+"""
+Условные HTTP-запросы по версии строки.
+
+- Ответы на чтение и изменение записи содержат слабый ETag `W/"<version>"`.
+- `If-None-Match` с актуальным ETag даёт 304 без тела ответа.
+- `If-Match` на PUT включает оптимистическую блокировку: запись изменяется,
+  только если её версия совпадает с одной из переданных, иначе 412.
+
+Для `If-Match` ETag сравниваются без учёта признака `W/`: версия меняется
+при любом изменении строки, поэтому совпадение версии означает совпадение записи.
+"""
+
+import logging
+from typing import List, Optional, Set
+
+from fastapi import Response, status
+
+logger = logging.getLogger(__name__)
+
+
+def make_etag(version: int) -> str:
+    """Возвращает слабый ETag для версии строки."""
+    return f'W/"{version}"'
+
+
+def etag_matches(if_none_match: str, version: int) -> bool:
+    """
+    Проверяет заголовок `If-None-Match` против текущей версии.
+
+    Args:
+        if_none_match (str): Значение заголовка.
+        version (int): Текущая версия строки.
+
+    Returns:
+        bool: `True`, если клиент уже располагает актуальной версией.
+    """
+    tags = _parse_etags(if_none_match)
+    return "*" in tags or str(version) in tags
+
+
+def expected_versions(if_match: Optional[str]) -> Optional[Set[int]]:
+    """
+    Извлекает версии из заголовка `If-Match`.
+
+    Args:
+        if_match (Optional[str]): Значение заголовка.
+
+    Returns:
+        Optional[Set[int]]: Допустимые версии; None, если заголовка нет или он равен `*`.
+            Пустое множество означает, что ни один ETag не относится к записи.
+    """
+    if if_match is None:
+        return None
+    tags = _parse_etags(if_match)
+    if "*" in tags:
+        return None
+    return {int(tag) for tag in tags if tag.isdigit()}
+
+
+def not_modified(version: int) -> Response:
+    """Ответ 304 с текущим ETag."""
+    return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": make_etag(version)})
+
+
+def _parse_etags(header: str) -> List[str]:
+    """Разбирает список ETag и возвращает их значения без `W/` и кавычек."""
+    tags = []
+    for tag in header.split(","):
+        tag = tag.strip()
+        if tag.startswith("W/"):
+            tag = tag[2:]
+        tags.append(tag.strip('"'))
+    return tags
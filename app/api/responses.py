@@ -0,0 +1,55 @@
+"""
+Быстрая сериализация JSON для списочных эндпоинтов.
+
+Включается настройкой `FAST_LIST_RESPONSES` (по умолчанию выключена).
+Маршрут, возвращающий `FastJSONResponse` напрямую, минует обработку
+`response_model`: повторную валидацию Pydantic и `jsonable_encoder`.
+Поэтому содержимое должно уже состоять из JSON-совместимых значений,
+например словарей, собранных из строк запроса (`app.services.rows`).
+`response_model` у маршрута остаётся для схемы OpenAPI.
+
+Если установлен `orjson` (`poetry install --extras fast-json`), тело
+сериализуется им, иначе — стандартным `json`.
+"""
+
+import logging
+from typing import Any
+
+from fastapi.responses import JSONResponse
+
+from app.core.config import load_config
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+logger = logging.getLogger(__name__)
+
+config = load_config()
+
+
+class FastJSONResponse(JSONResponse):
+    """JSON-ответ без обработки `response_model`, сериализуемый `orjson`, если он доступен."""
+
+    def render(self, content: Any) -> bytes:
+        if orjson is None:
+            return super().render(content)
+        return orjson.dumps(content)
+
+
+def list_response(content: Any) -> Any:
+    """
+    Оборачивает содержимое списка в `FastJSONResponse`, если включено `FAST_LIST_RESPONSES`.
+
+    Иначе содержимое возвращается как есть и проходит валидацию `response_model`.
+
+    Args:
+        content (Any): JSON-совместимое содержимое ответа.
+
+    Returns:
+        Any: `FastJSONResponse` или исходное содержимое.
+    """
+    if config.fast_list_responses:
+        return FastJSONResponse(content)
+    return content
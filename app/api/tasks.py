@@ -4,24 +4,51 @@
 Вызывают методы из слоя сервисов.
 """
 
+import csv
+import io
+import json
 import logging
-from typing import List
+import time
+from typing import AsyncIterator, List, Literal, Optional
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Header, Query, Request, Response
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.celery_tasks.notifications import send_email
-from app.core.auth_settings import fastapi_users
-from app.db.database import get_async_session
-from app.schemas.task import TaskCreate, TaskRead, TaskUpdate
-from app.schemas.user import UserRead
+from app.api.conditional import etag_matches, expected_versions, make_etag, not_modified
+from app.api.responses import list_response
+from app.core.auth_settings import claims_still_valid, fastapi_users, get_current_claims
+from app.db.database import get_async_session, get_read_session, open_read_session
+from app.db.routing import client_key
+from app.exceptions import ForbiddenTaskExportException, ForbiddenTaskStatsException
+from app.schemas.task import (
+    TaskBulkCreate,
+    TaskBulkUpdate,
+    TaskBulkUpdateResult,
+    TaskChanges,
+    TaskCreate,
+    TaskPage,
+    TaskPatch,
+    TaskRead,
+    TaskStatsReport,
+    TaskUpdate,
+    UserTaskStats,
+)
+from app.schemas.user import TokenClaims, UserRead
+from app.services.outbox import OutboxService
+from app.services.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
+from app.services.task_events import task_event_broker
 from app.services.task_service import TaskService
 
 logger = logging.getLogger(__name__)
 
 get_current_user = fastapi_users.current_user()
+get_current_superuser = fastapi_users.current_user(active=True, superuser=True)
 router = APIRouter()
 
+EXPORT_FIELDS = ["id", "title", "description", "completed", "user_id"]
+EXPORT_MEDIA_TYPES = {"ndjson": "application/x-ndjson", "csv": "text/csv"}
+
 
 @router.post("/tasks", status_code=201, response_model=TaskRead)
 async def create_task(
@@ -30,35 +57,234 @@ async def create_task(
     current_user: UserRead = Depends(get_current_user),
 ) -> TaskRead:
 
-    task = await TaskService.create_task(task, db, current_user)
-    send_email.delay(to_email=current_user.email, subject="Новая задача", body=f'Ваша задача {task.title} успешно создана')
-    return task
+    OutboxService.add(
+        db,
+        to_email=current_user.email,
+        subject="Новая задача",
+        body=f'Ваша задача {task.title} успешно создана',
+        digest=True,
+    )
+    return await TaskService.create_task(task, db, current_user)
+
+
+@router.post("/tasks/bulk", status_code=201, response_model=List[TaskRead])
+async def create_tasks(
+    tasks: TaskBulkCreate,
+    db: AsyncSession = Depends(get_async_session),
+    current_user: UserRead = Depends(get_current_user),
+) -> List[TaskRead]:
+    """Пакетное создание задач с одним итоговым уведомлением."""
+    OutboxService.add(
+        db,
+        to_email=current_user.email,
+        subject="Новые задачи",
+        body=f"Успешно создано задач: {len(tasks.tasks)}",
+        digest=True,
+    )
+    return await TaskService.create_tasks(tasks.tasks, db, current_user)
+
+
+@router.get("/tasks/export", response_class=StreamingResponse)
+async def export_tasks(
+    request: Request,
+    format: Literal["ndjson", "csv"] = "ndjson",
+    completed: Optional[bool] = None,
+    user_id: Optional[int] = None,
+    current_user: UserRead = Depends(get_current_user),
+) -> StreamingResponse:
+    """
+    Потоковая выгрузка задач в формате NDJSON или CSV.
+
+    Пользователь выгружает свои задачи; задачи другого пользователя
+    или всех пользователей (без `user_id`) выгружает только суперпользователь.
+    """
+    if not current_user.is_superuser:
+        if user_id not in (None, current_user.id):
+            raise ForbiddenTaskExportException()
+        user_id = current_user.id
+    key = client_key(request)
+
+    async def content() -> AsyncIterator[str]:
+        # Сессия открывается внутри генератора: зависимости с yield
+        # закрываются до начала отправки тела ответа.
+        async with await open_read_session(key) as db:
+            if format == "csv":
+                yield _to_csv([EXPORT_FIELDS])
+            async for rows in TaskService.stream_tasks(db, completed, user_id):
+                if format == "csv":
+                    yield _to_csv([[row[field] for field in EXPORT_FIELDS] for row in rows])
+                else:
+                    yield "".join(json.dumps(dict(row), ensure_ascii=False) + "\n" for row in rows)
+
+    return StreamingResponse(
+        content(),
+        media_type=EXPORT_MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="tasks.{format}"'},
+    )
+
+
+@router.get("/tasks/search", response_model=TaskPage)
+async def search_tasks(
+    q: str = Query(min_length=1, max_length=200),
+    limit: int = Query(default=DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    after: Optional[str] = None,
+    db: AsyncSession = Depends(get_read_session),
+    claims: TokenClaims = Depends(get_current_claims),
+) -> TaskPage:
+    """Полнотекстовый поиск по задачам текущего пользователя, отсортированный по релевантности."""
+    return await TaskService.search_tasks(db, claims.id, q, limit, after)
+
+
+@router.get("/tasks/changes", response_model=TaskChanges)
+async def get_task_changes(
+    since: Optional[str] = None,
+    limit: int = Query(default=DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    db: AsyncSession = Depends(get_async_session),
+    claims: TokenClaims = Depends(get_current_claims),
+) -> TaskChanges:
+    """
+    Дельта-синхронизация: задачи текущего пользователя, изменённые или удалённые после водяного знака.
+
+    Читает с primary: водяной знак, выданный по отстающей реплике, может
+    перескочить изменение, которое до неё ещё не доехало.
+    """
+    return await TaskService.get_changes(db, claims.id, limit, since)
+
+
+@router.get("/tasks/events", response_class=StreamingResponse)
+async def task_events(
+    claims: TokenClaims = Depends(get_current_claims),
+) -> StreamingResponse:
+    """
+    Поток изменений задач текущего пользователя (Server-Sent Events).
+
+    События `created`, `updated`, `deleted` содержат ID задач. События
+    `overflow` (клиент не успевал читать, поток закрыт) и `resync` (события
+    могли быть потеряны) означают, что нужно догнать изменения через `/tasks/changes`.
+
+    Токен перепроверяется не реже раза в интервал heartbeat: когда он истёк
+    или отозван (деактивация, смена пароля), поток закрывается.
+    """
+    user_id = claims.id
+
+    async def content() -> AsyncIterator[str]:
+        # Подписка открывается внутри генератора, чтобы закрыться вместе с потоком.
+        subscription = task_event_broker.subscribe(user_id)
+        checked_at = time.monotonic()
+        try:
+            while True:
+                payload = await subscription.get(task_event_broker.heartbeat_seconds)
+                if time.monotonic() - checked_at >= task_event_broker.heartbeat_seconds:
+                    if not await claims_still_valid(claims):
+                        return
+                    checked_at = time.monotonic()
+                if subscription.overflowed:
+                    yield _to_sse("overflow", {"ids": []})
+                    return
+                if payload is None:
+                    yield ": ping\n\n"
+                else:
+                    yield _to_sse(payload["type"], {"ids": payload["ids"]})
+        finally:
+            task_event_broker.unsubscribe(subscription)
+
+    return StreamingResponse(
+        content(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@router.get("/tasks/stats", response_model=TaskStatsReport)
+async def get_task_stats(
+    limit: int = Query(default=DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    after: Optional[str] = None,
+    db: AsyncSession = Depends(get_read_session),
+    current_user: UserRead = Depends(get_current_superuser),
+) -> TaskStatsReport:
+    """Общая статистика задач и страница разбивки по пользователям (только для суперпользователя)."""
+    return await TaskService.get_stats(db, limit, after)
+
+
+@router.get("/tasks/stats/{user_id}", response_model=UserTaskStats)
+async def get_user_task_stats(
+    user_id: int,
+    db: AsyncSession = Depends(get_read_session),
+    current_user: UserRead = Depends(get_current_user),
+) -> UserTaskStats:
+    """Статистика задач пользователя; чужую статистику видит только суперпользователь."""
+    if current_user.id != user_id and not current_user.is_superuser:
+        raise ForbiddenTaskStatsException()
+    return await TaskService.get_user_stats(user_id, db)
 
 
 @router.get("/tasks/{task_id}", response_model=TaskRead)
 async def get_task(
     task_id: int,
-    db: AsyncSession = Depends(get_async_session),
-    current_user: UserRead = Depends(get_current_user),
+    response: Response,
+    if_none_match: Optional[str] = Header(default=None),
+    db: AsyncSession = Depends(get_read_session),
+    claims: TokenClaims = Depends(get_current_claims),
 ) -> TaskRead:
-    return await TaskService.get_task(task_id, db, current_user)
+    """Получение задачи; при совпадении `If-None-Match` — 304 по запросу одной версии."""
+    if if_none_match is not None:
+        version = await TaskService.get_task_version(task_id, db, claims)
+        if etag_matches(if_none_match, version):
+            return not_modified(version)
+    task = await TaskService.get_task(task_id, db, claims)
+    response.headers["ETag"] = make_etag(task.version)
+    return task
 
 
-@router.get("/tasks", response_model=List[TaskRead])
+@router.get("/tasks", response_model=TaskPage)
 async def get_all_tasks(
+    limit: int = Query(default=DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    after: Optional[str] = None,
+    completed: Optional[bool] = None,
+    user_id: Optional[int] = None,
+    db: AsyncSession = Depends(get_read_session),
+) -> TaskPage:
+    """Страница задач из строк запроса; при `FAST_LIST_RESPONSES` — без валидации `TaskPage`."""
+    return list_response(await TaskService.get_all_tasks(db, limit, after, completed, user_id))
+
+
+@router.patch("/tasks/bulk", response_model=TaskBulkUpdateResult)
+async def update_tasks(
+    task_data: TaskBulkUpdate,
     db: AsyncSession = Depends(get_async_session),
-) -> List[TaskRead]:
-    return await TaskService.get_all_tasks(db)
+    current_user: UserRead = Depends(get_current_user),
+) -> TaskBulkUpdateResult:
+    """Пакетное обновление задач текущего пользователя."""
+    return await TaskService.update_tasks(task_data, db, current_user)
 
 
 @router.put("/tasks/{task_id}", response_model=TaskRead)
 async def update_task(
     task_id: int,
     task_update: TaskUpdate,
+    response: Response,
+    if_match: Optional[str] = Header(default=None),
     db: AsyncSession = Depends(get_async_session),
     current_user: UserRead = Depends(get_current_user),
 ) -> TaskRead:
-    return await TaskService.update_task(task_id, task_update, db, current_user)
+    """Обновление задачи; с `If-Match` — только если версия не изменилась."""
+    task = await TaskService.update_task(task_id, task_update, db, current_user, expected_versions(if_match))
+    response.headers["ETag"] = make_etag(task.version)
+    return task
+
+
+@router.patch("/tasks/{task_id}", response_model=TaskRead)
+async def patch_task(
+    task_id: int,
+    task_data: TaskPatch,
+    response: Response,
+    db: AsyncSession = Depends(get_async_session),
+    current_user: UserRead = Depends(get_current_user),
+) -> TaskRead:
+    """Частичное обновление задачи."""
+    task = await TaskService.patch_task(task_id, task_data, db, current_user)
+    response.headers["ETag"] = make_etag(task.version)
+    return task
 
 
 @router.delete("/tasks/{task_id}")
@@ -68,3 +294,15 @@ async def delete_task(
     current_user: UserRead = Depends(get_current_user),
 ) -> None:
     return await TaskService.delete_task(task_id, db, current_user)
+
+
+def _to_sse(event: str, data: dict) -> str:
+    """Сериализует событие в формат Server-Sent Events."""
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+
+def _to_csv(rows: list) -> str:
+    """Сериализует строки в CSV."""
+    buffer = io.StringIO()
+    csv.writer(buffer).writerows(rows)
+    return buffer.getvalue()
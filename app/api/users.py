@@ -5,17 +5,19 @@
 """
 
 import logging
-from typing import List
+from typing import List, Optional
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Header, Response
 from fastapi_users.manager import BaseUserManager
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.celery_tasks.notifications import send_email
+from app.api.conditional import etag_matches, expected_versions, make_etag, not_modified
+from app.api.responses import list_response
 from app.core.auth_settings import fastapi_users, get_user_manager
-from app.db.database import get_async_session
+from app.db.database import get_async_session, get_read_session
 from app.db.models import User
-from app.schemas.user import UserCreate, UserRead, UserUpdate
+from app.schemas.user import UserCreate, UserPatch, UserRead, UserUpdate
+from app.services.outbox import OutboxService
 from app.services.user_service import UserService
 
 logger = logging.getLogger(__name__)
@@ -27,40 +29,66 @@ router = APIRouter()
 @router.post("/users", status_code=201, response_model=UserRead)
 async def register(
     user: UserCreate,
+    db: AsyncSession = Depends(get_async_session),
     user_manager: BaseUserManager[User, int] = Depends(get_user_manager),
 ) -> UserRead:
-    """Создание пользователя."""
-    user = await user_manager.create(user)
-    send_email.delay(to_email=user.email, subject="Регистрация", body='Ваша учетная запись успешно создана')
-    return user
+    """Создание пользователя; письмо о регистрации фиксируется в той же транзакции."""
+    OutboxService.add(db, to_email=user.email, subject="Регистрация", body='Ваша учетная запись успешно создана')
+    return await user_manager.create(user)
 
 
 @router.get("/users/{user_id}", response_model=UserRead)
 async def get_user(
     user_id: int,
-    db: AsyncSession = Depends(get_async_session),
+    response: Response,
+    if_none_match: Optional[str] = Header(default=None),
+    db: AsyncSession = Depends(get_read_session),
 ) -> UserRead:
-    """Получение информации о пользователе."""
-    return await UserService.get_user_by_id(user_id, db)
+    """Получение информации о пользователе; при совпадении `If-None-Match` — 304."""
+    if if_none_match is not None:
+        version = await UserService.get_user_version(user_id, db)
+        if etag_matches(if_none_match, version):
+            return not_modified(version)
+    user = await UserService.get_user_by_id(user_id, db)
+    response.headers["ETag"] = make_etag(user.version)
+    return user
 
 
 @router.get("/users", response_model=List[UserRead])
 async def get_all_users(
-    db: AsyncSession = Depends(get_async_session),
+    db: AsyncSession = Depends(get_read_session),
 ) -> List[UserRead]:
-    """Получение всех пользователей."""
-    return await UserService.get_all_users(db)
+    """Получение всех пользователей из строк запроса; при `FAST_LIST_RESPONSES` — без валидации `UserRead`."""
+    return list_response(await UserService.get_all_users(db))
 
 
 @router.put("/users/{user_id}", response_model=UserRead)
 async def update_user(
     user_id: int,
     user_update: UserUpdate,
+    response: Response,
+    if_match: Optional[str] = Header(default=None),
     db: AsyncSession = Depends(get_async_session),
     current_user: UserRead = Depends(get_current_user),
 ) -> UserRead:
-    """Обновление информации о пользователе."""
-    return await UserService.update_user(user_id, user_update, db, current_user)
+    """Обновление информации о пользователе; с `If-Match` — только если версия не изменилась."""
+    user = await UserService.update_user(user_id, user_update, db, current_user, expected_versions(if_match))
+    response.headers["ETag"] = make_etag(user.version)
+    return user
+
+
+@router.patch("/users/{user_id}", response_model=UserRead)
+async def patch_user(
+    user_id: int,
+    patch_data: UserPatch,
+    response: Response,
+    db: AsyncSession = Depends(get_async_session),
+    current_user: UserRead = Depends(get_current_user),
+) -> UserRead:
+    """Частичное обновление информации о пользователе."""
+    user = await UserService.patch_user(user_id, patch_data, db, current_user)
+    response.headers["ETag"] = make_etag(user.version)
+    return user
 
 
 @router.delete("/users/{user_id}", status_code=204)
@@ -0,0 +1,11 @@
+"""
+Модуль инициализации пакета cache.
+
+Пакет `cache` содержит слой кэширования приложения:
+- `backends.py` — реализации хранилищ (in-process LRU, Redis, двухуровневое, отключённое);
+- `client.py` — общий экземпляр кэша, собранный из конфигурации;
+- `entities.py` — read-through кэш отдельных записей с версионированными ключами
+  и объединением одновременных промахов;
+- `tasks.py` — кэш задач и их статистики;
+- `users.py` — кэш аутентифицированных пользователей.
+"""
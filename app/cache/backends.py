@@ -0,0 +1,212 @@
+"""
+Реализации асинхронных кэш-хранилищ.
+
+- `LocalCacheBackend` — in-process кэш с TTL и вытеснением по LRU;
+- `RedisCacheBackend` — общий для всех процессов кэш в Redis;
+- `TieredCacheBackend` — двухуровневый кэш: локальный L1 перед общим L2;
+- `NullCacheBackend` — отключённый кэш: всегда промах (для тестов и отладки).
+
+Значения должны сериализоваться в JSON. Ошибки Redis не пробрасываются:
+кэш в этом случае ведёт себя как пустой, и запрос уходит в БД.
+"""
+
+import json
+import logging
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Any, Optional
+
+import redis.asyncio as redis
+from redis.exceptions import RedisError
+
+from app.core.config import CacheConfig
+
+logger = logging.getLogger(__name__)
+
+
+class CacheBackend(ABC):
+    """Базовый интерфейс асинхронного кэша; хранилище без любого из методов не создаётся."""
+
+    @abstractmethod
+    async def get(self, key: str) -> Optional[Any]:
+        """Возвращает значение по ключу или None при промахе."""
+
+    @abstractmethod
+    async def set(self, key: str, value: Any, ttl: int) -> None:
+        """Сохраняет значение на `ttl` секунд."""
+
+    @abstractmethod
+    async def delete(self, *keys: str) -> None:
+        """Удаляет значения по ключам."""
+
+    @abstractmethod
+    async def clear(self) -> None:
+        """Удаляет все значения кэша."""
+
+
+class LocalCacheBackend(CacheBackend):
+    """
+    In-process кэш с TTL и вытеснением давно не использованных записей.
+
+    Атрибуты:
+        max_size (int): Максимальное количество записей.
+    """
+
+    def __init__(self, max_size: int):
+        self.max_size = max_size
+        self._data: OrderedDict[str, tuple[float, Any]] = OrderedDict()
+
+    async def get(self, key: str) -> Optional[Any]:
+        item = self._data.get(key)
+        if item is None:
+            return None
+        expires_at, value = item
+        if expires_at <= time.monotonic():
+            del self._data[key]
+            return None
+        self._data.move_to_end(key)
+        return value
+
+    async def set(self, key: str, value: Any, ttl: int) -> None:
+        self._data[key] = (time.monotonic() + ttl, value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.max_size:
+            self._data.popitem(last=False)
+
+    async def delete(self, *keys: str) -> None:
+        for key in keys:
+            self._data.pop(key, None)
+
+    async def clear(self) -> None:
+        self._data.clear()
+
+
+class RedisCacheBackend(CacheBackend):
+    """
+    Кэш в Redis, общий для всех процессов приложения.
+
+    Атрибуты:
+        prefix (str): Префикс ключей, отделяющий кэш от других данных в Redis.
+    """
+
+    def __init__(self, url: str, prefix: str = "cache:"):
+        self.prefix = prefix
+        self._client = redis.from_url(url)
+
+    async def get(self, key: str) -> Optional[Any]:
+        try:
+            raw = await self._client.get(self.prefix + key)
+        except RedisError as e:
+            logger.warning(f"Redis cache get failed: {e}")
+            return None
+        return None if raw is None else json.loads(raw)
+
+    async def set(self, key: str, value: Any, ttl: int) -> None:
+        try:
+            await self._client.set(self.prefix + key, json.dumps(value), ex=ttl)
+        except RedisError as e:
+            logger.warning(f"Redis cache set failed: {e}")
+
+    async def delete(self, *keys: str) -> None:
+        if not keys:
+            return
+        try:
+            await self._client.delete(*(self.prefix + key for key in keys))
+        except RedisError as e:
+            logger.warning(f"Redis cache delete failed: {e}")
+
+    async def clear(self) -> None:
+        try:
+            async for key in self._client.scan_iter(match=self.prefix + "*"):
+                await self._client.delete(key)
+        except RedisError as e:
+            logger.warning(f"Redis cache clear failed: {e}")
+
+
+class TieredCacheBackend(CacheBackend):
+    """
+    Двухуровневый кэш: локальный L1 перед общим L2.
+
+    L1 хранит записи не дольше `local_ttl` секунд, поэтому после
+    инвалидации в другом процессе устаревшее значение живёт не дольше этого срока.
+
+    Атрибуты:
+        local (CacheBackend): Локальный кэш процесса (L1).
+        remote (CacheBackend): Общий кэш (L2).
+        local_ttl (int): Максимальное время жизни записи в L1.
+    """
+
+    def __init__(self, local: CacheBackend, remote: CacheBackend, local_ttl: int):
+        self.local = local
+        self.remote = remote
+        self.local_ttl = local_ttl
+
+    async def get(self, key: str) -> Optional[Any]:
+        value = await self.local.get(key)
+        if value is not None:
+            return value
+        value = await self.remote.get(key)
+        if value is not None:
+            await self.local.set(key, value, self.local_ttl)
+        return value
+
+    async def set(self, key: str, value: Any, ttl: int) -> None:
+        await self.local.set(key, value, min(ttl, self.local_ttl))
+        await self.remote.set(key, value, ttl)
+
+    async def delete(self, *keys: str) -> None:
+        await self.local.delete(*keys)
+        await self.remote.delete(*keys)
+
+    async def clear(self) -> None:
+        await self.local.clear()
+        await self.remote.clear()
+
+
+class NullCacheBackend(CacheBackend):
+    """Кэш, который ничего не хранит: каждое чтение — промах."""
+
+    async def get(self, key: str) -> Optional[Any]:
+        return None
+
+    async def set(self, key: str, value: Any, ttl: int) -> None:
+        pass
+
+    async def delete(self, *keys: str) -> None:
+        pass
+
+    async def clear(self) -> None:
+        pass
+
+
+def build_cache(cache_config: CacheConfig) -> CacheBackend:
+    """
+    Собирает кэш по конфигурации.
+
+    Хранилище выбирается настройкой `CACHE_BACKEND`; в режиме `auto`
+    без адреса Redis используется только локальный кэш процесса.
+
+    Args:
+        cache_config (CacheConfig): Настройки кэша.
+
+    Returns:
+        CacheBackend: Готовый к использованию кэш.
+
+    Raises:
+        ValueError: Для `redis` или `tiered` не задан адрес Redis.
+    """
+    backend = cache_config.backend
+    if backend == "auto":
+        backend = "tiered" if cache_config.redis_url else "local"
+    if backend == "none":
+        return NullCacheBackend()
+    local = LocalCacheBackend(max_size=cache_config.local_max_size)
+    if backend == "local":
+        return local
+    if not cache_config.redis_url:
+        raise ValueError(f"CACHE_BACKEND={backend} requires REDIS_URL")
+    remote = RedisCacheBackend(cache_config.redis_url)
+    if backend == "redis":
+        return remote
+    return TieredCacheBackend(local, remote, local_ttl=cache_config.local_ttl_seconds)
@@ -0,0 +1,16 @@
+"""
+Общий экземпляр кэша приложения.
+
+Создаёт кэш по настройкам из `CacheConfig` один раз на процесс.
+"""
+
+import logging
+
+from app.cache.backends import build_cache
+from app.core.config import load_config
+
+logger = logging.getLogger(__name__)
+
+config = load_config()
+
+cache = build_cache(config.cache)
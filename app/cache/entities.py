@@ -0,0 +1,123 @@
+"""
+Read-through кэш отдельных записей (задач, пользователей).
+
+- Ключи версионируются: `v<FORMAT_VERSION>.<CACHE_KEY_VERSION>:<сущность>:<id>`.
+  `FORMAT_VERSION` увеличивается в коде при изменении формата записей,
+  `CACHE_KEY_VERSION` позволяет сбросить кэш без релиза. Старые записи
+  перестают читаться и истекают по TTL.
+- Промахи по одному ключу объединяются (single-flight): пока первый запрос
+  загружает запись из БД, остальные ждут его результат, а не идут в БД сами.
+- Если запись инвалидирована во время загрузки, загруженное значение
+  возвращается вызывающему, но в кэш не попадает.
+
+Отсутствующие записи не кэшируются.
+"""
+
+import asyncio
+import logging
+from typing import Any, Awaitable, Callable, Dict, Optional, Set
+
+from prometheus_client import Counter
+
+from app.cache.client import cache, config
+
+logger = logging.getLogger(__name__)
+
+ENTITY_CACHE_REQUESTS = Counter(
+    "entity_cache_requests_total",
+    "Обращения к кэшу записей: hit, miss или coalesced (ожидание чужой загрузки).",
+    ["entity", "result"],
+)
+
+FORMAT_VERSION = 2
+
+_FAILED = object()
+
+_inflight: Dict[str, asyncio.Future] = {}
+_stale: Set[str] = set()
+
+
+def entity_key(entity: str, entity_id: int) -> str:
+    """Возвращает версионированный ключ записи."""
+    return f"v{FORMAT_VERSION}.{config.cache.key_version}:{entity}:{entity_id}"
+
+
+async def read_through(
+    entity: str,
+    entity_id: int,
+    ttl: int,
+    loader: Callable[[], Awaitable[Optional[Any]]],
+) -> Optional[Any]:
+    """
+    Возвращает запись из кэша, при промахе загружая её через `loader`.
+
+    Args:
+        entity (str): Тип записи, часть ключа и метка метрики.
+        entity_id (int): Идентификатор записи.
+        ttl (int): Время жизни записи в кэше.
+        loader (Callable): Корутина, возвращающая сериализуемую в JSON запись
+            или None, если записи нет.
+
+    Returns:
+        Optional[Any]: Запись или None, если её нет.
+    """
+    key = entity_key(entity, entity_id)
+    value = await cache.get(key)
+    if value is not None:
+        ENTITY_CACHE_REQUESTS.labels(entity, "hit").inc()
+        return value
+
+    leader = _inflight.get(key)
+    if leader is not None:
+        ENTITY_CACHE_REQUESTS.labels(entity, "coalesced").inc()
+        value = await asyncio.shield(leader)
+        if value is not _FAILED:
+            return value
+        return await loader()
+
+    ENTITY_CACHE_REQUESTS.labels(entity, "miss").inc()
+    future = asyncio.get_running_loop().create_future()
+    _inflight[key] = future
+    try:
+        value = await loader()
+        if value is not None and key not in _stale:
+            await cache.set(key, value, ttl)
+    except BaseException:
+        future.set_result(_FAILED)
+        raise
+    else:
+        future.set_result(value)
+    finally:
+        _inflight.pop(key, None)
+        _stale.discard(key)
+    return value
+
+
+async def peek(entity: str, entity_id: int) -> Optional[Any]:
+    """
+    Возвращает запись из кэша, не загружая её при промахе.
+
+    Нужна там, где при промахе хватает более дешёвого запроса, чем загрузка
+    записи целиком, например для проверки версии по `If-None-Match`.
+
+    Args:
+        entity (str): Тип записи.
+        entity_id (int): Идентификатор записи.
+
+    Returns:
+        Optional[Any]: Запись или None при промахе.
+    """
+    return await cache.get(entity_key(entity, entity_id))
+
+
+async def invalidate(entity: str, *entity_ids: int) -> None:
+    """
+    Удаляет записи из кэша после изменения или удаления.
+
+    Args:
+        entity (str): Тип записей.
+        *entity_ids (int): Идентификаторы записей.
+    """
+    keys = [entity_key(entity, entity_id) for entity_id in entity_ids]
+    _stale.update(key for key in keys if key in _inflight)
+    await cache.delete(*keys)
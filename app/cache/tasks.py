@@ -0,0 +1,75 @@
+"""
+Кэш задач и их агрегированной статистики.
+
+Отдельные задачи хранятся в read-through кэше `app.cache.entities`
+`CACHE_TASK_TTL_SECONDS` секунд и сбрасываются при изменении или удалении.
+
+Статистика считается одним запросом с `GROUP BY` и хранится в кэше
+`CACHE_STATS_TTL_SECONDS` секунд. Записи сбрасываются при изменении задач
+пользователя, поэтому после записи дашборд сразу видит актуальные числа.
+"""
+
+import logging
+from typing import Awaitable, Callable, Optional
+
+from app.cache.client import cache, config
+from app.cache.entities import invalidate, peek, read_through
+
+logger = logging.getLogger(__name__)
+
+STATS_ALL_KEY = "task_stats:all"
+TASK_ENTITY = "task"
+
+
+def _user_stats_key(user_id: int) -> str:
+    return f"task_stats:user:{user_id}"
+
+
+async def get_cached_stats(user_id: Optional[int] = None) -> Optional[dict]:
+    """
+    Возвращает статистику из кэша.
+
+    Args:
+        user_id (Optional[int]): ID пользователя; без него — общая статистика.
+
+    Returns:
+        Optional[dict]: Сериализованная статистика или None при промахе.
+    """
+    key = STATS_ALL_KEY if user_id is None else _user_stats_key(user_id)
+    return await cache.get(key)
+
+
+async def cache_stats(data: dict, user_id: Optional[int] = None) -> None:
+    """Сохраняет статистику в кэш на `CACHE_STATS_TTL_SECONDS`."""
+    key = STATS_ALL_KEY if user_id is None else _user_stats_key(user_id)
+    await cache.set(key, data, config.cache.stats_ttl_seconds)
+
+
+async def invalidate_task_stats(user_id: int) -> None:
+    """Сбрасывает статистику пользователя и общую статистику после изменения задач."""
+    await cache.delete(_user_stats_key(user_id))
+    await cache.delete(STATS_ALL_KEY)
+
+
+async def get_or_load_task(task_id: int, loader: Callable[[], Awaitable[Optional[dict]]]) -> Optional[dict]:
+    """
+    Возвращает задачу из кэша, при промахе загружая её через `loader`.
+
+    Args:
+        task_id (int): Идентификатор задачи.
+        loader (Callable): Корутина, возвращающая сериализованную задачу или None.
+
+    Returns:
+        Optional[dict]: Сериализованная задача или None, если её нет.
+    """
+    return await read_through(TASK_ENTITY, task_id, config.cache.task_ttl_seconds, loader)
+
+
+async def get_cached_task(task_id: int) -> Optional[dict]:
+    """Возвращает задачу из кэша без загрузки из БД или None при промахе."""
+    return await peek(TASK_ENTITY, task_id)
+
+
+async def invalidate_tasks(*task_ids: int) -> None:
+    """Удаляет задачи из кэша после изменения или удаления."""
+    await invalidate(TASK_ENTITY, *task_ids)
@@ -0,0 +1,157 @@
+"""
+Кэш аутентифицированных пользователей.
+
+Позволяет JWT-стратегии не выполнять SELECT по таблице users на каждый запрос.
+В кэше хранятся только поля, нужные для авторизации, без хэша пароля.
+Те же записи отдаёт `UserService.get_user_by_id` через read-through кэш
+`app.cache.entities`. Записи инвалидируются при изменении и удалении пользователя.
+
+Отзывы токенов, которые проверяет быстрый путь аутентификации по JWT,
+в общем кэше не хранятся: локальный кэш вытесняет записи, а `CACHE_BACKEND=none`
+их не хранит вовсе. Источник истины — `users.token_version`. Если задан
+`JWT_REVOCATION_REDIS_URL`, минимальная допустимая версия дублируется
+в отдельный ключ Redis, и проверка обходится без БД; без него или при
+недоступном Redis версия читается из БД.
+"""
+
+import logging
+from typing import Awaitable, Callable, Optional
+
+import redis.asyncio as redis
+from prometheus_client import Counter
+from redis.exceptions import RedisError
+from sqlalchemy import select
+
+from app.cache.client import cache, config
+from app.cache.entities import entity_key, invalidate, peek, read_through
+from app.db.database import async_session_maker
+from app.db.models import User
+
+logger = logging.getLogger(__name__)
+
+CACHED_USER_FIELDS = (
+    "id",
+    "email",
+    "username",
+    "is_active",
+    "is_superuser",
+    "is_verified",
+    "token_version",
+    "version",
+)
+
+USER_CACHE_REQUESTS = Counter(
+    "auth_user_cache_requests_total",
+    "Обращения к кэшу пользователей при аутентификации.",
+    ["result"],
+)
+
+
+USER_ENTITY = "user"
+
+revocation_client: Optional[redis.Redis] = (
+    redis.from_url(config.jwt.revocation_redis_url) if config.jwt.revocation_redis_url else None
+)
+
+
+def _user_key(user_id: int) -> str:
+    return entity_key(USER_ENTITY, user_id)
+
+
+def user_cache_data(user: User) -> dict:
+    """Возвращает поля пользователя, которые хранятся в кэше."""
+    return {field: getattr(user, field) for field in CACHED_USER_FIELDS}
+
+
+def _token_version_key(user_id: int) -> str:
+    return f"auth:token_version:{user_id}"
+
+
+async def get_cached_user(user_id: int) -> Optional[User]:
+    """
+    Возвращает пользователя из кэша.
+
+    Возвращаемый объект не привязан к сессии и предназначен только для чтения.
+
+    Args:
+        user_id (int): Идентификатор пользователя.
+
+    Returns:
+        Optional[User]: Пользователь или None при промахе.
+    """
+    data = await cache.get(_user_key(user_id))
+    if data is None:
+        USER_CACHE_REQUESTS.labels("miss").inc()
+        return None
+    USER_CACHE_REQUESTS.labels("hit").inc()
+    return User(**data)
+
+
+async def cache_user(user: User) -> None:
+    """Сохраняет поля пользователя, нужные для авторизации."""
+    await cache.set(_user_key(user.id), user_cache_data(user), config.cache.user_ttl_seconds)
+
+
+async def get_or_load_user(user_id: int, loader: Callable[[], Awaitable[Optional[dict]]]) -> Optional[dict]:
+    """
+    Возвращает поля пользователя из кэша, при промахе загружая их через `loader`.
+
+    Args:
+        user_id (int): Идентификатор пользователя.
+        loader (Callable): Корутина, возвращающая `user_cache_data` или None.
+
+    Returns:
+        Optional[dict]: Поля пользователя или None, если его нет.
+    """
+    return await read_through(USER_ENTITY, user_id, config.cache.user_ttl_seconds, loader)
+
+
+async def get_cached_user_data(user_id: int) -> Optional[dict]:
+    """Возвращает поля пользователя из кэша без загрузки из БД и без метрики аутентификации."""
+    return await peek(USER_ENTITY, user_id)
+
+
+async def invalidate_user(user_id: int) -> None:
+    """Удаляет пользователя из кэша после изменения или удаления."""
+    await invalidate(USER_ENTITY, user_id)
+
+
+async def revoke_tokens(user_id: int, min_version: int) -> None:
+    """
+    Отзывает токены пользователя с версией ниже `min_version`.
+
+    Вызывается после того, как `users.token_version` обновлена или пользователь
+    удалён. Ключ в Redis живёт не дольше токена доступа: по истечении этого
+    срока все отозванные токены уже просрочены.
+    """
+    if revocation_client is not None:
+        try:
+            await revocation_client.set(
+                _token_version_key(user_id), min_version, ex=config.jwt.access_token_expire_seconds
+            )
+        except RedisError as e:
+            logger.error(f"Token revocation of user {user_id} was not stored in Redis: {e}")
+    await invalidate_user(user_id)
+
+
+async def tokens_revoked(user_id: int, token_version: int) -> bool:
+    """
+    Проверяет, отозваны ли токены пользователя с версией `token_version`.
+
+    Args:
+        user_id (int): Идентификатор пользователя.
+        token_version (int): Версия токенов из утверждения `ver`.
+
+    Returns:
+        bool: `True`, если версия ниже допустимой или пользователь удалён.
+    """
+    if revocation_client is not None:
+        try:
+            min_version = await revocation_client.get(_token_version_key(user_id))
+        except RedisError as e:
+            logger.warning(f"Token revocation store unavailable, checking the database: {e}")
+        else:
+            return min_version is not None and token_version < int(min_version)
+    async with async_session_maker() as session:
+        current = await session.scalar(select(User.token_version).where(User.id == user_id))
+    return current is None or token_version < current
@@ -1,4 +1,5 @@
 from celery import Celery
+from kombu import Queue
 
 from app.core.config import load_config
 
@@ -8,6 +9,48 @@ celery_app = Celery(
     "app",
     broker=config.celery.broker_url,
     backend=config.celery.result_backend_url,
+    include=["app.celery_tasks.maintenance"],
+)
+
+celery_app.conf.update(
+    worker_pool=config.celery.worker_pool,
+    worker_concurrency=config.celery.worker_concurrency,
+    worker_prefetch_multiplier=config.celery.prefetch_multiplier,
+    task_acks_late=config.celery.acks_late,
+    task_reject_on_worker_lost=config.celery.acks_late,
+    task_ignore_result=config.celery.ignore_result,
+    result_expires=config.celery.result_expires,
+    task_default_queue=config.celery.default_queue,
+    task_queues=[
+        Queue(config.celery.default_queue),
+        Queue(config.celery.notifications_queue),
+    ],
+    task_queue_max_priority=10,
+    task_default_priority=5,
+    task_routes={
+        "app.celery_tasks.notifications.flush_digests": {
+            "queue": config.celery.notifications_queue,
+            "priority": config.celery.digest_priority,
+        },
+        "app.celery_tasks.notifications.*": {
+            "queue": config.celery.notifications_queue,
+            "priority": config.celery.notifications_priority,
+        },
+    },
+    broker_transport_options={"queue_order_strategy": "priority"},
 )
 
 celery_app.autodiscover_tasks(["app.celery_tasks"])
+
+celery_app.conf.beat_schedule = {
+    "prune-task-tombstones": {
+        "task": "app.celery_tasks.maintenance.prune_task_tombstones",
+        "schedule": 3600.0,
+    },
+}
+
+if config.mailing.digest_redis_url and config.mailing.digest_window_seconds > 0:
+    celery_app.conf.beat_schedule["flush-notification-digests"] = {
+        "task": "app.celery_tasks.notifications.flush_digests",
+        "schedule": config.mailing.digest_window_seconds,
+    }
@@ -0,0 +1,193 @@
+"""
+Буфер уведомлений для дайджест-писем.
+
+События по задачам не отправляются сразу, а накапливаются в Redis-списке
+получателя. Периодическая задача `flush_digests` забирает получателей, у которых
+с первого события прошло `EMAIL_DIGEST_WINDOW_SECONDS`, и отправляет каждому
+одно итоговое письмо.
+
+Структура данных в Redis:
+- `digest:events:<email>` — список событий получателя (JSON с темой и текстом);
+- `digest:pending` — sorted set получателей со временем первого события;
+- `digest:seen:<event_id>` — отметка принятого события на `EMAIL_DIGEST_DEDUPE_SECONDS`:
+  повторная передача того же сообщения outbox не добавит событие второй раз.
+
+Если после `drain_due` постановка писем в очередь не удалась, события
+неотправленных получателей возвращаются в буфер (`restore`).
+"""
+
+import json
+import logging
+import time
+from typing import Dict, List, Optional, Tuple
+
+import redis
+import redis.asyncio as aioredis
+from redis.exceptions import WatchError
+
+from app.core.config import load_config
+
+logger = logging.getLogger(__name__)
+
+EVENTS_KEY = "digest:events:{}"
+PENDING_KEY = "digest:pending"
+SEEN_KEY = "digest:seen:{}"
+MAX_RECIPIENTS_PER_FLUSH = 1000
+
+
+class NotificationBuffer:
+    """
+    Накопитель уведомлений в Redis.
+
+    `push` вызывается из асинхронного API, `drain_due` — из синхронного воркера
+    Celery, поэтому для каждой стороны лениво создаётся свой клиент.
+
+    Атрибуты:
+        url (str): Адрес Redis.
+        window_seconds (int): Сколько секунд копить события получателя.
+        dedupe_seconds (int): Сколько секунд помнить id принятого события.
+    """
+
+    def __init__(self, url: str, window_seconds: int, dedupe_seconds: int = 86400):
+        self.url = url
+        self.window_seconds = window_seconds
+        self.dedupe_seconds = dedupe_seconds
+        self._async_client: Optional[aioredis.Redis] = None
+        self._sync_client: Optional[redis.Redis] = None
+
+    async def push(self, to_email: str, subject: str, body: str, event_id: str) -> bool:
+        """
+        Добавляет событие в буфер получателя, если событие с этим id ещё не принималось.
+
+        Проверка отметки `digest:seen:<event_id>` и добавление события выполняются
+        под `WATCH`, поэтому два одновременных повтора не добавят событие дважды:
+        транзакция проигравшего отменяется, и он считает событие уже принятым.
+
+        Args:
+            to_email (str): Email-адрес получателя.
+            subject (str): Тема уведомления.
+            body (str): Текст уведомления.
+            event_id (str): Id события, например `outbox:<id>`.
+
+        Returns:
+            bool: `False`, если событие уже было принято.
+
+        Raises:
+            redis.exceptions.RedisError: Redis недоступен.
+        """
+        if self._async_client is None:
+            self._async_client = aioredis.from_url(self.url)
+        seen_key = SEEN_KEY.format(event_id)
+        event = json.dumps({"subject": subject, "body": body}, ensure_ascii=False)
+        async with self._async_client.pipeline(transaction=True) as pipe:
+            await pipe.watch(seen_key)
+            if await pipe.exists(seen_key):
+                return False
+            pipe.multi()
+            pipe.rpush(EVENTS_KEY.format(to_email), event)
+            pipe.zadd(PENDING_KEY, {to_email: time.time()}, nx=True)
+            pipe.set(seen_key, 1, ex=self.dedupe_seconds)
+            try:
+                await pipe.execute()
+            except WatchError:
+                # Отметку успел поставить параллельный повтор того же события.
+                return False
+        return True
+
+    def drain_due(self, now: Optional[float] = None) -> Dict[str, List[dict]]:
+        """
+        Забирает и удаляет события получателей, чьё окно накопления истекло.
+
+        Чтение списка, его удаление и снятие получателя из `digest:pending`
+        выполняются в одной транзакции, поэтому событие, добавленное во время
+        сброса, попадёт в следующий дайджест, а не потеряется.
+
+        Args:
+            now (Optional[float]): Текущее время (unix timestamp).
+
+        Returns:
+            Dict[str, List[dict]]: События по адресам получателей.
+        """
+        now = time.time() if now is None else now
+        recipients = [
+            raw.decode()
+            for raw in self._get_sync_client().zrangebyscore(
+                PENDING_KEY, "-inf", now - self.window_seconds, start=0, num=MAX_RECIPIENTS_PER_FLUSH
+            )
+        ]
+        if not recipients:
+            return {}
+
+        with self._get_sync_client().pipeline(transaction=True) as pipe:
+            for email in recipients:
+                key = EVENTS_KEY.format(email)
+                pipe.lrange(key, 0, -1)
+                pipe.delete(key)
+            pipe.zrem(PENDING_KEY, *recipients)
+            results = pipe.execute()
+
+        return {
+            email: [json.loads(event) for event in events]
+            for email, events in zip(recipients, results[0:-1:2])
+            if events
+        }
+
+    def restore(self, drained: Dict[str, List[dict]], now: Optional[float] = None) -> None:
+        """
+        Возвращает в буфер события, забранные `drain_due`, но не поставленные в очередь.
+
+        События встают перед пришедшими во время сброса, а получатель
+        снова считается готовым к отправке.
+
+        Args:
+            drained (Dict[str, List[dict]]): События по адресам получателей.
+            now (Optional[float]): Текущее время (unix timestamp).
+
+        Raises:
+            redis.exceptions.RedisError: Redis недоступен.
+        """
+        if not drained:
+            return
+        now = time.time() if now is None else now
+        with self._get_sync_client().pipeline(transaction=True) as pipe:
+            for email, events in drained.items():
+                pipe.lpush(
+                    EVENTS_KEY.format(email),
+                    *(json.dumps(event, ensure_ascii=False) for event in reversed(events)),
+                )
+            pipe.zadd(PENDING_KEY, {email: now - self.window_seconds for email in drained}, lt=True)
+            pipe.execute()
+
+    def _get_sync_client(self) -> redis.Redis:
+        if self._sync_client is None:
+            self._sync_client = redis.from_url(self.url)
+        return self._sync_client
+
+
+def build_digest(events: List[dict]) -> Tuple[str, str]:
+    """
+    Собирает тему и текст письма из накопленных событий.
+
+    Одно событие отправляется как есть, несколько — одним письмом-сводкой.
+
+    Args:
+        events (List[dict]): События с ключами `subject` и `body`.
+
+    Returns:
+        Tuple[str, str]: Тема и текст письма.
+    """
+    if len(events) == 1:
+        return events[0]["subject"], events[0]["body"]
+    lines = [f"- {event['body']}" for event in events]
+    return f"Сводка уведомлений ({len(events)})", "\n".join(lines)
+
+
+config = load_config()
+
+digest_buffer: Optional[NotificationBuffer] = None
+if config.mailing.digest_redis_url and config.mailing.digest_window_seconds > 0:
+    digest_buffer = NotificationBuffer(
+        config.mailing.digest_redis_url,
+        config.mailing.digest_window_seconds,
+        config.mailing.digest_dedupe_seconds,
+    )
@@ -0,0 +1,161 @@
+"""
+Неблокирующая постановка задач Celery из асинхронного кода.
+
+`apply_async` синхронно публикует сообщение в брокер, и при медленном Redis
+блокирует event loop uvicorn вместе со всеми параллельными запросами.
+`CeleryDispatcher` складывает задачи в ограниченную очередь, которую
+разбирает отдельный поток; корутина лишь ждёт результат публикации.
+
+Политики при переполнении очереди (`CELERY_DISPATCH_POLICY`):
+- `block` — дождаться свободного места, не блокируя event loop;
+- `drop` — отбросить задачу, учесть её в метриках и бросить `DispatchDropped`.
+
+`dispatch_confirmed` возвращает управление только после публикации в брокер,
+поэтому отправитель (outbox) хранит задачу у себя, пока она не опубликована,
+и повторяет её после `DispatchDropped`.
+
+Метрики глубины очереди и времени публикации отдаются эндпоинтом `/metrics`.
+"""
+
+import asyncio
+import logging
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import Any, Optional, Tuple
+
+from celery import Task
+from prometheus_client import Counter, Gauge, Histogram
+
+from app.celery_tasks.celery_worker import celery_app
+from app.core.config import load_config
+
+logger = logging.getLogger(__name__)
+
+DISPATCH_POLICIES = ("block", "drop")
+
+DISPATCH_QUEUE_DEPTH = Gauge(
+    "celery_dispatch_queue_depth", "Количество задач, ожидающих публикации в брокер."
+)
+DISPATCH_PUBLISH_LATENCY = Histogram(
+    "celery_dispatch_publish_seconds",
+    "Время публикации задачи в брокер.",
+    ["task"],
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10),
+)
+DISPATCH_TOTAL = Counter(
+    "celery_dispatch_total",
+    "Результаты постановки задач: published, failed, dropped.",
+    ["task", "outcome"],
+)
+
+
+class DispatchDropped(Exception):
+    """Задача отброшена из-за переполнения очереди публикации."""
+
+
+class CeleryDispatcher:
+    """
+    Публикует задачи Celery в брокер из отдельного потока.
+
+    Атрибуты:
+        max_size (int): Максимальная длина очереди публикации.
+        policy (str): Политика при переполнении: `block` или `drop`.
+    """
+
+    def __init__(self, max_size: int = 1000, policy: str = "block"):
+        if policy not in DISPATCH_POLICIES:
+            raise ValueError(f"Unknown dispatch policy: {policy}")
+        self.max_size = max_size
+        self.policy = policy
+        self._queue: "queue.Queue[Optional[Tuple[str, tuple, dict, Future]]]" = queue.Queue(max_size)
+        self._start_lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+
+    def queue_depth(self) -> int:
+        """Возвращает количество задач, ожидающих публикации."""
+        return self._queue.qsize()
+
+    async def dispatch_confirmed(self, task: Task, *args: Any, **kwargs: Any) -> str:
+        """
+        Ставит задачу в очередь публикации и ждёт, пока она попадёт в брокер.
+
+        Args:
+            task (Task): Задача Celery.
+            *args: Позиционные аргументы задачи.
+            **kwargs: Именованные аргументы задачи.
+
+        Returns:
+            str: Идентификатор задачи.
+
+        Raises:
+            DispatchDropped: Очередь переполнена и политика `drop`.
+            Exception: Ошибка публикации в брокер.
+        """
+        self._ensure_started()
+        future: Future = Future()
+        item = (task.name, args, kwargs, future)
+        try:
+            self._queue.put_nowait(item)
+        except queue.Full:
+            if self.policy == "block":
+                await asyncio.to_thread(self._queue.put, item)
+            else:
+                DISPATCH_TOTAL.labels(task.name, "dropped").inc()
+                logger.warning(f"Celery dispatch queue is full, dropping {task.name}")
+                raise DispatchDropped(task.name)
+        return await asyncio.wrap_future(future)
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        """
+        Останавливает поток публикации, дождавшись отправки уже поставленных задач.
+
+        Args:
+            timeout (Optional[float]): Максимальное время ожидания в секундах.
+        """
+        with self._start_lock:
+            thread, self._thread = self._thread, None
+        if thread is not None:
+            self._queue.put(None)
+            thread.join(timeout)
+
+    def _ensure_started(self) -> None:
+        with self._start_lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name="celery-dispatch", daemon=True)
+                self._thread.start()
+
+    def _run(self) -> None:
+        while True:
+            item = self._queue.get()
+            if item is None:
+                return
+            name, args, kwargs, future = item
+            try:
+                future.set_result(self._publish(name, args, kwargs))
+            except Exception as e:
+                logger.warning(f"Celery publish of {name} failed: {e}")
+                future.set_exception(e)
+
+    def _publish(self, name: str, args: tuple, kwargs: dict) -> str:
+        start = time.perf_counter()
+        try:
+            result = celery_app.send_task(name, args=args, kwargs=kwargs)
+        except Exception:
+            DISPATCH_TOTAL.labels(name, "failed").inc()
+            raise
+        finally:
+            DISPATCH_PUBLISH_LATENCY.labels(name).observe(time.perf_counter() - start)
+        DISPATCH_TOTAL.labels(name, "published").inc()
+        return result.id
+
+
+config = load_config()
+
+celery_dispatcher = CeleryDispatcher(
+    max_size=config.celery.dispatch_queue_size,
+    policy=config.celery.dispatch_policy,
+)
+
+DISPATCH_QUEUE_DEPTH.set_function(celery_dispatcher.queue_depth)
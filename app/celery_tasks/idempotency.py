@@ -0,0 +1,128 @@
+"""
+Ключи идемпотентности для отправки писем.
+
+Ключ уведомления в Redis проходит два состояния:
+
+- перед `sendmail` задача занимает ключ как «отправляется» (`SET NX`)
+  на `EMAIL_IDEMPOTENCY_IN_FLIGHT_SECONDS`;
+- после того как сервер принял письмо, ключ помечается «отправлено»
+  на `EMAIL_IDEMPOTENCY_TTL_SECONDS`.
+
+Письмо с ключом «отправлено» повторно не отправляется. Если ключ ещё
+«отправляется», задача получает `EmailInFlight` и повторяется позже.
+Когда сервер отклонил отправителя или адресатов, ключ освобождается сразу.
+При обрыве соединения, таймауте или ошибке на этапе DATA неизвестно,
+принял ли сервер письмо, поэтому ключ остаётся «отправляется» и истекает
+сам: ретрай задачи после этого отправит письмо снова, а не посчитает
+его отправленным.
+
+Ошибки Redis не пробрасываются: при недоступном Redis письма отправляются
+без проверки.
+"""
+
+import logging
+from typing import Optional
+
+import redis
+from prometheus_client import Counter
+from redis.exceptions import RedisError
+
+from app.core.config import load_config
+
+logger = logging.getLogger(__name__)
+
+KEY_PREFIX = "email:sent:"
+IN_FLIGHT = b"sending"
+SENT = b"sent"
+
+EMAIL_DUPLICATES_SUPPRESSED = Counter(
+    "email_duplicates_suppressed_total",
+    "Количество повторных отправок письма, подавленных по ключу идемпотентности.",
+    ["task"],
+)
+
+
+class EmailInFlight(Exception):
+    """Письмо с этим ключом сейчас отправляется другой попыткой; повторить позже."""
+
+
+class IdempotencyStore:
+    """
+    Хранилище ключей идемпотентности в Redis.
+
+    Атрибуты:
+        url (str): Адрес Redis.
+        ttl_seconds (int): Сколько секунд помнить отправленное письмо.
+        in_flight_seconds (int): Сколько секунд ключ занят незавершённой отправкой.
+    """
+
+    def __init__(self, url: str, ttl_seconds: int, in_flight_seconds: int = 60):
+        self.url = url
+        self.ttl_seconds = ttl_seconds
+        self.in_flight_seconds = in_flight_seconds
+        self._client: Optional[redis.Redis] = None
+
+    def claim(self, key: str) -> bool:
+        """
+        Занимает ключ на время отправки письма.
+
+        Args:
+            key (str): Ключ идемпотентности уведомления.
+
+        Returns:
+            bool: `False`, если письмо с этим ключом уже отправлено.
+
+        Raises:
+            EmailInFlight: Письмо с этим ключом сейчас отправляется.
+        """
+        try:
+            client = self._get_client()
+            if client.set(KEY_PREFIX + key, IN_FLIGHT, nx=True, ex=self.in_flight_seconds):
+                return True
+            state = client.get(KEY_PREFIX + key)
+        except RedisError as e:
+            logger.warning(f"Idempotency store unavailable, sending without check: {e}")
+            return True
+        if state == SENT:
+            return False
+        raise EmailInFlight(key)
+
+    def mark_sent(self, key: str) -> None:
+        """
+        Помечает письмо отправленным после того, как сервер его принял.
+
+        Args:
+            key (str): Ключ идемпотентности уведомления.
+        """
+        try:
+            self._get_client().set(KEY_PREFIX + key, SENT, ex=self.ttl_seconds)
+        except RedisError as e:
+            logger.warning(f"Idempotency key update failed: {e}")
+
+    def release(self, key: str) -> None:
+        """
+        Освобождает ключ, если письмо точно не было принято сервером.
+
+        Args:
+            key (str): Ключ идемпотентности уведомления.
+        """
+        try:
+            self._get_client().delete(KEY_PREFIX + key)
+        except RedisError as e:
+            logger.warning(f"Idempotency key release failed: {e}")
+
+    def _get_client(self) -> redis.Redis:
+        if self._client is None:
+            self._client = redis.from_url(self.url)
+        return self._client
+
+
+config = load_config()
+
+email_idempotency: Optional[IdempotencyStore] = None
+if config.mailing.idempotency_redis_url:
+    email_idempotency = IdempotencyStore(
+        config.mailing.idempotency_redis_url,
+        config.mailing.idempotency_ttl_seconds,
+        config.mailing.idempotency_in_flight_seconds,
+    )
@@ -0,0 +1,41 @@
+"""
+Периодические задачи обслуживания базы данных.
+
+Воркер Celery синхронный, поэтому задача запускает асинхронный сервис
+через `asyncio.run` на отдельном движке без пула: соединения asyncpg
+привязаны к циклу событий и не переживают его.
+"""
+
+import asyncio
+import logging
+
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.pool import NullPool
+
+from app.celery_tasks.celery_worker import celery_app
+from app.core.config import load_config
+from app.services.task_service import TaskService
+
+logger = logging.getLogger(__name__)
+
+config = load_config()
+
+
+async def _prune_tombstones(retention_days: int) -> int:
+    engine = create_async_engine(config.db.database_url, poolclass=NullPool)
+    try:
+        async with async_sessionmaker(engine, class_=AsyncSession)() as session:
+            return await TaskService.prune_tombstones(session, retention_days)
+    finally:
+        await engine.dispose()
+
+
+@celery_app.task
+def prune_task_tombstones() -> int:
+    """
+    Периодическая задача: удаляет надгробия старше `DB_TOMBSTONE_RETENTION_DAYS`.
+
+    Returns:
+        int: Количество удалённых надгробий.
+    """
+    return asyncio.run(_prune_tombstones(config.db.tombstone_retention_days))
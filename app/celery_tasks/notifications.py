@@ -1,9 +1,19 @@
+import asyncio
 import logging
+import random
 import smtplib
 from email.header import Header
 from email.mime.text import MIMEText
+from typing import List, Optional
+
+from celery.signals import worker_process_shutdown
+from redis.exceptions import RedisError
 
 from app.celery_tasks.celery_worker import celery_app
+from app.celery_tasks.digest import build_digest, digest_buffer
+from app.celery_tasks.dispatch import celery_dispatcher
+from app.celery_tasks.idempotency import EMAIL_DUPLICATES_SUPPRESSED, EmailInFlight, email_idempotency
+from app.celery_tasks.smtp import SendRateLimiter, SMTPConnectionPool
 from app.core.config import load_config
 
 logger = logging.getLogger(__name__)
@@ -13,24 +23,129 @@ config = load_config()
 EMAIL = config.mailing.email
 EMAIL_PASSWORD = config.mailing.email_password
 
+RETRYABLE_SMTP_ERRORS = (
+    smtplib.SMTPConnectError,
+    smtplib.SMTPServerDisconnected,
+    smtplib.SMTPDataError,
+    ConnectionError,
+)
+
+RETRYABLE_SEND_ERRORS = RETRYABLE_SMTP_ERRORS + (EmailInFlight,)
+
+# Отказы до передачи письма: сервер точно его не принял.
+SMTP_REJECTIONS = (
+    smtplib.SMTPRecipientsRefused,
+    smtplib.SMTPSenderRefused,
+)
+
+smtp_pool = SMTPConnectionPool(
+    host=config.mailing.smtp_host,
+    port=config.mailing.smtp_port,
+    username=EMAIL,
+    password=EMAIL_PASSWORD,
+    use_ssl=config.mailing.smtp_use_ssl,
+    timeout=config.mailing.smtp_timeout,
+    max_size=config.mailing.smtp_pool_size,
+    idle_timeout=config.mailing.smtp_idle_timeout,
+)
+
+email_rate_limiter: Optional[SendRateLimiter] = None
+if config.celery.email_rate_limit:
+    email_rate_limiter = SendRateLimiter(config.celery.email_rate_limit)
+
+
+@worker_process_shutdown.connect
+def close_smtp_connections(**kwargs) -> None:
+    """Закрывает SMTP-соединения пула при остановке процесса воркера."""
+    smtp_pool.close_all()
+
+
+def build_message(to_email: str, subject: str, body: str) -> MIMEText:
+    """Собирает текстовое письмо в UTF-8."""
+    msg = MIMEText(body, "plain", "utf-8")
+    msg["Subject"] = Header(subject, "utf-8")
+    msg["From"] = EMAIL
+    msg["To"] = to_email
+    return msg
+
+
+def retry_countdown(retries: int) -> float:
+    """
+    Задержка перед ретраем письма: экспоненциальный шаг с джиттером.
+
+    Задержка всегда больше `EMAIL_IDEMPOTENCY_IN_FLIGHT_SECONDS`: к ретраю
+    ключ оборванной отправки успевает истечь, и попытка не упирается в `EmailInFlight`.
+
+    Args:
+        retries (int): Номер текущего ретрая (`self.request.retries`).
+
+    Returns:
+        float: Задержка в секундах.
+    """
+    step = min(config.mailing.retry_backoff_max_seconds, config.mailing.retry_backoff_seconds * 2**retries)
+    return config.mailing.idempotency_in_flight_seconds + random.uniform(step / 2, step)
+
 
-@celery_app.task(
-    bind=True,
-    max_retries=5,
-    autoretry_for=(smtplib.SMTPException,),
-    retry_backoff=True,
-    retry_jitter=True)
-def send_email(self, to_email: str, subject: str, body: str):
+def send_once(server: smtplib.SMTP, key: str, to_email: str, msg: MIMEText, task_name: str) -> bool:
+    """
+    Отправляет письмо, если письмо с тем же ключом идемпотентности ещё не отправлялось.
+
+    Перед отправкой ждёт разрешения `email_rate_limiter`, поэтому
+    `CELERY_EMAIL_RATE_LIMIT` считает письма, а не задачи.
+    Ключ помечается отправленным только после того, как `sendmail` вернул
+    управление. Если сервер отклонил отправителя или адресатов до передачи
+    письма (`SMTP_REJECTIONS`), ключ освобождается. При ошибке на этапе DATA
+    и других ошибках неизвестно, принял ли сервер письмо, поэтому ключ
+    остаётся занятым и истекает сам; ретрай отправит письмо после этого.
+
+    Args:
+        server (smtplib.SMTP): Соединение из пула.
+        key (str): Ключ идемпотентности уведомления.
+        to_email (str): Email-адрес получателя.
+        msg (MIMEText): Письмо.
+        task_name (str): Имя задачи для метрики повторов.
+
+    Returns:
+        bool: `False`, если отправка подавлена как повторная.
+
+    Raises:
+        EmailInFlight: Письмо с этим ключом сейчас отправляется; задачу нужно повторить.
+    """
+    if email_idempotency is not None and not email_idempotency.claim(key):
+        EMAIL_DUPLICATES_SUPPRESSED.labels(task_name).inc()
+        logger.info(f"↩️ Duplicate email {key} to {to_email} suppressed")
+        return False
+    if email_rate_limiter is not None:
+        email_rate_limiter.acquire()
+    try:
+        server.sendmail(EMAIL, to_email, msg.as_string())
+    except SMTP_REJECTIONS:
+        if email_idempotency is not None:
+            email_idempotency.release(key)
+        raise
+    if email_idempotency is not None:
+        email_idempotency.mark_sent(key)
+    return True
+
+
+@celery_app.task(bind=True, max_retries=5)
+def send_email(self, to_email: str, subject: str, body: str, idempotency_key: Optional[str] = None):
     """
     Асинхронная задача отправки email через SMTP с защитой от повторной отправки.
 
     Отправляет простое текстовое письмо с указанным адресатом, темой и телом письма.
-    Используется защищённое SSL-соединение и авторизация по логину и паролю приложения.
+    Письмо отправляется через соединение из пула `smtp_pool`, поэтому SSL-рукопожатие
+    и авторизация не повторяются для каждого письма.
+
+    Повторная отправка при ретраях и повторной доставке задачи подавляется
+    по ключу идемпотентности (см. `send_once`). Задержка ретрая — `retry_countdown`.
 
     Args:
         to_email (str): Email-адрес получателя.
         subject (str): Тема письма.
         body (str): Текст письма (plain text).
+        idempotency_key (Optional[str]): Ключ уведомления; по умолчанию id задачи,
+            который не меняется при ретраях.
 
     Raises:
         smtplib.SMTPException: Ошибка при подключении к SMTP-серверу или отправке письма.
@@ -39,25 +154,164 @@ def send_email(self, to_email: str, subject: str, body: str):
     Пример:
         send_email.delay("user@example.com", "Уведомление", "Задача успешно выполнена.")
     """
-    msg = MIMEText(body, "plain", "utf-8")
-    msg["Subject"] = Header(subject, "utf-8")
-    msg["From"] = EMAIL
-    msg["To"] = to_email
+    msg = build_message(to_email, subject, body)
+    key = idempotency_key or self.request.id
 
     try:
-        with smtplib.SMTP_SSL("smtp.yandex.ru", 465, timeout=10) as server:
-            server.login(EMAIL, EMAIL_PASSWORD)
-            server.sendmail(EMAIL, to_email, msg.as_string())
+        with smtp_pool.connection() as server:
+            if not send_once(server, key, to_email, msg, self.name):
+                return
         logger.info(f"✅ Email sent to {to_email}")
 
     except smtplib.SMTPRecipientsRefused as e:
         logger.error(f"❌ Invalid recipient: {e}")
+    except smtplib.SMTPSenderRefused as e:
+        logger.error(f"❌ Sender refused for {to_email}: {e}")
     except smtplib.SMTPAuthenticationError as e:
         logger.critical(f"❌ SMTP auth error: {e}")
         raise
-    except (smtplib.SMTPConnectError, smtplib.SMTPServerDisconnected, smtplib.SMTPDataError, ConnectionError) as e:
-        logger.warning(f"🔁 Retryable SMTP error: {e}")
-        raise self.retry(exc=e)
+    except RETRYABLE_SEND_ERRORS as e:
+        logger.warning(f"🔁 Retryable SMTP error: {e!r}")
+        raise self.retry(exc=e, countdown=retry_countdown(self.request.retries))
     except Exception as e:
         logger.exception(f"❌ Unexpected error, retrying: {e}")
-        raise self.retry(exc=e)
+        raise self.retry(exc=e, countdown=retry_countdown(self.request.retries))
+
+
+@celery_app.task(bind=True, max_retries=5)
+def send_email_batch(self, messages: List[dict]):
+    """
+    Отправляет пачку писем через одно аутентифицированное SMTP-соединение.
+
+    При сетевой ошибке задача повторяется только для неотправленных писем.
+    Письма, для которых сервер отклонил адресата или отправителя, пропускаются. Письмам без ключа
+    идемпотентности ключ назначается при первом запуске и сохраняется в ретраях.
+
+    Args:
+        messages (List[dict]): Письма с ключами `to_email`, `subject`, `body`
+            и необязательным `idempotency_key`.
+
+    Raises:
+        smtplib.SMTPAuthenticationError: Ошибка авторизации на SMTP-сервере.
+
+    Пример:
+        send_email_batch.delay([{"to_email": "user@example.com", "subject": "Тема", "body": "Текст"}])
+    """
+    messages = [
+        {**message, "idempotency_key": message.get("idempotency_key") or f"{self.request.id}:{number}"}
+        for number, message in enumerate(messages)
+    ]
+    sent = 0
+    try:
+        with smtp_pool.connection() as server:
+            for message in messages:
+                msg = build_message(message["to_email"], message["subject"], message["body"])
+                try:
+                    send_once(server, message["idempotency_key"], message["to_email"], msg, self.name)
+                except smtplib.SMTPRecipientsRefused as e:
+                    logger.error(f"❌ Invalid recipient: {e}")
+                except smtplib.SMTPSenderRefused as e:
+                    logger.error(f"❌ Sender refused for {message['to_email']}: {e}")
+                sent += 1
+        logger.info(f"✅ Batch of {len(messages)} emails sent")
+
+    except smtplib.SMTPAuthenticationError as e:
+        logger.critical(f"❌ SMTP auth error: {e}")
+        raise
+    except RETRYABLE_SEND_ERRORS as e:
+        logger.warning(f"🔁 Retryable SMTP error after {sent} emails: {e!r}")
+        raise self.retry(
+            exc=e, args=(messages[sent:],), kwargs={}, countdown=retry_countdown(self.request.retries)
+        )
+
+
+def split_email_batches(messages: List[dict]) -> List[List[dict]]:
+    """
+    Делит письма на пачки по `EMAIL_BATCH_SIZE`.
+
+    Args:
+        messages (List[dict]): Письма с ключами `to_email`, `subject`, `body`.
+
+    Returns:
+        List[List[dict]]: Пачки писем для `send_email_batch`.
+    """
+    batch_size = config.mailing.batch_size
+    return [messages[start:start + batch_size] for start in range(0, len(messages), batch_size)]
+
+
+async def dispatch_email_batches(messages: List[dict]) -> None:
+    """
+    Ставит письма в очередь пачками из асинхронного кода через `celery_dispatcher`.
+
+    Возвращает управление только после публикации всех пачек в брокер,
+    поэтому вызывающий (outbox) может удалить свои записи.
+
+    Args:
+        messages (List[dict]): Письма с ключами `to_email`, `subject`, `body`.
+
+    Raises:
+        DispatchDropped: Очередь публикации переполнена.
+    """
+    await asyncio.gather(
+        *(celery_dispatcher.dispatch_confirmed(send_email_batch, batch) for batch in split_email_batches(messages))
+    )
+
+
+async def notify(to_email: str, subject: str, body: str, event_id: str) -> None:
+    """
+    Уведомляет пользователя о событии через буфер дайджестов.
+
+    Повторное уведомление с тем же `event_id` в дайджест не попадает.
+    Если буфер не настроен или Redis недоступен, письмо ставится в очередь сразу
+    через `celery_dispatcher`, не блокируя event loop; `event_id` тогда
+    служит ключом идемпотентности письма.
+
+    Args:
+        to_email (str): Email-адрес получателя.
+        subject (str): Тема уведомления.
+        body (str): Текст уведомления.
+        event_id (str): Id события, например `outbox:<id>`.
+
+    Raises:
+        DispatchDropped: Очередь публикации переполнена.
+    """
+    if digest_buffer is not None:
+        try:
+            if not await digest_buffer.push(to_email, subject, body, event_id):
+                logger.info(f"↩️ Duplicate digest event {event_id} to {to_email} ignored")
+            return
+        except RedisError as e:
+            logger.warning(f"Digest buffer unavailable, sending immediately: {e}")
+    await celery_dispatcher.dispatch_confirmed(
+        send_email, to_email=to_email, subject=subject, body=body, idempotency_key=event_id
+    )
+
+
+@celery_app.task
+def flush_digests():
+    """
+    Периодическая задача: отправляет накопленные уведомления дайджестами.
+
+    Каждый получатель, у которого истекло окно накопления, получает одно письмо;
+    письма отправляются пачками через `send_email_batch`. Если брокер не принял
+    пачку, события её получателей и всех следующих пачек возвращаются в буфер,
+    а ошибка пробрасывается.
+    """
+    if digest_buffer is None:
+        return
+    drained = digest_buffer.drain_due()
+    messages = []
+    for to_email, events in drained.items():
+        subject, body = build_digest(events)
+        messages.append({"to_email": to_email, "subject": subject, "body": body})
+    batches = split_email_batches(messages)
+    for number, batch in enumerate(batches):
+        try:
+            send_email_batch.apply_async((batch,), priority=config.celery.digest_priority)
+        except Exception:
+            unsent = [message["to_email"] for pending in batches[number:] for message in pending]
+            digest_buffer.restore({to_email: drained[to_email] for to_email in unsent})
+            logger.exception(f"❌ Digest enqueue failed, {len(unsent)} digests returned to the buffer")
+            raise
+    if messages:
+        logger.info(f"📨 Flushed {len(messages)} notification digests")
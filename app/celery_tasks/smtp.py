@@ -0,0 +1,177 @@
+"""
+Пул SMTP-соединений для воркеров Celery.
+
+Каждый процесс воркера держит несколько уже аутентифицированных соединений
+и переиспользует их между задачами, вместо того чтобы на каждое письмо
+заново выполнять TCP/TLS-рукопожатие и `login`.
+
+- Соединение, простоявшее дольше `idle_timeout`, закрывается.
+- Соединение, простоявшее дольше `PING_AFTER_SECONDS`, перед выдачей
+  проверяется командой NOOP и при ошибке пересоздаётся.
+- Соединение, на котором произошла сетевая ошибка, в пул не возвращается.
+
+`SendRateLimiter` ограничивает число писем в секунду на процесс воркера,
+считая каждое письмо, в том числе внутри пачки.
+"""
+
+import logging
+import smtplib
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Iterator, Optional
+
+from celery.utils.time import rate
+from kombu.utils.limits import TokenBucket
+
+logger = logging.getLogger(__name__)
+
+PING_AFTER_SECONDS = 5
+
+
+class SMTPConnectionPool:
+    """
+    Потокобезопасный пул аутентифицированных SMTP-соединений.
+
+    Атрибуты:
+        host (str): Адрес SMTP-сервера.
+        port (int): Порт SMTP-сервера.
+        username (Optional[str]): Логин; без него авторизация не выполняется.
+        password (Optional[str]): Пароль приложения.
+        use_ssl (bool): Использовать SMTP поверх SSL.
+        timeout (int): Таймаут сетевых операций в секундах.
+        max_size (int): Максимальное количество одновременно открытых соединений.
+        idle_timeout (int): Через сколько секунд простоя соединение закрывается.
+    """
+
+    def __init__(
+        self,
+        host: str,
+        port: int,
+        username: Optional[str] = None,
+        password: Optional[str] = None,
+        use_ssl: bool = True,
+        timeout: int = 10,
+        max_size: int = 4,
+        idle_timeout: int = 60,
+    ):
+        self.host = host
+        self.port = port
+        self.username = username
+        self.password = password
+        self.use_ssl = use_ssl
+        self.timeout = timeout
+        self.max_size = max_size
+        self.idle_timeout = idle_timeout
+        self._idle: deque[tuple[smtplib.SMTP, float]] = deque()
+        self._lock = threading.Lock()
+        self._slots = threading.BoundedSemaphore(max_size)
+
+    @contextmanager
+    def connection(self) -> Iterator[smtplib.SMTP]:
+        """
+        Выдаёт соединение из пула на время блока `with`.
+
+        Если в блоке возникла ошибка, соединение возвращается в пул только
+        после успешного RSET, иначе закрывается.
+
+        Yields:
+            smtplib.SMTP: Аутентифицированное соединение.
+        """
+        self._slots.acquire()
+        try:
+            server = self._acquire()
+            try:
+                yield server
+            except Exception:
+                if self._reset(server):
+                    self._release(server)
+                else:
+                    self._close(server)
+                raise
+            else:
+                self._release(server)
+        finally:
+            self._slots.release()
+
+    def close_all(self) -> None:
+        """Закрывает все простаивающие соединения."""
+        with self._lock:
+            idle, self._idle = self._idle, deque()
+        for server, _ in idle:
+            self._close(server)
+
+    def _connect(self) -> smtplib.SMTP:
+        smtp_class = smtplib.SMTP_SSL if self.use_ssl else smtplib.SMTP
+        server = smtp_class(self.host, self.port, timeout=self.timeout)
+        try:
+            if self.username:
+                server.login(self.username, self.password)
+        except Exception:
+            self._close(server)
+            raise
+        logger.info(f"📡 SMTP connection opened to {self.host}:{self.port}")
+        return server
+
+    def _acquire(self) -> smtplib.SMTP:
+        while True:
+            with self._lock:
+                if not self._idle:
+                    break
+                server, released_at = self._idle.pop()
+            idle_for = time.monotonic() - released_at
+            if idle_for >= self.idle_timeout:
+                self._close(server)
+            elif idle_for < PING_AFTER_SECONDS or self._is_alive(server):
+                return server
+            else:
+                self._close(server)
+        return self._connect()
+
+    def _release(self, server: smtplib.SMTP) -> None:
+        with self._lock:
+            self._idle.append((server, time.monotonic()))
+
+    @staticmethod
+    def _is_alive(server: smtplib.SMTP) -> bool:
+        try:
+            return server.noop()[0] == 250
+        except (smtplib.SMTPException, OSError):
+            return False
+
+    @staticmethod
+    def _reset(server: smtplib.SMTP) -> bool:
+        try:
+            return server.rset()[0] == 250
+        except (smtplib.SMTPException, OSError):
+            return False
+
+    @staticmethod
+    def _close(server: smtplib.SMTP) -> None:
+        try:
+            server.quit()
+        except (smtplib.SMTPException, OSError):
+            server.close()
+
+
+class SendRateLimiter:
+    """
+    Потокобезопасный ограничитель скорости отправки писем (token bucket).
+
+    Ограничение задаётся в формате Celery, например "20/s" или "600/m".
+
+    Атрибуты:
+        per_second (float): Сколько писем в секунду разрешено отправлять.
+    """
+
+    def __init__(self, limit: str):
+        self.per_second = rate(limit)
+        self._bucket = TokenBucket(self.per_second)
+        self._lock = threading.Lock()
+
+    def acquire(self) -> None:
+        """Ждёт, пока можно будет отправить следующее письмо."""
+        with self._lock:
+            while not self._bucket.can_consume(1):
+                time.sleep(self._bucket.expected_time(1))
@@ -2,26 +2,41 @@
 Модуль настройки аутентификации и управления пользователями с использованием fastapi-users.
 
 Реализует:
-- JWT-стратегию на основе конфигурации;
+- JWT-стратегию на основе конфигурации с кэшем аутентифицированных пользователей;
 - кастомный UserManager;
 - SQLAlchemyUserDatabase;
 - AuthenticationBackend для JWT;
-- Экземпляр FastAPIUsers, подключённый к менеджеру и backend-стратегии.
+- Экземпляр FastAPIUsers, подключённый к менеджеру и backend-стратегии;
+- Зависимость `get_current_claims` — быстрый путь аутентификации только по
+  подписи и утверждениям JWT, без загрузки пользователя;
+- `claims_still_valid` — повторную проверку утверждений для долгих соединений.
 """
 
 import logging
-from typing import AsyncGenerator
+import time
+from typing import AsyncGenerator, Optional
 
-from fastapi import Depends
-from fastapi_users import FastAPIUsers
+import jwt
+from fastapi import Depends, HTTPException, Request, status
+from fastapi_users import FastAPIUsers, exceptions
 from fastapi_users.authentication import AuthenticationBackend, BearerTransport, JWTStrategy
 from fastapi_users.db import SQLAlchemyUserDatabase
+from fastapi_users.jwt import decode_jwt, generate_jwt
 from fastapi_users.manager import BaseUserManager
+from pydantic import ValidationError
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.cache.users import (
+    cache_user,
+    get_cached_user,
+    invalidate_user,
+    revoke_tokens,
+    tokens_revoked,
+)
 from app.core.config import load_config
 from app.db.database import get_async_session
 from app.db.models import User
+from app.schemas.user import TokenClaims
 
 logger = logging.getLogger(__name__)
 
@@ -37,20 +52,132 @@ class UserManager(BaseUserManager[User, int]):
 
     Методы:
         parse_id(str) -> int: Преобразует строковый ID в целочисленный.
+
+    Хуки изменения и удаления пользователя сбрасывают его запись в кэше,
+    а деактивация, смена пароля и удаление отзывают выданные токены.
     """
 
     def parse_id(self, user_id: str) -> int:
-        return int(user_id)
+        try:
+            return int(user_id)
+        except (TypeError, ValueError) as e:
+            raise exceptions.InvalidID() from e
+
+    async def bump_token_version(self, user: User) -> None:
+        """Увеличивает версию токенов пользователя, отзывая выданные JWT."""
+        user = await self.user_db.update(user, {"token_version": user.token_version + 1})
+        await revoke_tokens(user.id, user.token_version)
+
+    async def on_after_update(
+        self, user: User, update_dict: dict, request: Optional[Request] = None
+    ) -> None:
+        if "password" in update_dict or update_dict.get("is_active") is False:
+            await self.bump_token_version(user)
+        else:
+            await invalidate_user(user.id)
+
+    async def on_after_verify(self, user: User, request: Optional[Request] = None) -> None:
+        await invalidate_user(user.id)
+
+    async def on_after_reset_password(
+        self, user: User, request: Optional[Request] = None
+    ) -> None:
+        await self.bump_token_version(user)
+
+    async def on_after_delete(self, user: User, request: Optional[Request] = None) -> None:
+        await revoke_tokens(user.id, user.token_version + 1)
+
+
+class CachedJWTStrategy(JWTStrategy):
+    """
+    JWT-стратегия, читающая пользователя из кэша.
+
+    При попадании в кэш SELECT по таблице users не выполняется, а сессия,
+    открытая для `get_user_db`, так и не получает соединение из пула.
+
+    В токен дополнительно записываются утверждения `is_active` и `ver`
+    (версия токенов пользователя), по которым `read_claims` проверяет токен
+    без обращения к БД.
+    """
+
+    async def write_token(self, user: User) -> str:
+        data = {
+            "sub": str(user.id),
+            "aud": self.token_audience,
+            "is_active": user.is_active,
+            "ver": user.token_version,
+        }
+        return generate_jwt(
+            data, self.encode_key, self.lifetime_seconds, algorithm=self.algorithm
+        )
+
+    async def read_token(
+        self, token: Optional[str], user_manager: BaseUserManager[User, int]
+    ) -> Optional[User]:
+        if token is None:
+            return None
+        try:
+            data = self._decode(token)
+            user_id = user_manager.parse_id(data.get("sub"))
+        except (jwt.PyJWTError, exceptions.InvalidID):
+            return None
+
+        user = await get_cached_user(user_id)
+        if user is None:
+            try:
+                user = await user_manager.get(user_id)
+            except exceptions.UserNotExists:
+                return None
+            await cache_user(user)
+        if data.get("ver", 0) != user.token_version:
+            return None
+        return user
+
+    async def read_claims(self, token: Optional[str]) -> Optional[TokenClaims]:
+        """
+        Проверяет подпись и срок действия токена и возвращает его утверждения.
+
+        Токен отклоняется, если пользователь был неактивен на момент входа
+        или его токены отозваны после выдачи.
+
+        Args:
+            token (Optional[str]): JWT из заголовка Authorization.
+
+        Returns:
+            Optional[TokenClaims]: Утверждения токена или None, если токен недействителен.
+        """
+        if token is None:
+            return None
+        try:
+            data = self._decode(token)
+            claims = TokenClaims(
+                id=data["sub"],
+                is_active=data.get("is_active", False),
+                token_version=data.get("ver", 0),
+                expires_at=data.get("exp"),
+            )
+        except (jwt.PyJWTError, KeyError, ValidationError):
+            return None
+        if not claims.is_active:
+            return None
+        if await tokens_revoked(claims.id, claims.token_version):
+            return None
+        return claims
 
+    def _decode(self, token: str) -> dict:
+        return decode_jwt(
+            token, self.decode_key, self.token_audience, algorithms=[self.algorithm]
+        )
 
-async def get_jwt_strategy() -> AsyncGenerator[JWTStrategy, None]:
+
+async def get_jwt_strategy() -> AsyncGenerator[CachedJWTStrategy, None]:
     """
     Возвращает стратегию JWT на основе конфигурации.
 
     Returns:
-        AsyncGenerator[JWTStrategy, None]: Генератор с JWT-стратегией.
+        AsyncGenerator[CachedJWTStrategy, None]: Генератор с JWT-стратегией.
     """
-    yield JWTStrategy(
+    yield CachedJWTStrategy(
         secret=config.jwt.secret_key,
         lifetime_seconds=config.jwt.access_token_expire_seconds,
     )
@@ -96,3 +223,48 @@ fastapi_users = FastAPIUsers(
     get_user_manager,
     [auth_backend],
 )
+
+
+async def get_current_claims(
+    token: Optional[str] = Depends(bearer_transport.scheme),
+    strategy: CachedJWTStrategy = Depends(get_jwt_strategy),
+) -> TokenClaims:
+    """
+    Быстрая аутентификация по JWT без загрузки пользователя из БД.
+
+    Подходит для маршрутов, которым достаточно ID пользователя.
+    Деактивация и смена пароля вступают в силу сразу: отзыв проверяется
+    по Redis отзывов или, без него, по `users.token_version` в БД.
+
+    Args:
+        token (Optional[str]): JWT из заголовка Authorization.
+        strategy (CachedJWTStrategy): JWT-стратегия.
+
+    Returns:
+        TokenClaims: Утверждения токена.
+
+    Raises:
+        HTTPException: 401, если токен недействителен или отозван.
+    """
+    claims = await strategy.read_claims(token)
+    if claims is None:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED)
+    return claims
+
+
+async def claims_still_valid(claims: TokenClaims) -> bool:
+    """
+    Проверяет, что токен, принятый при подключении, всё ещё действителен.
+
+    Нужна соединениям, которые живут дольше одного запроса (SSE): токен
+    мог истечь, а пользователь — быть деактивирован или сменить пароль.
+
+    Args:
+        claims (TokenClaims): Утверждения токена, проверенные при подключении.
+
+    Returns:
+        bool: `False`, если срок действия токена истёк или токены пользователя отозваны.
+    """
+    if claims.expires_at is not None and time.time() >= claims.expires_at:
+        return False
+    return not await tokens_revoked(claims.id, claims.token_version)
@@ -7,8 +7,9 @@
 
 import logging
 from dataclasses import dataclass
+from typing import Optional
 
-from environs import Env
+from environs import Env, validate
 
 logger = logging.getLogger(__name__)
 
@@ -21,9 +22,48 @@ class EmailConfig:
     Атрибуты:
         email (str): Почта с которой ведется рассылка.
         email_password (int): Пароль приложения.
+        smtp_host (str): Адрес SMTP-сервера.
+        smtp_port (int): Порт SMTP-сервера.
+        smtp_use_ssl (bool): Использовать SMTP поверх SSL.
+        smtp_timeout (int): Таймаут сетевых операций SMTP в секундах.
+        smtp_pool_size (int): Максимум SMTP-соединений на процесс воркера;
+            по умолчанию равен числу потоков воркера, чтобы у каждого была своя сессия.
+        smtp_idle_timeout (int): Через сколько секунд простоя соединение закрывается.
+        batch_size (int): Максимальное количество писем в одной пакетной задаче.
+        digest_redis_url (Optional[str]): Адрес Redis для буфера дайджестов; без него письма уходят сразу.
+        digest_window_seconds (int): Сколько секунд копить уведомления получателя перед отправкой.
+        digest_dedupe_seconds (int): Сколько секунд помнить id события дайджеста, чтобы
+            повторная передача того же сообщения outbox не попала в дайджест дважды.
+        outbox_relay_enabled (bool): Запускать ли ретранслятор outbox в процессе приложения.
+        outbox_batch_size (int): Сколько сообщений outbox передаётся в Celery за один проход.
+        outbox_poll_seconds (float): Интервал опроса outbox, если ретранслятор не разбудили.
+        idempotency_redis_url (Optional[str]): Адрес Redis для ключей идемпотентности писем.
+        idempotency_ttl_seconds (int): Сколько секунд помнить отправленное письмо.
+        idempotency_in_flight_seconds (int): Сколько секунд ключ считается занятым отправкой,
+            если задача упала, не дождавшись ответа сервера; задержка ретрая всегда больше.
+        retry_backoff_seconds (int): Начальный шаг экспоненциальной задержки ретрая письма.
+        retry_backoff_max_seconds (int): Максимальный шаг задержки ретрая письма.
     """
     email: str
     email_password: str
+    smtp_host: str = "smtp.yandex.ru"
+    smtp_port: int = 465
+    smtp_use_ssl: bool = True
+    smtp_timeout: int = 10
+    smtp_pool_size: int = 4
+    smtp_idle_timeout: int = 60
+    batch_size: int = 100
+    digest_redis_url: Optional[str] = None
+    digest_window_seconds: int = 60
+    digest_dedupe_seconds: int = 86400
+    outbox_relay_enabled: bool = True
+    outbox_batch_size: int = 100
+    outbox_poll_seconds: float = 1.0
+    idempotency_redis_url: Optional[str] = None
+    idempotency_ttl_seconds: int = 86400
+    idempotency_in_flight_seconds: int = 60
+    retry_backoff_seconds: int = 30
+    retry_backoff_max_seconds: int = 600
 
 
 @dataclass
@@ -34,10 +74,13 @@ class JWTConfig:
     Атрибуты:
         secret_key (str): Секретный ключ для подписи токенов.
         access_token_expire_seconds (int): Время жизни токена доступа в секундах.
+        revocation_redis_url (Optional[str]): URL Redis для отзывов токенов; без него
+            быстрый путь аутентификации проверяет версию токенов по таблице users.
     """
 
     secret_key: str
     access_token_expire_seconds: int
+    revocation_redis_url: Optional[str] = None
 
 
 @dataclass
@@ -47,10 +90,65 @@ class CeleryConfig:
 
     Атрибуты:
         broker_url (str): URL брокера сообщений.
-        result_backend_url (str): URL хранилища результатов.
+        result_backend_url (Optional[str]): URL хранилища результатов; без него результаты не сохраняются.
+        dispatch_queue_size (int): Длина очереди публикации задач из приложения.
+        dispatch_policy (str): Поведение при переполнении очереди: block или drop.
+        worker_pool (str): Пул воркера: threads для I/O-задач, prefork или solo.
+        worker_concurrency (int): Количество потоков (процессов) воркера.
+        prefetch_multiplier (int): Сколько задач воркер резервирует на поток.
+        acks_late (bool): Подтверждать задачу после выполнения, а не при получении.
+        email_rate_limit (Optional[str]): Ограничение скорости отправки писем на процесс воркера,
+            например "20/s"; считается каждое письмо, в том числе внутри пачки.
+        ignore_result (bool): Не сохранять результаты задач по умолчанию.
+        result_expires (int): Через сколько секунд сохранённые результаты удаляются.
+        default_queue (str): Очередь для задач без явного маршрута.
+        notifications_queue (str): Очередь задач отправки писем.
+        notifications_priority (int): Приоритет писем, отправляемых сразу (для Redis 0 — наивысший).
+        digest_priority (int): Приоритет дайджестов и других отложенных писем.
     """
     broker_url: str
-    result_backend_url: str
+    result_backend_url: Optional[str] = None
+    dispatch_queue_size: int = 1000
+    dispatch_policy: str = "block"
+    worker_pool: str = "threads"
+    worker_concurrency: int = 16
+    prefetch_multiplier: int = 4
+    acks_late: bool = True
+    email_rate_limit: Optional[str] = None
+    ignore_result: bool = True
+    result_expires: int = 3600
+    default_queue: str = "default"
+    notifications_queue: str = "notifications"
+    notifications_priority: int = 0
+    digest_priority: int = 6
+
+
+@dataclass
+class CacheConfig:
+    """
+    Конфигурация кэша.
+
+    Атрибуты:
+        backend (str): Хранилище кэша: auto, tiered, redis, local или none.
+            В режиме auto без `redis_url` используется только локальный кэш процесса.
+        redis_url (Optional[str]): URL Redis для общего кэша.
+        local_ttl_seconds (int): Максимальное время жизни записи в локальном кэше.
+        local_max_size (int): Максимальное количество записей в локальном кэше.
+        user_ttl_seconds (int): Время жизни записи пользователя в кэше.
+        stats_ttl_seconds (int): Время жизни статистики задач в кэше.
+        task_ttl_seconds (int): Время жизни задачи в кэше.
+        key_version (int): Версия формата ключей сущностей; увеличение
+            делает все ранее закэшированные записи недоступными.
+    """
+
+    backend: str = "auto"
+    redis_url: Optional[str] = None
+    local_ttl_seconds: int = 5
+    local_max_size: int = 10_000
+    user_ttl_seconds: int = 60
+    stats_ttl_seconds: int = 30
+    task_ttl_seconds: int = 300
+    key_version: int = 1
 
 
 @dataclass
@@ -60,9 +158,59 @@ class DatabaseConfig:
 
     Атрибуты:
         database_url (str): URL подключения к базе данных.
+        echo (bool): Логирование SQL-запросов (по умолчанию совпадает с DEBUG).
+        pool_size (int): Количество постоянно открытых соединений в пуле.
+        max_overflow (int): Сколько соединений можно открыть сверх pool_size.
+        pool_timeout (int): Время ожидания свободного соединения в секундах.
+        pool_recycle (int): Через сколько секунд соединение пересоздаётся.
+        pool_pre_ping (bool): Проверять соединение перед выдачей из пула.
+        statement_cache_size (int): Размер кэша prepared statements asyncpg
+            на соединение (0 отключает кэш, например для pgbouncer).
+        replica_url (Optional[str]): URL реплики только для чтения.
+        read_your_writes_seconds (int): Сколько секунд после записи клиент
+            читает с primary, чтобы видеть собственные изменения.
+        read_your_writes_redis_url (Optional[str]): URL Redis, через который
+            закрепление за primary видят все процессы приложения.
+        replica_retry_seconds (int): Сколько секунд не обращаться к реплике
+            после ошибки подключения к ней.
+        change_settle_seconds (float): Изменения задач моложе этого срока
+            не отдаются дельта-синхронизацией, пока не зафиксируются
+            все изменения с меньшими номерами.
+        tombstone_retention_days (int): Сколько дней хранятся надгробия
+            удалённых задач; более старые водяные знаки отклоняются.
     """
 
     database_url: str
+    echo: bool = False
+    pool_size: int = 10
+    max_overflow: int = 20
+    pool_timeout: int = 30
+    pool_recycle: int = 1800
+    pool_pre_ping: bool = True
+    statement_cache_size: int = 100
+    replica_url: Optional[str] = None
+    read_your_writes_seconds: int = 5
+    read_your_writes_redis_url: Optional[str] = None
+    replica_retry_seconds: int = 30
+    change_settle_seconds: float = 2.0
+    tombstone_retention_days: int = 30
+
+
+@dataclass
+class EventsConfig:
+    """
+    Конфигурация потока изменений задач (SSE).
+
+    Атрибуты:
+        buffer_size (int): Сколько событий хранится для одного клиента;
+            при переполнении подписка закрывается.
+        heartbeat_seconds (float): Интервал пустых сообщений, поддерживающих соединение.
+        listener_retry_seconds (float): Пауза перед переподключением `LISTEN` к PostgreSQL.
+    """
+
+    buffer_size: int = 100
+    heartbeat_seconds: float = 15.0
+    listener_retry_seconds: float = 5.0
 
 
 @dataclass
@@ -74,6 +222,12 @@ class Config:
         db (DatabaseConfig): Настройки подключения к БД.
         jwt (JWTConfig): Настройки JWT.
         debug (bool): Режим отладки.
+        celery (CeleryConfig): Настройки Celery.
+        mailing (EmailConfig): Настройки email рассылок.
+        cache (CacheConfig): Настройки кэша.
+        events (EventsConfig): Настройки потока изменений задач.
+        fast_list_responses (bool): Отдавать списки `GET /tasks` и `GET /users` через
+            `FastJSONResponse`, минуя валидацию `response_model`.
     """
 
     db: DatabaseConfig
@@ -81,6 +235,9 @@ class Config:
     debug: bool
     celery: CeleryConfig
     mailing: EmailConfig
+    cache: CacheConfig
+    events: EventsConfig
+    fast_list_responses: bool = False
 
 
 def load_config(path: str = "./.env") -> Config:
@@ -96,21 +253,99 @@ def load_config(path: str = "./.env") -> Config:
     env = Env()
     env.read_env(path)
 
+    debug = env.bool("DEBUG", default=False)
+    worker_concurrency = env.int("CELERY_WORKER_CONCURRENCY", default=16)
+
     return Config(
-        db=DatabaseConfig(database_url=env("DATABASE_URL")),
+        db=DatabaseConfig(
+            database_url=env("DATABASE_URL"),
+            echo=env.bool("DB_ECHO", default=debug),
+            pool_size=env.int("DB_POOL_SIZE", default=10),
+            max_overflow=env.int("DB_MAX_OVERFLOW", default=20),
+            pool_timeout=env.int("DB_POOL_TIMEOUT", default=30),
+            pool_recycle=env.int("DB_POOL_RECYCLE", default=1800),
+            pool_pre_ping=env.bool("DB_POOL_PRE_PING", default=True),
+            statement_cache_size=env.int("DB_STATEMENT_CACHE_SIZE", default=100),
+            replica_url=env("DATABASE_REPLICA_URL", default=None),
+            read_your_writes_seconds=env.int("DB_READ_YOUR_WRITES_SECONDS", default=5),
+            read_your_writes_redis_url=env("DB_READ_YOUR_WRITES_REDIS_URL", default=None),
+            replica_retry_seconds=env.int("DB_REPLICA_RETRY_SECONDS", default=30),
+            change_settle_seconds=env.float("DB_CHANGE_SETTLE_SECONDS", default=2.0),
+            tombstone_retention_days=env.int("DB_TOMBSTONE_RETENTION_DAYS", default=30),
+        ),
         jwt=JWTConfig(
             secret_key=env("SECRET_KEY"),
             access_token_expire_seconds=env.int(
                 "ACCESS_TOKEN_EXPIRE_SECONDS", default=5000
             ),
+            revocation_redis_url=env("JWT_REVOCATION_REDIS_URL", default=None),
         ),
-        debug=env.bool("DEBUG", default=False),
+        debug=debug,
         celery=CeleryConfig(
             broker_url=env("CELERY_BROKER_URL"),
-            result_backend_url=env("CELERY_RESULT_BACKEND_URL"),
+            result_backend_url=env("CELERY_RESULT_BACKEND_URL", default=None),
+            dispatch_queue_size=env.int("CELERY_DISPATCH_QUEUE_SIZE", default=1000),
+            dispatch_policy=env.str(
+                "CELERY_DISPATCH_POLICY",
+                default="block",
+                validate=validate.OneOf(["block", "drop"]),
+            ),
+            worker_pool=env.str(
+                "CELERY_WORKER_POOL",
+                default="threads",
+                validate=validate.OneOf(["threads", "prefork", "solo"]),
+            ),
+            worker_concurrency=worker_concurrency,
+            prefetch_multiplier=env.int("CELERY_PREFETCH_MULTIPLIER", default=4),
+            acks_late=env.bool("CELERY_ACKS_LATE", default=True),
+            email_rate_limit=env("CELERY_EMAIL_RATE_LIMIT", default=None),
+            ignore_result=env.bool("CELERY_IGNORE_RESULT", default=True),
+            result_expires=env.int("CELERY_RESULT_EXPIRES", default=3600),
+            default_queue=env("CELERY_DEFAULT_QUEUE", default="default"),
+            notifications_queue=env("CELERY_NOTIFICATIONS_QUEUE", default="notifications"),
+            notifications_priority=env.int("CELERY_NOTIFICATIONS_PRIORITY", default=0),
+            digest_priority=env.int("CELERY_DIGEST_PRIORITY", default=6),
         ),
         mailing=EmailConfig(
             email=env("EMAIL"),
             email_password=env("EMAIL_PASSWORD"),
-        )
+            smtp_host=env("SMTP_HOST", default="smtp.yandex.ru"),
+            smtp_port=env.int("SMTP_PORT", default=465),
+            smtp_use_ssl=env.bool("SMTP_USE_SSL", default=True),
+            smtp_timeout=env.int("SMTP_TIMEOUT", default=10),
+            smtp_pool_size=env.int("SMTP_POOL_SIZE", default=worker_concurrency),
+            smtp_idle_timeout=env.int("SMTP_IDLE_TIMEOUT", default=60),
+            batch_size=env.int("EMAIL_BATCH_SIZE", default=100),
+            digest_redis_url=env("EMAIL_DIGEST_REDIS_URL", default=None),
+            digest_window_seconds=env.int("EMAIL_DIGEST_WINDOW_SECONDS", default=60),
+            digest_dedupe_seconds=env.int("EMAIL_DIGEST_DEDUPE_SECONDS", default=86400),
+            outbox_relay_enabled=env.bool("OUTBOX_RELAY_ENABLED", default=True),
+            outbox_batch_size=env.int("OUTBOX_BATCH_SIZE", default=100),
+            outbox_poll_seconds=env.float("OUTBOX_POLL_SECONDS", default=1.0),
+            idempotency_redis_url=env("EMAIL_IDEMPOTENCY_REDIS_URL", default=None),
+            idempotency_ttl_seconds=env.int("EMAIL_IDEMPOTENCY_TTL_SECONDS", default=86400),
+            idempotency_in_flight_seconds=env.int("EMAIL_IDEMPOTENCY_IN_FLIGHT_SECONDS", default=60),
+            retry_backoff_seconds=env.int("EMAIL_RETRY_BACKOFF_SECONDS", default=30),
+            retry_backoff_max_seconds=env.int("EMAIL_RETRY_BACKOFF_MAX_SECONDS", default=600),
+        ),
+        cache=CacheConfig(
+            backend=env.str(
+                "CACHE_BACKEND",
+                default="auto",
+                validate=validate.OneOf(["auto", "tiered", "redis", "local", "none"]),
+            ),
+            redis_url=env("REDIS_URL", default=None),
+            local_ttl_seconds=env.int("CACHE_LOCAL_TTL_SECONDS", default=5),
+            local_max_size=env.int("CACHE_LOCAL_MAX_SIZE", default=10_000),
+            user_ttl_seconds=env.int("CACHE_USER_TTL_SECONDS", default=60),
+            stats_ttl_seconds=env.int("CACHE_STATS_TTL_SECONDS", default=30),
+            task_ttl_seconds=env.int("CACHE_TASK_TTL_SECONDS", default=300),
+            key_version=env.int("CACHE_KEY_VERSION", default=1),
+        ),
+        events=EventsConfig(
+            buffer_size=env.int("TASK_EVENTS_BUFFER_SIZE", default=100),
+            heartbeat_seconds=env.float("TASK_EVENTS_HEARTBEAT_SECONDS", default=15.0),
+            listener_retry_seconds=env.float("TASK_EVENTS_RETRY_SECONDS", default=5.0),
+        ),
+        fast_list_responses=env.bool("FAST_LIST_RESPONSES", default=False),
     )
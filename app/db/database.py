@@ -1,18 +1,33 @@
 """
 Настройка асинхронного подключения к базе данных с использованием SQLAlchemy.
 
-- Создаёт асинхронный движок с помощью `create_async_engine`.
+- Создаёт асинхронный движок с помощью `create_async_engine`
+  с настройками пула из `DatabaseConfig`.
 - Инициализирует фабрику сессий через `async_sessionmaker`.
 - Предоставляет зависимость `get_async_session` для FastAPI,
   возвращающую асинхронную сессию SQLAlchemy.
+- Предоставляет зависимость `get_read_session` для маршрутов только на чтение:
+  при настроенной реплике запросы идут на неё, кроме случаев,
+  когда клиент недавно писал или реплика недоступна.
+- `primary_session` даёт сессию на primary для чтений, результат которых
+  видят другие клиенты (заполнение кэша).
 """
 
 import logging
-from typing import AsyncGenerator
+from contextlib import asynccontextmanager
+from typing import AsyncGenerator, AsyncIterator, Optional
 
-from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from fastapi import Request
+from sqlalchemy import event
+from sqlalchemy.engine import make_url
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.orm import Session
 
-from app.core.config import load_config
+from app.core.config import DatabaseConfig, load_config
+from app.db.metrics import InstrumentedAsyncQueuePool, instrument_engine
+from app.db.routing import ReadRouter, client_key
 
 logger = logging.getLogger(__name__)
 
@@ -20,19 +35,151 @@ config = load_config()
 
 DATABASE_URL = config.db.database_url
 
-engine = create_async_engine(DATABASE_URL, echo=True)
+
+def create_engine_from_config(db_config: DatabaseConfig, url: str, label: str) -> AsyncEngine:
+    """
+    Создаёт асинхронный движок с настройками пула из конфигурации.
+
+    Args:
+        db_config (DatabaseConfig): Настройки подключения и пула.
+        url (str): URL базы данных.
+        label (str): Имя пула в логах и метриках.
+
+    Returns:
+        AsyncEngine: Движок с инструментированным пулом соединений.
+    """
+    connect_args = {}
+    if make_url(url).get_driver_name() == "asyncpg":
+        connect_args["prepared_statement_cache_size"] = db_config.statement_cache_size
+
+    new_engine = create_async_engine(
+        url,
+        echo=db_config.echo,
+        poolclass=InstrumentedAsyncQueuePool,
+        pool_size=db_config.pool_size,
+        max_overflow=db_config.max_overflow,
+        pool_timeout=db_config.pool_timeout,
+        pool_recycle=db_config.pool_recycle,
+        pool_pre_ping=db_config.pool_pre_ping,
+        pool_logging_name=label,
+        connect_args=connect_args,
+    )
+    instrument_engine(new_engine, label)
+    return new_engine
+
+
+engine = create_engine_from_config(config.db, DATABASE_URL, "primary")
 
 async_session_maker = async_sessionmaker(
     engine, class_=AsyncSession, expire_on_commit=False
 )
 
+read_engine = (
+    create_engine_from_config(config.db, config.db.replica_url, "replica")
+    if config.db.replica_url
+    else None
+)
 
-async def get_async_session() -> AsyncGenerator[AsyncSession, None]:
+read_session_maker = (
+    async_sessionmaker(read_engine, class_=AsyncSession, expire_on_commit=False)
+    if read_engine is not None
+    else None
+)
+
+read_router = ReadRouter(
+    pin_seconds=config.db.read_your_writes_seconds,
+    retry_seconds=config.db.replica_retry_seconds,
+    redis_url=config.db.read_your_writes_redis_url,
+)
+
+
+@event.listens_for(Session, "after_commit")
+def _pin_writer_to_primary(session: Session) -> None:
+    """Закрепляет клиента за primary после фиксации его записи."""
+    key = session.info.get("client_key")
+    if key is not None:
+        read_router.pin(key)
+        session.info["share_pin"] = True
+
+
+async def get_async_session(request: Request = None) -> AsyncGenerator[AsyncSession, None]:
     """
     Предоставляет асинхронную сессию SQLAlchemy для взаимодействия с БД.
 
     Используется как зависимость в эндпоинтах FastAPI, чтобы обрабатывать транзакции
     с базой данных через единичный жизненный цикл сессии на каждый запрос.
+    Если в запросе была запись, закрепление клиента за primary записывается
+    в общий Redis при закрытии зависимости, то есть до отправки ответа.
+    """
+    async with async_session_maker() as session:
+        if request is not None and read_session_maker is not None:
+            session.info["client_key"] = client_key(request)
+        try:
+            yield session
+        finally:
+            if session.info.pop("share_pin", False):
+                await read_router.share_pin(session.info["client_key"])
+
+
+async def open_read_session(key: Optional[str] = None) -> AsyncSession:
+    """
+    Открывает сессию для чтения на реплике или, при необходимости, на primary.
+
+    Primary используется, если реплика не настроена, клиент недавно писал
+    или реплика недоступна. Соединение с репликой устанавливается сразу,
+    чтобы при ошибке прозрачно переключиться на primary.
+
+    Args:
+        key (Optional[str]): Ключ клиента для проверки read-your-writes.
+
+    Returns:
+        AsyncSession: Открытая сессия; закрывать её должен вызывающий код.
+    """
+    if (
+        read_session_maker is None
+        or await read_router.is_pinned(key)
+        or not read_router.replica_available()
+    ):
+        return async_session_maker()
+
+    session = read_session_maker()
+    try:
+        await session.connection()
+    except (DBAPIError, PoolTimeoutError, OSError) as e:
+        logger.warning(f"Replica unavailable, falling back to primary: {e}")
+        read_router.mark_replica_down()
+        await session.close()
+        return async_session_maker()
+    return session
+
+
+async def get_read_session(request: Request) -> AsyncGenerator[AsyncSession, None]:
+    """
+    Предоставляет сессию SQLAlchemy для маршрутов только на чтение.
+
+    См. `open_read_session`.
+    """
+    async with await open_read_session(client_key(request)) as session:
+        yield session
+
+
+@asynccontextmanager
+async def primary_session(db: AsyncSession) -> AsyncIterator[AsyncSession]:
+    """
+    Сессия на primary для чтения рядом с сессией запроса.
+
+    Нужна, когда прочитанное значение увидят другие клиенты, например
+    при заполнении кэша: значение с отстающей реплики осталось бы в кэше
+    до истечения TTL, даже после сброса записи.
+
+    Args:
+        db (AsyncSession): Сессия запроса.
+
+    Yields:
+        AsyncSession: `db`, если она уже на primary, иначе новая сессия на primary.
     """
+    if db.get_bind() is engine.sync_engine:
+        yield db
+        return
     async with async_session_maker() as session:
         yield session
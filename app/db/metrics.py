@@ -0,0 +1,78 @@
+"""
+Метрики пула соединений SQLAlchemy для Prometheus.
+
+- `InstrumentedAsyncQueuePool` замеряет время ожидания свободного соединения.
+- `instrument_engine` регистрирует gauge-метрики занятости пула.
+
+Метрики попадают в глобальный реестр prometheus_client и отдаются
+существующим эндпоинтом `/metrics`.
+"""
+
+import logging
+import time
+
+from prometheus_client import Counter, Gauge, Histogram
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+logger = logging.getLogger(__name__)
+
+POOL_CHECKOUT_WAIT = Histogram(
+    "db_pool_checkout_wait_seconds",
+    "Время ожидания соединения из пула.",
+    ["pool"],
+    buckets=(0.0005, 0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30),
+)
+POOL_CHECKOUTS = Counter(
+    "db_pool_checkouts_total", "Количество выдач соединений из пула.", ["pool"]
+)
+POOL_CHECKOUT_TIMEOUTS = Counter(
+    "db_pool_checkout_timeouts_total",
+    "Количество отказов из-за истечения pool_timeout.",
+    ["pool"],
+)
+POOL_CHECKED_OUT = Gauge(
+    "db_pool_checked_out", "Количество соединений, выданных из пула.", ["pool"]
+)
+POOL_OVERFLOW = Gauge(
+    "db_pool_overflow", "Количество открытых соединений сверх pool_size.", ["pool"]
+)
+POOL_SIZE = Gauge("db_pool_size", "Настроенный размер пула.", ["pool"])
+
+
+class InstrumentedAsyncQueuePool(AsyncAdaptedQueuePool):
+    """
+    Асинхронный QueuePool, замеряющий время получения соединения.
+
+    Метка метрик берётся из `pool_logging_name` движка.
+    """
+
+    def _do_get(self):
+        label = self._orig_logging_name or "default"
+        start = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except PoolTimeoutError:
+            POOL_CHECKOUT_TIMEOUTS.labels(label).inc()
+            raise
+        finally:
+            POOL_CHECKOUT_WAIT.labels(label).observe(time.perf_counter() - start)
+        POOL_CHECKOUTS.labels(label).inc()
+        return connection
+
+
+def instrument_engine(engine: AsyncEngine, label: str) -> None:
+    """
+    Регистрирует gauge-метрики пула соединений движка.
+
+    Значения вычисляются в момент сбора метрик, поэтому остаются
+    корректными и после пересоздания пула через `engine.dispose()`.
+
+    Args:
+        engine (AsyncEngine): Движок, пул которого нужно отслеживать.
+        label (str): Значение метки `pool`.
+    """
+    POOL_CHECKED_OUT.labels(label).set_function(lambda: engine.pool.checkedout())
+    POOL_OVERFLOW.labels(label).set_function(lambda: max(engine.pool.overflow(), 0))
+    POOL_SIZE.labels(label).set_function(lambda: engine.pool.size())
@@ -1,19 +1,38 @@
 """
 Модели базы данных для пользователей и задач.
 
-Содержит определения таблиц 'users' и 'tasks', включая отношения между ними.
+Содержит определения таблиц 'users' и 'tasks', включая отношения между ними,
+таблицу удалённых задач 'task_tombstones' и границу их хранения
+'task_change_horizon' для дельта-синхронизации, а также таблицу исходящих уведомлений 'notification_outbox'.
 Реализовано с использованием SQLAlchemy ORM и FastAPI Users.
 """
 
 import logging
+from datetime import datetime
 from typing import List, Optional
 
 from fastapi_users.db import SQLAlchemyBaseUserTable
-from sqlalchemy import Boolean, ForeignKey, Integer, String
+from sqlalchemy import (
+    BigInteger,
+    Boolean,
+    ColumnElement,
+    DateTime,
+    ForeignKey,
+    Index,
+    Integer,
+    Sequence,
+    String,
+    func,
+    text,
+)
+from sqlalchemy.ext.compiler import compiles
 from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column, relationship
+from sqlalchemy.sql.expression import FunctionElement
 
 logger = logging.getLogger(__name__)
 
+SEARCH_CONFIG = "russian"
+
 
 class Base(DeclarativeBase):
     """Базовый класс для всех моделей SQLAlchemy."""
@@ -21,6 +40,45 @@ class Base(DeclarativeBase):
     pass
 
 
+CHANGE_SEQUENCE = Sequence("task_change_seq", metadata=Base.metadata)
+
+
+class NextChangeSeq(FunctionElement):
+    """
+    Следующий номер изменения задачи.
+
+    Общий для задач и их надгробий счётчик, по которому `GET /tasks/changes`
+    отбирает изменения после водяного знака: `nextval` последовательности
+    `task_change_seq`. Компилируется только для PostgreSQL.
+    """
+
+    type = BigInteger()
+    inherit_cache = True
+
+
+class ChangeTimestamp(FunctionElement):
+    """
+    Время изменения задачи.
+
+    `clock_timestamp()`, то есть время выполнения запроса, а не начала
+    транзакции: по нему отсекаются изменения, которые могли ещё не
+    зафиксироваться. Компилируется только для PostgreSQL.
+    """
+
+    type = DateTime(timezone=True)
+    inherit_cache = True
+
+
+@compiles(NextChangeSeq, "postgresql")
+def _next_change_seq_postgresql(element, compiler, **kw) -> str:
+    return f"nextval('{CHANGE_SEQUENCE.name}')"
+
+
+@compiles(ChangeTimestamp, "postgresql")
+def _change_timestamp_postgresql(element, compiler, **kw) -> str:
+    return "clock_timestamp()"
+
+
 class User(SQLAlchemyBaseUserTable, Base):
     """
     Модель пользователя.
@@ -28,6 +86,9 @@ class User(SQLAlchemyBaseUserTable, Base):
     Атрибуты:
         id (int): Уникальный идентификатор пользователя.
         username (str): Отображаемое имя пользователя.
+        token_version (int): Версия токенов; увеличивается при деактивации,
+            смене пароля и удалении, чтобы отозвать выданные JWT.
+        version (int): Версия строки для ETag; увеличивается при каждом изменении.
         tasks (List[Task]): Список задач, принадлежащих пользователю.
     """
 
@@ -35,11 +96,15 @@ class User(SQLAlchemyBaseUserTable, Base):
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
     username: Mapped[str] = mapped_column(String, index=True)
+    token_version: Mapped[int] = mapped_column(Integer, default=0, server_default="0")
+    version: Mapped[int] = mapped_column(Integer, server_default="1")
 
     tasks: Mapped[List["Task"]] = relationship(
         back_populates="user", cascade="all, delete-orphan"
     )
 
+    __mapper_args__ = {"version_id_col": version}
+
 
 class Task(Base):
     """
@@ -51,15 +116,140 @@ class Task(Base):
         description (Optional[str]): Описание задачи.
         completed (bool): Флаг завершённости задачи.
         user_id (int): Внешний ключ на пользователя (владельца).
+        version (int): Версия строки для ETag; увеличивается при каждом изменении.
+        change_seq (int): Номер последнего изменения задачи (см. `NextChangeSeq`).
+        updated_at (datetime): Время последнего изменения задачи.
         user (User): Отношение к модели пользователя.
+
+    Версию увеличивает ORM (`version_id_col`), а запросы `UPDATE` сервиса
+    задают её явно: `version = version + 1`. `change_seq` и `updated_at`
+    обновляются значениями по умолчанию колонок при любом INSERT и UPDATE.
+
+    Индексы повторяют запросы `TaskService`:
+        ix_tasks_user_id_id: задачи пользователя по возрастанию ID (keyset-пагинация).
+        ix_tasks_user_id_completed_id: то же с фильтром по `completed` и статистика.
+        ix_tasks_user_id_change_seq: изменения задач пользователя после водяного знака.
+        ix_tasks_search: GIN-индекс полнотекстового поиска (только PostgreSQL),
+            см. `task_search_vector`.
     """
 
     __tablename__ = "tasks"
+    __table_args__ = (
+        Index("ix_tasks_user_id_id", "user_id", "id"),
+        Index("ix_tasks_user_id_completed_id", "user_id", "completed", "id"),
+        Index("ix_tasks_user_id_change_seq", "user_id", "change_seq", "id"),
+    )
 
-    id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
     title: Mapped[str] = mapped_column(String, index=True)
-    description: Mapped[Optional[str]] = mapped_column(String, index=True)
+    description: Mapped[Optional[str]] = mapped_column(String)
     completed: Mapped[bool] = mapped_column(Boolean, default=False)
     user_id: Mapped[int] = mapped_column(ForeignKey("users.id", ondelete="CASCADE"))
+    version: Mapped[int] = mapped_column(Integer, server_default="1")
+    change_seq: Mapped[int] = mapped_column(BigInteger, default=NextChangeSeq(), onupdate=NextChangeSeq())
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        default=ChangeTimestamp(),
+        onupdate=ChangeTimestamp(),
+        server_default=func.now(),
+    )
 
     user: Mapped["User"] = relationship(back_populates="tasks")
+
+    __mapper_args__ = {"version_id_col": version}
+
+
+def task_search_vector() -> ColumnElement:
+    """
+    Выражение `tsvector` по названию и описанию задачи.
+
+    Запрос поиска должен использовать это же выражение, иначе PostgreSQL
+    не применит GIN-индекс `ix_tasks_search`. Все константы записаны
+    литералами, а не параметрами, чтобы выражение совпадало с индексным.
+    """
+    document = (
+        func.coalesce(Task.title, text("''"))
+        .op("||")(text("' '"))
+        .op("||")(func.coalesce(Task.description, text("''")))
+    )
+    return func.to_tsvector(text(f"'{SEARCH_CONFIG}'"), document)
+
+
+Index("ix_tasks_search", task_search_vector(), postgresql_using="gin").ddl_if(dialect="postgresql")
+
+
+class TaskTombstone(Base):
+    """
+    Надгробие удалённой задачи.
+
+    Записывается в той же транзакции, что и удаление, и получает номер
+    изменения из общего с задачами счётчика, поэтому клиент дельта-синхронизации
+    узнаёт об удалении так же, как об изменении.
+
+    Атрибуты:
+        id (int): Уникальный идентификатор записи.
+        task_id (int): ID удалённой задачи.
+        user_id (int): Владелец удалённой задачи.
+        change_seq (int): Номер изменения.
+        deleted_at (datetime): Время удаления.
+    """
+
+    __tablename__ = "task_tombstones"
+    __table_args__ = (
+        Index("ix_task_tombstones_user_id_change_seq", "user_id", "change_seq", "task_id"),
+        Index("ix_task_tombstones_deleted_at", "deleted_at"),
+    )
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    task_id: Mapped[int] = mapped_column(Integer)
+    user_id: Mapped[int] = mapped_column(ForeignKey("users.id", ondelete="CASCADE"))
+    change_seq: Mapped[int] = mapped_column(BigInteger, default=NextChangeSeq())
+    deleted_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), default=ChangeTimestamp(), server_default=func.now()
+    )
+
+
+class TaskChangeHorizon(Base):
+    """
+    Граница хранения надгробий (одна строка).
+
+    Надгробия старше `DB_TOMBSTONE_RETENTION_DAYS` удаляются, и здесь
+    запоминается наибольший удалённый номер изменения. Водяной знак
+    с меньшим номером мог пропустить удаление, поэтому такой клиент
+    должен выполнить полную синхронизацию.
+
+    Атрибуты:
+        id (int): Всегда 1.
+        change_seq (int): Наибольший номер изменения удалённых надгробий.
+    """
+
+    __tablename__ = "task_change_horizon"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    change_seq: Mapped[int] = mapped_column(BigInteger, server_default=text("0"))
+
+
+class OutboxMessage(Base):
+    """
+    Исходящее уведомление (transactional outbox).
+
+    Записывается в той же транзакции, что и изменение данных, и удаляется
+    после передачи в Celery, поэтому письмо уходит только после успешного коммита.
+
+    Атрибуты:
+        id (int): Уникальный идентификатор сообщения.
+        to_email (str): Email-адрес получателя.
+        subject (str): Тема письма.
+        body (str): Текст письма.
+        digest (bool): Можно ли объединить уведомление в дайджест.
+        created_at (datetime): Время создания сообщения.
+    """
+
+    __tablename__ = "notification_outbox"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    to_email: Mapped[str] = mapped_column(String)
+    subject: Mapped[str] = mapped_column(String)
+    body: Mapped[str] = mapped_column(String)
+    digest: Mapped[bool] = mapped_column(Boolean, default=False)
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now())
@@ -0,0 +1,117 @@
+"""
+Маршрутизация чтения между primary и репликой.
+
+Хранит состояние, необходимое зависимости `get_read_session`:
+- закрепление клиента за primary на несколько секунд после его записи
+  (read-your-writes), чтобы клиент не увидел устаревшие данные реплики;
+- временную пометку реплики недоступной после ошибки подключения.
+
+Закрепление хранится в памяти процесса. При нескольких воркерах или
+экземплярах следующий запрос клиента может попасть в другой процесс,
+поэтому закрепление дублируется в Redis (`DB_READ_YOUR_WRITES_REDIS_URL`)
+ключом `ryw:<клиент>` с TTL `DB_READ_YOUR_WRITES_SECONDS`. Ключ записывается
+до отправки ответа на запрос с записью. Без Redis или при его недоступности
+закрепление действует только в процессе, который выполнил запись.
+"""
+
+import hashlib
+import logging
+import time
+from collections import OrderedDict
+from typing import Optional
+
+import redis.asyncio as redis
+from fastapi import Request
+from redis.exceptions import RedisError
+
+logger = logging.getLogger(__name__)
+
+MAX_PINNED_CLIENTS = 10_000
+PIN_KEY = "ryw:{}"
+
+
+def client_key(request: Request) -> str:
+    """
+    Возвращает ключ клиента для закрепления за primary.
+
+    Аутентифицированный клиент определяется по токену, анонимный — по адресу.
+
+    Args:
+        request (Request): Текущий HTTP-запрос.
+
+    Returns:
+        str: Ключ клиента.
+    """
+    authorization = request.headers.get("Authorization")
+    if authorization:
+        return "auth:" + hashlib.sha256(authorization.encode()).hexdigest()
+    host = request.client.host if request.client else "unknown"
+    return f"ip:{host}"
+
+
+class ReadRouter:
+    """
+    Состояние маршрутизации чтения.
+
+    Атрибуты:
+        pin_seconds (int): Время закрепления клиента за primary после записи.
+        retry_seconds (int): Время, на которое реплика исключается после ошибки.
+        redis_url (Optional[str]): Redis для закреплений, общих для всех процессов.
+    """
+
+    def __init__(self, pin_seconds: int, retry_seconds: int, redis_url: Optional[str] = None):
+        self.pin_seconds = pin_seconds
+        self.retry_seconds = retry_seconds
+        self.redis_url = redis_url
+        self._pins: OrderedDict[str, float] = OrderedDict()
+        self._replica_down_until = 0.0
+        self._client: Optional[redis.Redis] = redis.from_url(redis_url) if redis_url else None
+
+    def pin(self, key: Optional[str]) -> None:
+        """Закрепляет клиента за primary на `pin_seconds` секунд в этом процессе."""
+        if key is None or self.pin_seconds <= 0:
+            return
+        self._pins[key] = time.monotonic() + self.pin_seconds
+        self._pins.move_to_end(key)
+        while len(self._pins) > MAX_PINNED_CLIENTS:
+            self._pins.popitem(last=False)
+
+    async def share_pin(self, key: Optional[str]) -> None:
+        """Записывает закрепление клиента в Redis, чтобы его видели другие процессы."""
+        if key is None or self.pin_seconds <= 0 or self._client is None:
+            return
+        try:
+            await self._client.set(PIN_KEY.format(key), 1, ex=self.pin_seconds)
+        except RedisError as e:
+            logger.warning(f"Read-your-writes pin was not shared: {e}")
+
+    async def is_pinned(self, key: Optional[str]) -> bool:
+        """Проверяет, должен ли клиент сейчас читать с primary."""
+        if key is None:
+            return False
+        if self._is_pinned_locally(key):
+            return True
+        if self._client is None:
+            return False
+        try:
+            return bool(await self._client.exists(PIN_KEY.format(key)))
+        except RedisError as e:
+            logger.warning(f"Read-your-writes pins unavailable, using local pins only: {e}")
+            return False
+
+    def _is_pinned_locally(self, key: str) -> bool:
+        expires_at = self._pins.get(key)
+        if expires_at is None:
+            return False
+        if expires_at <= time.monotonic():
+            del self._pins[key]
+            return False
+        return True
+
+    def replica_available(self) -> bool:
+        """Проверяет, не помечена ли реплика недоступной."""
+        return time.monotonic() >= self._replica_down_until
+
+    def mark_replica_down(self) -> None:
+        """Исключает реплику из маршрутизации на `retry_seconds` секунд."""
+        self._replica_down_until = time.monotonic() + self.retry_seconds
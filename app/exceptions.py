@@ -95,3 +95,76 @@ class ForbiddenTaskDeleteException(HTTPException):
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Вы не можете удалить задачу, которой не владеете.",
         )
+
+
+class ForbiddenTaskExportException(HTTPException):
+    """
+    Исключение: нет прав на выгрузку задач.
+
+    Вызывается, если пользователь без прав суперпользователя выгружает чужие задачи.
+    """
+
+    def __init__(self):
+        super().__init__(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Выгружать задачи других пользователей может только суперпользователь.",
+        )
+
+
+class ForbiddenTaskStatsException(HTTPException):
+    """
+    Исключение: нет прав на просмотр статистики задач.
+
+    Вызывается, если пользователь без прав суперпользователя запрашивает
+    чужую статистику.
+    """
+
+    def __init__(self):
+        super().__init__(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Статистику других пользователей может смотреть только суперпользователь.",
+        )
+
+
+class InvalidCursorException(HTTPException):
+    """
+    Исключение: некорректный курсор пагинации.
+
+    Вызывается, если переданный клиентом курсор повреждён или сформирован не сервером.
+    """
+
+    def __init__(self):
+        super().__init__(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Некорректный курсор пагинации.",
+        )
+
+
+class ExpiredWatermarkException(HTTPException):
+    """
+    Исключение: водяной знак дельта-синхронизации устарел.
+
+    Вызывается, если после выдачи водяного знака были удалены надгробия,
+    которые клиент ещё не получил. Клиенту нужно выполнить полную
+    синхронизацию, запросив изменения без водяного знака.
+    """
+
+    def __init__(self):
+        super().__init__(
+            status_code=status.HTTP_410_GONE,
+            detail="Водяной знак устарел, выполните полную синхронизацию.",
+        )
+
+
+class PreconditionFailedException(HTTPException):
+    """
+    Исключение: запись изменилась с момента чтения клиентом.
+
+    Вызывается, если версия из заголовка `If-Match` не совпадает с текущей.
+    """
+
+    def __init__(self):
+        super().__init__(
+            status_code=status.HTTP_412_PRECONDITION_FAILED,
+            detail="Запись была изменена. Получите актуальную версию и повторите запрос.",
+        )
@@ -3,18 +3,42 @@
 
 Инициализирует экземпляр FastAPI, подключает роутеры пользователей, задач
 и авторизации через FastAPI Users с использованием JWT-аутентификации.
+На время работы приложения запускает ретранслятор outbox уведомлений
+и слушатель изменений задач для SSE.
 """
 
+import asyncio
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from prometheus_fastapi_instrumentator import Instrumentator
 
 from app.api import tasks, users
+from app.celery_tasks.dispatch import celery_dispatcher
 from app.core.auth_settings import auth_backend, fastapi_users
+from app.core.config import load_config
 from app.core.logging_config import setup_logging
+from app.services.outbox import outbox_relay
+from app.services.task_events import task_event_broker
 
 setup_logging()
 
-app = FastAPI()
+config = load_config()
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Запускает ретранслятор outbox и слушатель изменений задач; при остановке дожидается публикации задач."""
+    if config.mailing.outbox_relay_enabled:
+        outbox_relay.start()
+    task_event_broker.start()
+    yield
+    await task_event_broker.stop()
+    await outbox_relay.stop()
+    await asyncio.to_thread(celery_dispatcher.stop, 5)
+
+
+app = FastAPI(lifespan=lifespan)
 
 Instrumentator(
     should_group_status_codes=True,
@@ -3,12 +3,14 @@ Pydentic модели для валидации данных задачи(task).
 """
 
 import logging
-from typing import Optional
+from typing import List, Optional
 
-from pydantic import BaseModel, ConfigDict, Field
+from pydantic import BaseModel, ConfigDict, Field, field_validator, model_validator
 
 logger = logging.getLogger(__name__)
 
+MAX_BULK_TASKS = 1000
+
 
 class TaskBase(BaseModel):
     """Базовая схема задачи с общими полями."""
@@ -26,14 +28,107 @@ class TaskCreate(TaskBase):
     pass
 
 
+class TaskBulkCreate(BaseModel):
+    """Схема для пакетного создания задач."""
+
+    tasks: List[TaskCreate] = Field(min_length=1, max_length=MAX_BULK_TASKS)
+
+
 class TaskUpdate(TaskBase):
     """Схема для обновления задачи."""
 
     pass
 
 
+class TaskPatch(BaseModel):
+    """Схема для частичного обновления задачи: передаются только изменяемые поля."""
+
+    title: Optional[str] = Field(default=None, min_length=3, max_length=100)
+    description: Optional[str] = Field(default=None, max_length=500)
+    completed: Optional[bool] = None
+
+    @field_validator("title", "completed")
+    @classmethod
+    def check_not_null(cls, value):
+        """Запрещает явный null для обязательных колонок."""
+        if value is None:
+            raise ValueError("Поле не может быть null.")
+        return value
+
+
+class TaskBulkUpdate(TaskPatch):
+    """Схема для пакетного обновления задач по списку ID."""
+
+    ids: List[int] = Field(min_length=1, max_length=MAX_BULK_TASKS)
+
+    @model_validator(mode="after")
+    def check_has_changes(self):
+        """Требует хотя бы одно обновляемое поле помимо списка ID."""
+        if not self.model_fields_set - {"ids"}:
+            raise ValueError("Не указано ни одного поля для обновления.")
+        return self
+
+
 class TaskRead(TaskBase):
-    """Схема для чтения задачи, включая ID и user_id."""
+    """
+    Схема для чтения задачи, включая ID и user_id.
+
+    Версия строки в тело ответа не попадает: маршруты отдают её в заголовке ETag.
+    """
 
     user_id: int
     id: int
+    version: Optional[int] = Field(default=None, exclude=True)
+
+
+class TaskChanges(BaseModel):
+    """
+    Изменения задач после водяного знака.
+
+    Клиент применяет `changed` и `deleted` и передаёт `watermark`
+    в следующий запрос. `has_more` означает, что изменения ещё есть: либо
+    не поместились в страницу, либо придержаны до фиксации предыдущих,
+    и тогда страница может быть пустой.
+    """
+
+    changed: List[TaskRead]
+    deleted: List[int]
+    watermark: Optional[str] = None
+    has_more: bool = False
+
+
+class TaskPage(BaseModel):
+    """Страница задач и курсор для получения следующей страницы."""
+
+    items: List[TaskRead]
+    next_cursor: Optional[str] = None
+
+
+class TaskBulkUpdateResult(BaseModel):
+    """Результат пакетного обновления задач с разбивкой по ID."""
+
+    updated: List[int]
+    not_found: List[int]
+    forbidden: List[int]
+
+
+class TaskStats(BaseModel):
+    """Количество задач и доля завершённых."""
+
+    total: int
+    completed: int
+    completion_rate: float
+
+
+class UserTaskStats(TaskStats):
+    """Статистика задач одного пользователя."""
+
+    user_id: int
+
+
+class TaskStatsReport(BaseModel):
+    """Общая статистика задач, страница разбивки по пользователям и курсор следующей страницы."""
+
+    overall: TaskStats
+    users: List[UserTaskStats]
+    next_cursor: Optional[str] = None
@@ -3,9 +3,10 @@ Pydentic модели для валидации данных пользоват
 """
 
 import logging
+from typing import Optional
 
 from fastapi_users import schemas
-from pydantic import ConfigDict, EmailStr, Field
+from pydantic import BaseModel, ConfigDict, EmailStr, Field, field_validator
 
 logger = logging.getLogger(__name__)
 
@@ -28,10 +29,39 @@ class UserUpdate(schemas.BaseUserUpdate):
     model_config = ConfigDict(from_attributes=True)
 
 
+class UserPatch(BaseModel):
+    """Схема для частичного обновления пользователя: передаются только изменяемые поля."""
+
+    email: Optional[EmailStr] = None
+    username: Optional[str] = Field(default=None, min_length=3, max_length=50)
+
+    @field_validator("email", "username")
+    @classmethod
+    def check_not_null(cls, value):
+        """Запрещает явный null для обязательных колонок."""
+        if value is None:
+            raise ValueError("Поле не может быть null.")
+        return value
+
+
 class UserRead(schemas.BaseUser):
-    """Схема для отображения пользователя."""
+    """
+    Схема для отображения пользователя.
+
+    Версия строки в тело ответа не попадает: маршруты отдают её в заголовке ETag.
+    """
 
     id: int
     username: str = Field(min_length=3, max_length=50)
+    version: Optional[int] = Field(default=None, exclude=True)
 
     model_config = ConfigDict(from_attributes=True)
+
+
+class TokenClaims(BaseModel):
+    """Утверждения JWT, достаточные для маршрутов без загрузки пользователя."""
+
+    id: int
+    is_active: bool
+    token_version: int = 0
+    expires_at: Optional[int] = None
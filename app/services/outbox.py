@@ -0,0 +1,198 @@
+"""
+Transactional outbox для email-уведомлений.
+
+Обработчики запросов не обращаются к брокеру Celery: они лишь добавляют
+`OutboxMessage` в текущую сессию, и сообщение фиксируется вместе с задачей
+или пользователем. Ретранслятор `OutboxRelay` пачками забирает сообщения
+из таблицы, передаёт их в Celery и удаляет.
+
+- Если коммит не удался, сообщение не будет отправлено.
+- Ретранслятор просыпается сразу после коммита с новыми сообщениями,
+  а в остальное время опрашивает таблицу раз в `OUTBOX_POLL_SECONDS`.
+- Сообщения выбираются через `FOR UPDATE SKIP LOCKED`, поэтому несколько
+  экземпляров приложения не отправят одно сообщение дважды.
+"""
+
+import asyncio
+import logging
+from typing import Awaitable, Callable, List, Optional
+
+from sqlalchemy import delete, event, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from sqlalchemy.orm import Session
+
+from app.celery_tasks.digest import digest_buffer
+from app.celery_tasks.notifications import dispatch_email_batches, notify
+from app.core.config import load_config
+from app.db.database import async_session_maker
+from app.db.models import OutboxMessage
+
+logger = logging.getLogger(__name__)
+
+OUTBOX_PENDING_KEY = "outbox_pending"
+
+
+class OutboxService:
+    """Сервис записи уведомлений в outbox."""
+
+    @staticmethod
+    def add(db: AsyncSession, to_email: str, subject: str, body: str, digest: bool = False) -> None:
+        """
+        Добавляет уведомление в текущую транзакцию без коммита.
+
+        Сообщение будет сохранено при ближайшем коммите сессии
+        вместе с остальными изменениями.
+
+        Args:
+            db (AsyncSession): Сессия БД.
+            to_email (str): Email-адрес получателя.
+            subject (str): Тема письма.
+            body (str): Текст письма.
+            digest (bool): Можно ли объединить уведомление в дайджест.
+        """
+        db.add(OutboxMessage(to_email=to_email, subject=subject, body=body, digest=digest))
+        db.info[OUTBOX_PENDING_KEY] = True
+
+
+class OutboxRelay:
+    """
+    Фоновый ретранслятор сообщений из outbox в Celery.
+
+    Атрибуты:
+        session_maker (async_sessionmaker): Фабрика сессий primary.
+        publish (Callable): Корутина, передающая пачку сообщений в Celery.
+        batch_size (int): Максимум сообщений за один проход.
+        poll_seconds (float): Интервал опроса без пробуждения.
+    """
+
+    def __init__(
+        self,
+        session_maker: async_sessionmaker,
+        publish: Callable[[List[OutboxMessage]], Awaitable[None]],
+        batch_size: int = 100,
+        poll_seconds: float = 1.0,
+    ):
+        self.session_maker = session_maker
+        self.publish = publish
+        self.batch_size = batch_size
+        self.poll_seconds = poll_seconds
+        self._wakeup: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self) -> None:
+        """Запускает цикл ретранслятора в текущем event loop."""
+        if self._task is None:
+            self._wakeup = asyncio.Event()
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Останавливает цикл ретранслятора."""
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+        self._wakeup = None
+
+    def nudge(self) -> None:
+        """Будит ретранслятор, не дожидаясь очередного опроса."""
+        if self._wakeup is not None:
+            self._wakeup.set()
+
+    async def relay_once(self) -> int:
+        """
+        Передаёт в Celery одну пачку сообщений и удаляет их из outbox.
+
+        Если публикация не удалась, транзакция откатывается и сообщения
+        остаются в таблице до следующего прохода.
+
+        Returns:
+            int: Количество переданных сообщений.
+        """
+        async with self.session_maker() as session:
+            async with session.begin():
+                result = await session.execute(
+                    select(OutboxMessage)
+                    .order_by(OutboxMessage.id)
+                    .limit(self.batch_size)
+                    .with_for_update(skip_locked=True)
+                )
+                messages = list(result.scalars().all())
+                if not messages:
+                    return 0
+                await self.publish(messages)
+                await session.execute(
+                    delete(OutboxMessage).where(OutboxMessage.id.in_([m.id for m in messages]))
+                )
+        return len(messages)
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                while await self.relay_once() == self.batch_size:
+                    pass
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.exception(f"Outbox relay failed: {e}")
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.poll_seconds)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+
+
+async def publish_to_celery(messages: List[OutboxMessage]) -> None:
+    """
+    Передаёт сообщения outbox в Celery.
+
+    Уведомления, допускающие объединение, уходят в буфер дайджестов (если он настроен),
+    остальные ставятся в очередь пачками через `send_email_batch`.
+    Id сообщения outbox служит ключом идемпотентности письма и id события
+    дайджеста, поэтому повторная передача после сбоя ретранслятора не приведёт
+    к повторному письму или повторной строке в дайджесте.
+
+    Args:
+        messages (List[OutboxMessage]): Сообщения outbox.
+    """
+    immediate = []
+    for message in messages:
+        if message.digest and digest_buffer is not None:
+            await notify(message.to_email, message.subject, message.body, event_id=f"outbox:{message.id}")
+        else:
+            immediate.append(
+                {
+                    "to_email": message.to_email,
+                    "subject": message.subject,
+                    "body": message.body,
+                    "idempotency_key": f"outbox:{message.id}",
+                }
+            )
+    if immediate:
+        await dispatch_email_batches(immediate)
+
+
+config = load_config()
+
+outbox_relay = OutboxRelay(
+    async_session_maker,
+    publish_to_celery,
+    batch_size=config.mailing.outbox_batch_size,
+    poll_seconds=config.mailing.outbox_poll_seconds,
+)
+
+
+@event.listens_for(Session, "after_commit")
+def _nudge_outbox_relay(session: Session) -> None:
+    """Будит ретранслятор после коммита сессии с новыми сообщениями outbox."""
+    if session.info.pop(OUTBOX_PENDING_KEY, False):
+        outbox_relay.nudge()
+
+
+@event.listens_for(Session, "after_rollback")
+def _forget_outbox_pending(session: Session) -> None:
+    """Сбрасывает отметку о новых сообщениях после отката."""
+    session.info.pop(OUTBOX_PENDING_KEY, None)
@@ -0,0 +1,142 @@
+"""
+Модуль pagination.
+
+Содержит вспомогательные функции для keyset-пагинации:
+кодирование и декодирование непрозрачного курсора, который клиент
+передаёт для получения следующей страницы. Для выдачи, отсортированной
+по релевантности, курсор хранит ещё и ранг последней записи, а водяной
+знак дельта-синхронизации — номер последнего изменения.
+"""
+
+import base64
+import binascii
+import json
+import logging
+from typing import Tuple
+
+from app.exceptions import InvalidCursorException
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+
+
+def encode_cursor(last_id: int) -> str:
+    """
+    Кодирует ID последней записи страницы в непрозрачный курсор.
+
+    Args:
+        last_id (int): Идентификатор последней записи на странице.
+
+    Returns:
+        str: Курсор в формате urlsafe base64.
+    """
+    return _encode({"id": last_id})
+
+
+def decode_cursor(cursor: str) -> int:
+    """
+    Декодирует курсор, полученный от клиента, обратно в ID записи.
+
+    Args:
+        cursor (str): Курсор, выданный сервером на предыдущей странице.
+
+    Returns:
+        int: Идентификатор записи, после которой начинается страница.
+
+    Raises:
+        InvalidCursorException: 400, если курсор повреждён.
+    """
+    return _decode_id(_decode(cursor))
+
+
+def encode_rank_cursor(rank: float, last_id: int) -> str:
+    """
+    Кодирует ранг и ID последней записи страницы, отсортированной по релевантности.
+
+    Args:
+        rank (float): Ранг последней записи на странице.
+        last_id (int): Идентификатор последней записи на странице.
+
+    Returns:
+        str: Курсор в формате urlsafe base64.
+    """
+    return _encode({"rank": rank, "id": last_id})
+
+
+def decode_rank_cursor(cursor: str) -> Tuple[float, int]:
+    """
+    Декодирует курсор выдачи, отсортированной по релевантности.
+
+    Args:
+        cursor (str): Курсор, выданный сервером на предыдущей странице.
+
+    Returns:
+        Tuple[float, int]: Ранг и ID записи, после которой начинается страница.
+
+    Raises:
+        InvalidCursorException: 400, если курсор повреждён.
+    """
+    payload = _decode(cursor)
+    rank = payload.get("rank")
+    if not isinstance(rank, (int, float)) or isinstance(rank, bool):
+        raise InvalidCursorException()
+    return float(rank), _decode_id(payload)
+
+
+def encode_change_cursor(change_seq: int, last_id: int) -> str:
+    """
+    Кодирует водяной знак дельта-синхронизации.
+
+    Args:
+        change_seq (int): Номер последнего отданного изменения.
+        last_id (int): ID задачи последнего отданного изменения.
+
+    Returns:
+        str: Курсор в формате urlsafe base64.
+    """
+    return _encode({"seq": change_seq, "id": last_id})
+
+
+def decode_change_cursor(cursor: str) -> Tuple[int, int]:
+    """
+    Декодирует водяной знак дельта-синхронизации.
+
+    Args:
+        cursor (str): Водяной знак, выданный сервером в предыдущем ответе.
+
+    Returns:
+        Tuple[int, int]: Номер изменения и ID задачи, после которых начинается выдача.
+
+    Raises:
+        InvalidCursorException: 400, если курсор повреждён.
+    """
+    payload = _decode(cursor)
+    change_seq = payload.get("seq")
+    if not isinstance(change_seq, int) or isinstance(change_seq, bool):
+        raise InvalidCursorException()
+    return change_seq, _decode_id(payload)
+
+
+def _encode(payload: dict) -> str:
+    data = json.dumps(payload, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(data).rstrip(b"=").decode()
+
+
+def _decode(cursor: str) -> dict:
+    padded = cursor + "=" * (-len(cursor) % 4)
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(padded))
+    except (binascii.Error, ValueError, TypeError):
+        raise InvalidCursorException()
+    if not isinstance(payload, dict):
+        raise InvalidCursorException()
+    return payload
+
+
+def _decode_id(payload: dict) -> int:
+    last_id = payload.get("id")
+    if not isinstance(last_id, int) or isinstance(last_id, bool):
+        raise InvalidCursorException()
+    return last_id
@@ -0,0 +1,49 @@
+"""
+Чтение списков без ORM-объектов.
+
+Для больших списков создание ORM-объектов, карта идентичности сессии
+и валидация Pydantic занимают больше времени, чем сам запрос. Здесь
+выбираются только колонки схемы ответа, а строки превращаются в словари,
+готовые к сериализации в JSON (`app.api.responses.FastJSONResponse`).
+"""
+
+import logging
+from typing import List, Tuple, Type
+
+from pydantic import BaseModel
+from sqlalchemy.engine import Result
+from sqlalchemy.orm import InstrumentedAttribute
+
+logger = logging.getLogger(__name__)
+
+
+def read_columns(model: type, schema: Type[BaseModel]) -> Tuple[InstrumentedAttribute, ...]:
+    """
+    Возвращает колонки модели, попадающие в тело ответа по схеме.
+
+    Порядок колонок совпадает с порядком полей схемы, поэтому JSON
+    получается таким же, как при сериализации через `response_model`.
+    Поля, исключённые из ответа (`exclude=True`), не выбираются.
+
+    Args:
+        model (type): ORM-модель.
+        schema (Type[BaseModel]): Схема ответа.
+
+    Returns:
+        Tuple[InstrumentedAttribute, ...]: Колонки для `select`.
+    """
+    return tuple(getattr(model, name) for name, field in schema.model_fields.items() if not field.exclude)
+
+
+def rows_to_dicts(result: Result) -> List[dict]:
+    """
+    Собирает словари из кортежей строк.
+
+    Args:
+        result (Result): Результат запроса с выбранными колонками.
+
+    Returns:
+        List[dict]: Строки в виде словарей с именами колонок в качестве ключей.
+    """
+    keys = list(result.keys())
+    return [dict(zip(keys, row)) for row in result]
@@ -0,0 +1,204 @@
+"""
+Поток изменений задач для push-уведомлений клиентов (SSE).
+
+- События отправляет триггер на таблице `tasks` (миграция
+  `add_task_change_notify_trigger`): `pg_notify` выполняется в той же
+  транзакции, что и запись, и доставляется только после коммита, без
+  отдельного запроса от приложения.
+- `TaskEventBroker` держит отдельное соединение asyncpg с `LISTEN` и
+  раздаёт события подписчикам своего процесса по ID владельца задач.
+  Так NOTIFY из любого экземпляра приложения доходит до всех.
+- У каждой подписки своя ограниченная очередь. Если клиент не успевает
+  читать, подписка закрывается, а клиент получает событие `overflow`
+  и должен догнать изменения через `GET /tasks/changes`.
+
+События содержат только тип и ID задач, сами задачи клиент читает обычными запросами.
+"""
+
+import asyncio
+import json
+import logging
+from collections import defaultdict
+from typing import Dict, Optional, Set
+
+import asyncpg
+from prometheus_client import Counter, Gauge
+from sqlalchemy.engine import make_url
+
+from app.core.config import load_config
+
+logger = logging.getLogger(__name__)
+
+CHANNEL = "task_changes"
+
+TASK_EVENT_SUBSCRIBERS = Gauge(
+    "task_event_subscribers", "Количество открытых подписок на изменения задач."
+)
+TASK_EVENT_OVERFLOWS = Counter(
+    "task_event_overflows_total", "Подписки, закрытые из-за переполнения буфера медленным клиентом."
+)
+
+
+class Subscription:
+    """
+    Подписка одного клиента на изменения своих задач.
+
+    Атрибуты:
+        user_id (int): Владелец задач.
+        overflowed (bool): Клиент не успевал читать, и подписка закрыта.
+    """
+
+    def __init__(self, user_id: int, buffer_size: int):
+        self.user_id = user_id
+        self.overflowed = False
+        self._queue: asyncio.Queue = asyncio.Queue(buffer_size)
+
+    def offer(self, payload: dict) -> bool:
+        """Кладёт событие в буфер; возвращает `False`, если буфер переполнен."""
+        try:
+            self._queue.put_nowait(payload)
+        except asyncio.QueueFull:
+            self.overflowed = True
+            return False
+        return True
+
+    async def get(self, timeout: float) -> Optional[dict]:
+        """Ждёт следующее событие; None, если за `timeout` секунд событий не было."""
+        try:
+            return await asyncio.wait_for(self._queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+
+class TaskEventBroker:
+    """
+    Раздаёт события об изменении задач подписчикам процесса.
+
+    Атрибуты:
+        buffer_size (int): Размер буфера событий одной подписки.
+        heartbeat_seconds (float): Как часто отправлять подписчику пустое сообщение,
+            если событий нет.
+        database_url (Optional[str]): URL PostgreSQL для `LISTEN`; без него
+            слушатель не запускается, и подписчики получают только события,
+            переданные в `publish` напрямую.
+        retry_seconds (float): Пауза перед переподключением слушателя.
+        listening (bool): Слушатель подключён и выполнил `LISTEN`.
+    """
+
+    def __init__(
+        self,
+        buffer_size: int = 100,
+        heartbeat_seconds: float = 15.0,
+        database_url: Optional[str] = None,
+        retry_seconds: float = 5.0,
+    ):
+        self.buffer_size = buffer_size
+        self.heartbeat_seconds = heartbeat_seconds
+        self.database_url = database_url
+        self.retry_seconds = retry_seconds
+        self.listening = False
+        self._subscribers: Dict[int, Set[Subscription]] = defaultdict(set)
+        self._task: Optional[asyncio.Task] = None
+
+    def subscribe(self, user_id: int) -> Subscription:
+        """Открывает подписку на изменения задач пользователя."""
+        subscription = Subscription(user_id, self.buffer_size)
+        self._subscribers[user_id].add(subscription)
+        TASK_EVENT_SUBSCRIBERS.inc()
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        """Закрывает подписку; повторный вызов ничего не делает."""
+        subscribers = self._subscribers.get(subscription.user_id)
+        if subscribers is None or subscription not in subscribers:
+            return
+        subscribers.discard(subscription)
+        if not subscribers:
+            del self._subscribers[subscription.user_id]
+        TASK_EVENT_SUBSCRIBERS.dec()
+
+    def publish(self, payload: dict) -> None:
+        """
+        Раздаёт событие подписчикам владельца задач.
+
+        Подписки с переполненным буфером закрываются.
+
+        Args:
+            payload (dict): Событие с ключами `user_id`, `type` и `ids`.
+        """
+        for subscription in list(self._subscribers.get(payload["user_id"], ())):
+            if not subscription.offer(payload):
+                TASK_EVENT_OVERFLOWS.inc()
+                logger.info(f"Closing slow task event subscription of user {subscription.user_id}")
+                self.unsubscribe(subscription)
+
+    def start(self) -> None:
+        """Запускает слушатель `LISTEN`, если события идут через PostgreSQL."""
+        if self._task is None and self._listen_url() is not None:
+            self._task = asyncio.create_task(self._listen())
+
+    async def stop(self) -> None:
+        """Останавливает слушатель."""
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    def _listen_url(self) -> Optional[str]:
+        if not self.database_url:
+            return None
+        url = make_url(self.database_url)
+        if url.get_backend_name() != "postgresql":
+            return None
+        return url.set(drivername="postgresql").render_as_string(hide_password=False)
+
+    async def _listen(self) -> None:
+        reconnect = False
+        while True:
+            connection = None
+            try:
+                connection = await asyncpg.connect(self._listen_url())
+                closed = asyncio.Event()
+                connection.add_termination_listener(lambda _: closed.set())
+                await connection.add_listener(CHANNEL, self._on_notify)
+                self.listening = True
+                if reconnect:
+                    self._resync_all()
+                reconnect = True
+                await closed.wait()
+                logger.warning("Task event listener connection closed")
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"Task event listener failed: {e}")
+            finally:
+                self.listening = False
+                if connection is not None and not connection.is_closed():
+                    await connection.close()
+            reconnect = True
+            await asyncio.sleep(self.retry_seconds)
+
+    def _on_notify(self, connection, pid: int, channel: str, payload: str) -> None:
+        try:
+            self.publish(json.loads(payload))
+        except (ValueError, KeyError, TypeError) as e:
+            logger.warning(f"Malformed task event {payload!r}: {e}")
+
+    def _resync_all(self) -> None:
+        """Сообщает подписчикам, что часть событий могла быть потеряна при переподключении."""
+        for user_id in list(self._subscribers):
+            self.publish({"user_id": user_id, "type": "resync", "ids": []})
+
+
+config = load_config()
+
+task_event_broker = TaskEventBroker(
+    buffer_size=config.events.buffer_size,
+    heartbeat_seconds=config.events.heartbeat_seconds,
+    database_url=config.db.database_url,
+    retry_seconds=config.events.listener_retry_seconds,
+)
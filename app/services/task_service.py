@@ -8,22 +8,64 @@
 """
 
 import logging
-from typing import List
+from contextlib import nullcontext
+from typing import AsyncIterator, List, Optional, Set, Type, Union
 
-from sqlalchemy import select
+from fastapi import HTTPException
+from sqlalchemy import RowMapping, Select, and_, delete, func, insert, literal, or_, select, update
+from sqlalchemy.dialects.postgresql import REGCONFIG
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.db.models import Task
+from app.cache.tasks import (
+    cache_stats,
+    get_cached_stats,
+    get_cached_task,
+    get_or_load_task,
+    invalidate_task_stats,
+    invalidate_tasks,
+)
+from app.core.config import load_config
+from app.db.database import primary_session
+from app.db.models import SEARCH_CONFIG, Task, TaskChangeHorizon, TaskTombstone, task_search_vector
 from app.exceptions import (
+    ExpiredWatermarkException,
     ForbiddenTaskDeleteException,
     ForbiddenTaskUpdateException,
+    PreconditionFailedException,
     TaskNotFoundException,
 )
-from app.schemas.task import TaskCreate, TaskRead, TaskUpdate
-from app.schemas.user import UserRead
+from app.schemas.task import (
+    TaskBulkUpdate,
+    TaskBulkUpdateResult,
+    TaskChanges,
+    TaskCreate,
+    TaskPage,
+    TaskPatch,
+    TaskRead,
+    TaskStats,
+    TaskStatsReport,
+    TaskUpdate,
+    UserTaskStats,
+)
+from app.schemas.user import TokenClaims, UserRead
+from app.services.pagination import (
+    DEFAULT_PAGE_SIZE,
+    decode_change_cursor,
+    decode_cursor,
+    decode_rank_cursor,
+    encode_change_cursor,
+    encode_cursor,
+    encode_rank_cursor,
+)
+from app.services.rows import read_columns, rows_to_dicts
 
 logger = logging.getLogger(__name__)
 
+EXPORT_BATCH_SIZE = 1000
+BULK_INSERT_BATCH_SIZE = 500
+
+config = load_config()
+
 
 class TaskService:
     """
@@ -53,17 +95,64 @@ class TaskService:
         db.add(task)
         await db.commit()
         await db.refresh(task)
+        await invalidate_task_stats(user.id)
         return task
 
     @staticmethod
-    async def get_task(task_id: int, db: AsyncSession, user: UserRead) -> TaskRead:
+    async def create_tasks(
+        tasks_data: List[TaskCreate], db: AsyncSession, user: UserRead
+    ) -> List[TaskRead]:
+        """
+        Создаёт несколько задач в одной транзакции.
+
+        Задачи вставляются пачками по BULK_INSERT_BATCH_SIZE строк:
+        один многострочный `INSERT ... RETURNING` на пачку.
+
+        Args:
+            tasks_data (List[TaskCreate]): Данные создаваемых задач.
+            db (AsyncSession): Асинхронная сессия базы данных.
+            user (UserRead): Текущий аутентифицированный пользователь.
+
+        Returns:
+            List[TaskRead]: Созданные задачи в порядке передачи.
+        """
+        rows = [
+            {
+                "title": task_data.title,
+                "description": task_data.description,
+                "completed": task_data.completed,
+                "user_id": user.id,
+            }
+            for task_data in tasks_data
+        ]
+        created = []
+        for start in range(0, len(rows), BULK_INSERT_BATCH_SIZE):
+            result = await db.execute(
+                insert(Task)
+                .values(rows[start : start + BULK_INSERT_BATCH_SIZE])
+                .returning(Task.id, Task.title, Task.description, Task.completed, Task.user_id, Task.version)
+            )
+            created.extend(TaskRead.model_validate(row) for row in result.mappings())
+        await db.commit()
+        await invalidate_task_stats(user.id)
+        return created
+
+    @staticmethod
+    async def get_task(
+        task_id: int, db: AsyncSession, user: Union[UserRead, TokenClaims]
+    ) -> TaskRead:
         """
         Получает задачу по ID, проверяя принадлежность текущему пользователю.
 
+        Задача читается через read-through кэш (`CACHE_TASK_TTL_SECONDS`),
+        владелец проверяется уже по закэшированной записи. Промах загружается
+        с primary, даже если запрос читает с реплики (см. `primary_session`).
+
         Args:
             task_id (int): Идентификатор задачи.
             db (AsyncSession): Асинхронная сессия базы данных.
-            user (UserRead): Текущий пользователь, которому должна принадлежать задача.
+            user (Union[UserRead, TokenClaims]): Текущий пользователь или утверждения
+                его токена; используется только ID.
 
         Returns:
             TaskRead: Найденная задача.
@@ -71,40 +160,423 @@ class TaskService:
         Raises:
             TaskNotFoundException: 404, если задача не найдена.
         """
+
+        async def load() -> Optional[dict]:
+            async with primary_session(db) as primary:
+                result = await primary.execute(select(Task).where(Task.id == task_id))
+                task = result.scalar_one_or_none()
+                if task is None:
+                    return None
+                return {**TaskRead.model_validate(task).model_dump(), "version": task.version}
+
+        data = await get_or_load_task(task_id, load)
+        if data is None or data["user_id"] != user.id:
+            raise TaskNotFoundException()
+        return TaskRead.model_validate(data)
+
+    @staticmethod
+    async def get_task_version(
+        task_id: int, db: AsyncSession, user: Union[UserRead, TokenClaims]
+    ) -> int:
+        """
+        Возвращает только версию задачи для проверки `If-None-Match`.
+
+        Версия берётся из кэша задач, если задача там есть, поэтому
+        повторная проверка не обращается к БД; при промахе выбирается
+        одна колонка.
+
+        Args:
+            task_id (int): Идентификатор задачи.
+            db (AsyncSession): Асинхронная сессия базы данных.
+            user (Union[UserRead, TokenClaims]): Текущий пользователь или утверждения его токена.
+
+        Returns:
+            int: Текущая версия задачи.
+
+        Raises:
+            TaskNotFoundException: 404, если задача не найдена.
+        """
+        cached = await get_cached_task(task_id)
+        if cached is not None:
+            if cached["user_id"] != user.id:
+                raise TaskNotFoundException()
+            return cached["version"]
+
         result = await db.execute(
-            select(Task).where(Task.id == task_id, Task.user_id == user.id)
+            select(Task.version).where(Task.id == task_id, Task.user_id == user.id)
         )
-        task = result.scalar_one_or_none()
-        if task is None:
+        version = result.scalar_one_or_none()
+        if version is None:
             raise TaskNotFoundException()
-        return task
+        return version
+
+    @staticmethod
+    async def get_all_tasks(
+        db: AsyncSession,
+        limit: int,
+        after: Optional[str] = None,
+        completed: Optional[bool] = None,
+        user_id: Optional[int] = None,
+    ) -> dict:
+        """
+        Получает страницу задач с keyset-пагинацией по ID.
+
+        Вместо OFFSET используется условие `id > последний ID`, поэтому время
+        запроса не зависит от номера страницы и размера таблицы.
+        Выбираются только колонки `TaskRead`, задачи возвращаются словарями
+        без создания ORM-объектов и валидации.
+
+        Args:
+            db (AsyncSession): Асинхронная сессия базы данных.
+            limit (int): Максимальное количество задач на странице.
+            after (Optional[str]): Курсор предыдущей страницы.
+            completed (Optional[bool]): Фильтр по статусу завершённости.
+            user_id (Optional[int]): Фильтр по владельцу задачи.
+
+        Returns:
+            dict: Страница в формате `TaskPage`: задачи и курсор следующей страницы.
+
+        Raises:
+            InvalidCursorException: 400, если курсор повреждён.
+        """
+        query = select(*read_columns(Task, TaskRead)).order_by(Task.id).limit(limit + 1)
+        if after is not None:
+            query = query.where(Task.id > decode_cursor(after))
+        query = TaskService._apply_filters(query, completed, user_id)
+
+        tasks = rows_to_dicts(await db.execute(query))
+
+        next_cursor = None
+        if len(tasks) > limit:
+            tasks = tasks[:limit]
+            next_cursor = encode_cursor(tasks[-1]["id"])
+        return {"items": tasks, "next_cursor": next_cursor}
+
+    @staticmethod
+    async def search_tasks(
+        db: AsyncSession,
+        user_id: int,
+        q: str,
+        limit: int,
+        after: Optional[str] = None,
+    ) -> TaskPage:
+        """
+        Ищет задачи пользователя по названию и описанию.
+
+        Полнотекстовый поиск по GIN-индексу `ix_tasks_search` с сортировкой
+        по `ts_rank`. Пагинация keyset по паре (ранг, ID).
+
+        Args:
+            db (AsyncSession): Асинхронная сессия базы данных.
+            user_id (int): Владелец задач.
+            q (str): Поисковый запрос.
+            limit (int): Максимальное количество задач на странице.
+            after (Optional[str]): Курсор предыдущей страницы.
+
+        Returns:
+            TaskPage: Найденные задачи и курсор следующей страницы.
+
+        Raises:
+            InvalidCursorException: 400, если курсор повреждён.
+        """
+        vector = task_search_vector()
+        ts_query = func.websearch_to_tsquery(literal(SEARCH_CONFIG, type_=REGCONFIG), q)
+        match = vector.op("@@")(ts_query)
+        rank = func.ts_rank(vector, ts_query)
+
+        query = (
+            select(Task, rank.label("rank"))
+            .where(Task.user_id == user_id, match)
+            .order_by(rank.desc(), Task.id)
+            .limit(limit + 1)
+        )
+        if after is not None:
+            last_rank, last_id = decode_rank_cursor(after)
+            query = query.where(or_(rank < last_rank, and_(rank == last_rank, Task.id > last_id)))
+
+        result = await db.execute(query)
+        rows = result.all()
+
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = encode_rank_cursor(rows[-1].rank, rows[-1].Task.id)
+        return TaskPage(items=[row.Task for row in rows], next_cursor=next_cursor)
+
+    @staticmethod
+    async def get_changes(
+        db: AsyncSession,
+        user_id: int,
+        limit: int,
+        since: Optional[str] = None,
+    ) -> TaskChanges:
+        """
+        Возвращает изменения и удаления задач пользователя после водяного знака.
+
+        Задачи и надгробия выбираются по индексам `(user_id, change_seq, ...)`
+        с keyset-условием по паре (номер изменения, ID задачи) и сливаются
+        в одну выдачу, поэтому объём ответа зависит от числа изменений,
+        а не от числа задач.
+
+        Номера изменений выдаются последовательностью и могут фиксироваться
+        не по порядку. Поэтому выдача обрывается на первом изменении моложе
+        `DB_CHANGE_SETTLE_SECONDS`: водяной знак не уходит дальше изменения,
+        перед которым ещё может зафиксироваться другое. Срок отсчитывается
+        от `now()` сессии, поэтому читать нужно с primary: на отстающей
+        реплике уже видимое изменение может обогнать ещё не доехавшее.
+        Пока изменения придержаны, `has_more` остаётся `True`, и клиент
+        повторяет запрос с тем же водяным знаком.
+
+        Надгробия хранятся `DB_TOMBSTONE_RETENTION_DAYS` дней. Водяной знак
+        старше удалённых надгробий отклоняется: он мог пропустить удаление.
+        Граница проверяется после выборки, поэтому очистка, завершившаяся
+        между запросами, тоже будет замечена.
+
+        Args:
+            db (AsyncSession): Асинхронная сессия базы данных.
+            user_id (int): Владелец задач.
+            limit (int): Максимальное количество изменений в ответе.
+            since (Optional[str]): Водяной знак предыдущего ответа;
+                без него выдаются все задачи пользователя.
+
+        Returns:
+            TaskChanges: Изменённые задачи, ID удалённых и новый водяной знак.
+
+        Raises:
+            InvalidCursorException: 400, если водяной знак повреждён.
+            ExpiredWatermarkException: 410, если водяной знак старше хранимых надгробий.
+        """
+        cutoff = func.now() - func.make_interval(0, 0, 0, 0, 0, 0, config.db.change_settle_seconds)
+        task_settled = Task.updated_at <= cutoff
+        tombstone_settled = TaskTombstone.deleted_at <= cutoff
+
+        tasks_query = (
+            select(Task, task_settled.label("settled"))
+            .where(Task.user_id == user_id)
+            .order_by(Task.change_seq, Task.id)
+            .limit(limit + 1)
+        )
+        tombstones_query = (
+            select(TaskTombstone.change_seq, TaskTombstone.task_id, tombstone_settled.label("settled"))
+            .where(TaskTombstone.user_id == user_id)
+            .order_by(TaskTombstone.change_seq, TaskTombstone.task_id)
+            .limit(limit + 1)
+        )
+        if since is not None:
+            last_seq, last_id = decode_change_cursor(since)
+            tasks_query = tasks_query.where(
+                or_(Task.change_seq > last_seq, and_(Task.change_seq == last_seq, Task.id > last_id))
+            )
+            tombstones_query = tombstones_query.where(
+                or_(
+                    TaskTombstone.change_seq > last_seq,
+                    and_(TaskTombstone.change_seq == last_seq, TaskTombstone.task_id > last_id),
+                )
+            )
+
+        entries = [(row.Task.change_seq, row.Task.id, row.settled, row.Task) for row in await db.execute(tasks_query)]
+        entries.extend((row.change_seq, row.task_id, row.settled, None) for row in await db.execute(tombstones_query))
+        entries.sort(key=lambda entry: entry[:2])
+
+        if since is not None:
+            horizon = await db.scalar(select(TaskChangeHorizon.change_seq))
+            if horizon is not None and last_seq < horizon:
+                raise ExpiredWatermarkException()
+
+        changes = TaskChanges(changed=[], deleted=[], watermark=since)
+        for change_seq, task_id, settled, task in entries[:limit]:
+            if not settled:
+                changes.has_more = True
+                return changes
+            if task is None:
+                changes.deleted.append(task_id)
+            else:
+                changes.changed.append(task)
+            changes.watermark = encode_change_cursor(change_seq, task_id)
+        changes.has_more = len(entries) > limit
+        return changes
+
+    @staticmethod
+    async def prune_tombstones(db: AsyncSession, retention_days: int) -> int:
+        """
+        Удаляет надгробия старше срока хранения и сдвигает границу водяных знаков.
+
+        Удаление и сдвиг `TaskChangeHorizon` выполняются одним запросом,
+        поэтому клиент не увидит пропавшие надгробия без новой границы.
+
+        Args:
+            db (AsyncSession): Асинхронная сессия базы данных (primary).
+            retention_days (int): Сколько дней хранить надгробия.
+
+        Returns:
+            int: Количество удалённых надгробий.
+        """
+        pruned = (
+            delete(TaskTombstone)
+            .where(TaskTombstone.deleted_at < func.now() - func.make_interval(0, 0, 0, retention_days))
+            .returning(TaskTombstone.change_seq)
+            .cte("pruned")
+        )
+        result = await db.execute(
+            update(TaskChangeHorizon)
+            .where(select(pruned).exists())
+            .values(
+                change_seq=func.greatest(
+                    TaskChangeHorizon.change_seq, select(func.max(pruned.c.change_seq)).scalar_subquery()
+                )
+            )
+            .returning(select(func.count()).select_from(pruned).scalar_subquery())
+            .add_cte(pruned)
+            .execution_options(synchronize_session=False)
+        )
+        count = result.scalar() or 0
+        await db.commit()
+        if count:
+            logger.info(f"Pruned {count} task tombstones older than {retention_days} days")
+        return count
+
+    @staticmethod
+    async def stream_tasks(
+        db: AsyncSession,
+        completed: Optional[bool] = None,
+        user_id: Optional[int] = None,
+    ) -> AsyncIterator[List[RowMapping]]:
+        """
+        Потоково читает задачи пачками через серверный курсор.
+
+        Выбираются только колонки `TaskRead`, без создания ORM-объектов,
+        поэтому потребление памяти ограничено размером одной пачки.
+
+        Args:
+            db (AsyncSession): Асинхронная сессия базы данных.
+            completed (Optional[bool]): Фильтр по статусу завершённости.
+            user_id (Optional[int]): Фильтр по владельцу задачи.
+
+        Yields:
+            List[RowMapping]: Очередная пачка строк размером до EXPORT_BATCH_SIZE.
+        """
+        query = (
+            select(Task.id, Task.title, Task.description, Task.completed, Task.user_id)
+            .order_by(Task.id)
+            .execution_options(yield_per=EXPORT_BATCH_SIZE)
+        )
+        query = TaskService._apply_filters(query, completed, user_id)
+
+        result = await db.stream(query)
+        async for partition in result.mappings().partitions():
+            yield partition
+
+    @staticmethod
+    async def get_stats(
+        db: AsyncSession, limit: int = DEFAULT_PAGE_SIZE, after: Optional[str] = None
+    ) -> TaskStatsReport:
+        """
+        Возвращает общую статистику задач и страницу разбивки по пользователям.
+
+        Разбивка считается запросом `GROUP BY user_id` с keyset-пагинацией
+        по ID пользователя, общие числа — отдельным агрегатом. Первая страница
+        размера по умолчанию кэшируется на `CACHE_STATS_TTL_SECONDS`
+        и сбрасывается при изменении задач. Её промах считается на primary
+        (см. `primary_session`): отстающая реплика сразу после сброса положила бы
+        в кэш устаревшие числа.
+
+        Args:
+            db (AsyncSession): Асинхронная сессия базы данных.
+            limit (int): Максимальное количество пользователей на странице.
+            after (Optional[str]): Курсор предыдущей страницы.
+
+        Returns:
+            TaskStatsReport: Общая статистика, страница статистики по пользователям
+                и курсор следующей страницы.
+
+        Raises:
+            InvalidCursorException: 400, если курсор повреждён.
+        """
+        cacheable = after is None and limit == DEFAULT_PAGE_SIZE
+        if cacheable:
+            cached = await get_cached_stats()
+            if cached is not None:
+                return TaskStatsReport.model_validate(cached)
+
+        completed_count = func.count().filter(Task.completed)
+        query = select(Task.user_id, func.count(), completed_count).group_by(Task.user_id)
+        if after is not None:
+            query = query.where(Task.user_id > decode_cursor(after))
+        query = query.order_by(Task.user_id).limit(limit + 1)
+
+        async with primary_session(db) if cacheable else nullcontext(db) as session:
+            rows = (await session.execute(query)).all()
+            total, done = (await session.execute(select(func.count(), completed_count))).one()
+
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = encode_cursor(rows[-1][0])
+        report = TaskStatsReport(
+            overall=TaskService._build_stats(total, done),
+            users=[
+                UserTaskStats(user_id=user_id, **TaskService._build_stats(user_total, user_done).model_dump())
+                for user_id, user_total, user_done in rows
+            ],
+            next_cursor=next_cursor,
+        )
+        if cacheable:
+            await cache_stats(report.model_dump())
+        return report
 
     @staticmethod
-    async def get_all_tasks(db: AsyncSession) -> List[TaskRead]:
+    async def get_user_stats(user_id: int, db: AsyncSession) -> UserTaskStats:
         """
-        Получает список всех задач в базе данных.
+        Возвращает статистику задач одного пользователя.
+
+        Результат кэшируется, поэтому промах считается на primary (см. `get_stats`).
 
         Args:
+            user_id (int): Идентификатор пользователя.
             db (AsyncSession): Асинхронная сессия базы данных.
 
         Returns:
-            List[TaskRead]: Список всех задач.
+            UserTaskStats: Статистика пользователя; нули, если задач нет.
         """
-        result = await db.execute(select(Task))
-        return result.scalars().all()
+        cached = await get_cached_stats(user_id)
+        if cached is not None:
+            return UserTaskStats.model_validate(cached)
+
+        async with primary_session(db) as primary:
+            result = await primary.execute(
+                select(Task.completed, func.count())
+                .where(Task.user_id == user_id)
+                .group_by(Task.completed)
+            )
+            counts = dict(result.all())
+        stats = UserTaskStats(
+            user_id=user_id,
+            **TaskService._build_stats(sum(counts.values()), counts.get(True, 0)).model_dump(),
+        )
+        await cache_stats(stats.model_dump(), user_id)
+        return stats
 
     @staticmethod
     async def update_task(
-        task_id: int, task_data: TaskUpdate, db: AsyncSession, user: UserRead
+        task_id: int,
+        task_data: TaskUpdate,
+        db: AsyncSession,
+        user: UserRead,
+        expected_versions: Optional[Set[int]] = None,
     ) -> TaskRead:
         """
         Обновляет задачу, если она существует и принадлежит текущему пользователю.
 
+        Проверки владельца и версии встроены в `UPDATE ... RETURNING`, поэтому
+        успешное обновление выполняется за один запрос.
+
         Args:
             task_id (int): Идентификатор обновляемой задачи.
             task_data (TaskUpdate): Новые данные задачи.
             db (AsyncSession): Асинхронная сессия базы данных.
             user (UserRead): Текущий пользователь.
+            expected_versions (Optional[Set[int]]): Версии из `If-Match`;
+                None — обновлять без проверки версии.
 
         Returns:
             TaskRead: Обновлённая задача.
@@ -112,25 +584,136 @@ class TaskService:
         Raises:
             TaskNotFoundException: 404, если задача не найдена.
             ForbiddenTaskUpdateException: 403, если нет прав на изменение.
+            PreconditionFailedException: 412, если версия задачи не совпала.
         """
+        query = update(Task).where(Task.id == task_id, Task.user_id == user.id)
+        if expected_versions is not None:
+            query = query.where(Task.version.in_(expected_versions))
+        result = await db.execute(
+            query.values(
+                title=task_data.title,
+                description=task_data.description,
+                completed=task_data.completed,
+                version=Task.version + 1,
+            )
+            .returning(Task)
+            .execution_options(populate_existing=True)
+        )
+        task = result.scalar_one_or_none()
+        if task is None:
+            await TaskService._raise_for_missing(task_id, db, user, ForbiddenTaskUpdateException)
+        await db.commit()
+        await invalidate_tasks(task_id)
+        await invalidate_task_stats(user.id)
+        return task
+
+    @staticmethod
+    async def patch_task(
+        task_id: int, task_data: TaskPatch, db: AsyncSession, user: UserRead
+    ) -> TaskRead:
+        """
+        Частично обновляет задачу, записывая только изменённые поля.
+
+        В `SET` попадают только поля, переданные клиентом, а условие
+        `IS DISTINCT FROM` отсекает запись, если значения не изменились,
+        поэтому пустой или повторный PATCH не трогает строку и индексы.
+
+        Args:
+            task_id (int): Идентификатор обновляемой задачи.
+            task_data (TaskPatch): Изменяемые поля задачи.
+            db (AsyncSession): Асинхронная сессия базы данных.
+            user (UserRead): Текущий пользователь.
+
+        Returns:
+            TaskRead: Актуальное состояние задачи.
+
+        Raises:
+            TaskNotFoundException: 404, если задача не найдена.
+            ForbiddenTaskUpdateException: 403, если нет прав на изменение.
+        """
+        values = task_data.model_dump(exclude_unset=True)
+        if values:
+            changed = or_(
+                *(getattr(Task, field).is_distinct_from(value) for field, value in values.items())
+            )
+            result = await db.execute(
+                update(Task)
+                .where(Task.id == task_id, Task.user_id == user.id, changed)
+                .values(**values, version=Task.version + 1)
+                .returning(Task)
+                .execution_options(populate_existing=True)
+            )
+            task = result.scalar_one_or_none()
+            if task is not None:
+                await db.commit()
+                await invalidate_tasks(task_id)
+                if "completed" in values:
+                    await invalidate_task_stats(user.id)
+                return task
+
         result = await db.execute(select(Task).where(Task.id == task_id))
         task = result.scalar_one_or_none()
         if task is None:
-            TaskNotFoundException()
+            raise TaskNotFoundException()
         if task.user_id != user.id:
             raise ForbiddenTaskUpdateException()
-        task.title = task_data.title
-        task.description = task_data.description
-        task.completed = task_data.completed
-        await db.commit()
-        await db.refresh(task)
         return task
 
+    @staticmethod
+    async def update_tasks(
+        task_data: TaskBulkUpdate, db: AsyncSession, user: UserRead
+    ) -> TaskBulkUpdateResult:
+        """
+        Пакетно обновляет задачи текущего пользователя одним UPDATE.
+
+        Проверка владельца встроена в условие запроса, объекты в сессию не загружаются.
+        Для ID, которые не удалось обновить, выполняется один дополнительный
+        SELECT, чтобы отличить отсутствующие задачи от чужих.
+
+        Args:
+            task_data (TaskBulkUpdate): Список ID и изменяемые поля.
+            db (AsyncSession): Асинхронная сессия базы данных.
+            user (UserRead): Текущий пользователь.
+
+        Returns:
+            TaskBulkUpdateResult: Обновлённые, ненайденные и чужие ID.
+        """
+        ids = list(dict.fromkeys(task_data.ids))
+        values = task_data.model_dump(exclude_unset=True, exclude={"ids"})
+        result = await db.execute(
+            update(Task)
+            .where(Task.id.in_(ids), Task.user_id == user.id)
+            .values(**values, version=Task.version + 1)
+            .returning(Task.id)
+            .execution_options(synchronize_session=False)
+        )
+        updated = set(result.scalars().all())
+        await db.commit()
+        if updated:
+            await invalidate_tasks(*updated)
+        if updated and "completed" in values:
+            await invalidate_task_stats(user.id)
+
+        missing = [task_id for task_id in ids if task_id not in updated]
+        existing = set()
+        if missing:
+            result = await db.execute(select(Task.id).where(Task.id.in_(missing)))
+            existing = set(result.scalars().all())
+        return TaskBulkUpdateResult(
+            updated=[task_id for task_id in ids if task_id in updated],
+            not_found=[task_id for task_id in missing if task_id not in existing],
+            forbidden=[task_id for task_id in missing if task_id in existing],
+        )
+
     @staticmethod
     async def delete_task(task_id: int, db: AsyncSession, user: UserRead) -> None:
         """
         Удаляет задачу по ID, если она принадлежит текущему пользователю.
 
+        Проверка владельца встроена в `DELETE ... RETURNING`, поэтому успешное
+        удаление не требует предварительного SELECT. В той же транзакции
+        записывается надгробие задачи для дельта-синхронизации.
+
         Args:
             task_id (int): Идентификатор задачи.
             db (AsyncSession): Асинхронная сессия базы данных.
@@ -140,11 +723,58 @@ class TaskService:
             TaskNotFoundException: 404, если задача не найдена.
             ForbiddenTaskDeleteException: 403, если нет прав на удаление.
         """
-        result = await db.execute(select(Task).where(Task.id == task_id))
-        task = result.scalar_one_or_none()
-        if task is None:
-            raise TaskNotFoundException()
-        if task.user_id != user.id:
-            raise ForbiddenTaskDeleteException()
-        await db.delete(task)
+        result = await db.execute(
+            delete(Task)
+            .where(Task.id == task_id, Task.user_id == user.id)
+            .returning(Task.id)
+        )
+        if result.scalar_one_or_none() is None:
+            await TaskService._raise_for_missing(task_id, db, user, ForbiddenTaskDeleteException)
+        db.add(TaskTombstone(task_id=task_id, user_id=user.id))
         await db.commit()
+        await invalidate_tasks(task_id)
+        await invalidate_task_stats(user.id)
+
+    @staticmethod
+    async def _raise_for_missing(
+        task_id: int, db: AsyncSession, user: UserRead, forbidden_exception: Type[HTTPException]
+    ) -> None:
+        """
+        Выясняет, почему запись с проверкой владельца не затронула задачу.
+
+        Вызывается только при неудаче, поэтому успешные запросы не платят
+        за дополнительный SELECT.
+
+        Raises:
+            TaskNotFoundException: 404, если задачи не существует.
+            HTTPException: `forbidden_exception`, если задача принадлежит другому пользователю.
+            PreconditionFailedException: 412, если задача принадлежит пользователю,
+                но не прошла проверку версии.
+        """
+        result = await db.execute(select(Task.user_id).where(Task.id == task_id))
+        owner_id = result.scalar_one_or_none()
+        if owner_id is None:
+            raise TaskNotFoundException()
+        if owner_id == user.id:
+            raise PreconditionFailedException()
+        raise forbidden_exception()
+
+    @staticmethod
+    def _build_stats(total: int, completed: int) -> TaskStats:
+        """Считает долю завершённых задач."""
+        return TaskStats(
+            total=total,
+            completed=completed,
+            completion_rate=round(completed / total, 4) if total else 0.0,
+        )
+
+    @staticmethod
+    def _apply_filters(
+        query: Select, completed: Optional[bool], user_id: Optional[int]
+    ) -> Select:
+        """Добавляет к запросу необязательные фильтры списка задач."""
+        if completed is not None:
+            query = query.where(Task.completed == completed)
+        if user_id is not None:
+            query = query.where(Task.user_id == user_id)
+        return query
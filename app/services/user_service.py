@@ -8,18 +8,24 @@
 """
 
 import logging
-from typing import List
+from typing import List, Optional, Set
 
-from sqlalchemy import select
+from sqlalchemy import or_, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm.exc import StaleDataError
 
+from app.cache.tasks import invalidate_task_stats
+from app.cache.users import get_cached_user_data, get_or_load_user, invalidate_user, revoke_tokens, user_cache_data
+from app.db.database import primary_session
 from app.db.models import User
 from app.exceptions import (
     ForbiddenUserDeleteException,
     ForbiddenUserUpdateException,
+    PreconditionFailedException,
     UserNotFoundException,
 )
-from app.schemas.user import UserRead, UserUpdate
+from app.schemas.user import UserPatch, UserRead, UserUpdate
+from app.services.rows import read_columns, rows_to_dicts
 
 logger = logging.getLogger(__name__)
 
@@ -37,6 +43,10 @@ class UserService:
         """
         Получить пользователя по его ID.
 
+        Пользователь читается через read-through кэш (`CACHE_USER_TTL_SECONDS`),
+        общий с кэшем аутентификации. Промах загружается с primary, даже если
+        запрос читает с реплики (см. `primary_session`).
+
         Args:
             user_id (int): Идентификатор пользователя.
             db (AsyncSession): Асинхронная сессия базы данных.
@@ -47,38 +57,82 @@ class UserService:
         Raises:
             UserNotFoundException: 404, если пользователь не найден.
         """
-        result = await db.execute(select(User).where(User.id == user_id))
-        user = result.scalar_one_or_none()
-        if not user:
+
+        async def load() -> Optional[dict]:
+            async with primary_session(db) as primary:
+                result = await primary.execute(select(User).where(User.id == user_id))
+                user = result.scalar_one_or_none()
+                return None if user is None else user_cache_data(user)
+
+        data = await get_or_load_user(user_id, load)
+        if data is None:
             raise UserNotFoundException()
-        return user
+        return UserRead.model_validate(data)
+
+    @staticmethod
+    async def get_user_version(user_id: int, db: AsyncSession) -> int:
+        """
+        Возвращает только версию пользователя для проверки `If-None-Match`.
+
+        Версия берётся из кэша пользователей, если запись там есть;
+        при промахе выбирается одна колонка.
+
+        Args:
+            user_id (int): Идентификатор пользователя.
+            db (AsyncSession): Асинхронная сессия базы данных.
+
+        Returns:
+            int: Текущая версия пользователя.
+
+        Raises:
+            UserNotFoundException: 404, если пользователь не найден.
+        """
+        cached = await get_cached_user_data(user_id)
+        if cached is not None:
+            return cached["version"]
+
+        result = await db.execute(select(User.version).where(User.id == user_id))
+        version = result.scalar_one_or_none()
+        if version is None:
+            raise UserNotFoundException()
+        return version
 
     @staticmethod
-    async def get_all_users(db: AsyncSession) -> List[UserRead]:
+    async def get_all_users(db: AsyncSession) -> List[dict]:
         """
         Получить всех пользователей из базы данных.
 
+        Выбираются только колонки `UserRead`, без создания ORM-объектов.
+
         Args:
             db (AsyncSession): Асинхронная сессия базы данных.
 
         Returns:
-            List[UserRead]: Список всех пользователей.
+            List[dict]: Пользователи в формате `UserRead`.
         """
-        result = await db.execute(select(User))
-        return result.scalars().all()
+        return rows_to_dicts(await db.execute(select(*read_columns(User, UserRead))))
 
     @staticmethod
     async def update_user(
-        user_id: int, update_data: UserUpdate, db: AsyncSession, current_user: UserRead
+        user_id: int,
+        update_data: UserUpdate,
+        db: AsyncSession,
+        current_user: UserRead,
+        expected_versions: Optional[Set[int]] = None,
     ) -> UserRead:
         """
         Обновить данные пользователя, если текущий пользователь — владелец.
 
+        ORM записывает изменение с условием `version = <прочитанная версия>`,
+        поэтому параллельное изменение между чтением и записью тоже даёт 412.
+
         Args:
             user_id (int): Идентификатор пользователя, которого нужно обновить.
             update_data (UserUpdate): Новые данные пользователя.
             db (AsyncSession): Асинхронная сессия базы данных.
             current_user (UserRead): Пользователь, выполняющий операцию.
+            expected_versions (Optional[Set[int]]): Версии из `If-Match`;
+                None — обновлять без проверки версии.
 
         Returns:
             UserRead: Обновлённый пользователь.
@@ -86,6 +140,7 @@ class UserService:
         Raises:
             ForbiddenUserUpdateException: 403, если попытка обновить чужого пользователя.
             UserNotFoundException: 404, если пользователь не найден.
+            PreconditionFailedException: 412, если версия пользователя не совпала.
         """
         if current_user.id != user_id:
             raise ForbiddenUserUpdateException()
@@ -93,12 +148,64 @@ class UserService:
         user = result.scalar_one_or_none()
         if not user:
             raise UserNotFoundException()
+        if expected_versions is not None and user.version not in expected_versions:
+            raise PreconditionFailedException()
         user.email = update_data.email
         user.username = update_data.username
-        await db.commit()
+        try:
+            await db.commit()
+        except StaleDataError:
+            await db.rollback()
+            raise PreconditionFailedException()
         await db.refresh(user)
+        await invalidate_user(user_id)
         return user
 
+    @staticmethod
+    async def patch_user(
+        user_id: int, patch_data: UserPatch, db: AsyncSession, current_user: UserRead
+    ) -> UserRead:
+        """
+        Частично обновить пользователя, записывая только изменённые поля.
+
+        В `SET` попадают только поля, переданные клиентом, а условие
+        `IS DISTINCT FROM` отсекает запись, если значения не изменились.
+
+        Args:
+            user_id (int): Идентификатор пользователя, которого нужно обновить.
+            patch_data (UserPatch): Изменяемые поля пользователя.
+            db (AsyncSession): Асинхронная сессия базы данных.
+            current_user (UserRead): Пользователь, выполняющий операцию.
+
+        Returns:
+            UserRead: Актуальное состояние пользователя.
+
+        Raises:
+            ForbiddenUserUpdateException: 403, если попытка обновить чужого пользователя.
+            UserNotFoundException: 404, если пользователь не найден.
+        """
+        if current_user.id != user_id:
+            raise ForbiddenUserUpdateException()
+        values = patch_data.model_dump(exclude_unset=True)
+        if values:
+            changed = or_(
+                *(getattr(User, field).is_distinct_from(value) for field, value in values.items())
+            )
+            result = await db.execute(
+                update(User)
+                .where(User.id == user_id, changed)
+                .values(**values, version=User.version + 1)
+                .returning(User)
+                .execution_options(populate_existing=True)
+            )
+            user = result.scalar_one_or_none()
+            if user is not None:
+                await db.commit()
+                await invalidate_user(user_id)
+                return user
+
+        return await UserService.get_user_by_id(user_id, db)
+
     @staticmethod
     async def delete_user(
         user_id: int, db: AsyncSession, current_user: UserRead
@@ -123,3 +230,5 @@ class UserService:
             raise UserNotFoundException()
         await db.delete(user)
         await db.commit()
+        await revoke_tokens(user_id, user.token_version + 1)
+        await invalidate_task_stats(user_id)
@@ -0,0 +1,113 @@
+"""
+Бенчмарк сериализации списка задач (`GET /tasks`).
+
+Заполняет SQLite в памяти задачами одного пользователя и измеряет время
+подготовки тела ответа со страницей задач для двух путей:
+
+- `orm + response_model` — прежнее поведение: `select(Task)` с созданием
+  ORM-объектов, валидация `TaskPage` и сериализация FastAPI
+  (`serialize_response`), затем `JSONResponse`;
+- `rows + FastJSONResponse` — выбор только колонок `TaskRead`, словари
+  из кортежей строк и `FastJSONResponse` без валидации.
+
+Второй путь соответствует `FAST_LIST_RESPONSES=True`. Каждая итерация открывает
+новую сессию, как отдельный запрос. Если установлен `orjson`
+(`poetry install --extras fast-json`), второй путь сериализует им, иначе —
+стандартным `json`. `aiosqlite` входит в группу зависимостей dev.
+`change_seq` и `updated_at` задаются явно: их значения по умолчанию
+компилируются только для PostgreSQL.
+
+Запуск:
+    poetry run python -m benchmarks.json_serialization --tasks 20000 --page 500 --repeat 50
+"""
+
+import argparse
+import asyncio
+import logging
+import time
+from datetime import datetime, timezone
+from typing import Awaitable, Callable
+
+from fastapi.responses import JSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_model_field
+from sqlalchemy import insert, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.pool import StaticPool
+
+from app.api import responses
+from app.api.responses import FastJSONResponse
+from app.db.models import Base, Task, User
+from app.schemas.task import TaskPage, TaskRead
+from app.services.rows import read_columns, rows_to_dicts
+
+logger = logging.getLogger(__name__)
+
+PAGE_FIELD = create_model_field(name="Response_get_all_tasks", type_=TaskPage, mode="serialization")
+
+
+async def run_scenario(name: str, repeat: int, render: Callable[[], Awaitable[bytes]]) -> float:
+    """Вызывает `render` `repeat` раз, печатает и возвращает среднее время одного ответа."""
+    body = await render()
+    start = time.perf_counter()
+    for _ in range(repeat):
+        await render()
+    per_request = (time.perf_counter() - start) / repeat
+    print(f"{name:<28} {per_request * 1000:>8.2f} ms/response  ({len(body)} bytes)")
+    return per_request
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--tasks", type=int, default=20000)
+    parser.add_argument("--page", type=int, default=500)
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+
+    engine = create_async_engine("sqlite+aiosqlite://", poolclass=StaticPool)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+        await conn.execute(
+            insert(User),
+            {"email": "bench@example.com", "hashed_password": "-", "username": "bench"},
+        )
+        now = datetime.now(timezone.utc)
+        await conn.execute(
+            insert(Task),
+            [
+                {
+                    "title": f"task {number}",
+                    "description": f"description {number}",
+                    "user_id": 1,
+                    "change_seq": number + 1,
+                    "updated_at": now,
+                }
+                for number in range(args.tasks)
+            ],
+        )
+    session_maker = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+
+    async def render_orm() -> bytes:
+        async with session_maker() as db:
+            result = await db.execute(select(Task).order_by(Task.id).limit(args.page))
+            page = {"items": result.scalars().all(), "next_cursor": None}
+            content = await serialize_response(field=PAGE_FIELD, response_content=page)
+            return JSONResponse(content).body
+
+    async def render_rows() -> bytes:
+        async with session_maker() as db:
+            result = await db.execute(select(*read_columns(Task, TaskRead)).order_by(Task.id).limit(args.page))
+            page = {"items": rows_to_dicts(result), "next_cursor": None}
+            return FastJSONResponse(page).body
+
+    encoder = "stdlib json" if responses.orjson is None else "orjson"
+    print(f"{args.tasks} tasks, page of {args.page}, {args.repeat} responses per path, encoder: {encoder}")
+    baseline = await run_scenario("orm + response_model", args.repeat, render_orm)
+    fast = await run_scenario("rows + FastJSONResponse", args.repeat, render_rows)
+    print(f"speedup: {baseline / fast:.1f}x")
+
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
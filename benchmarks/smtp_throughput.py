@@ -0,0 +1,119 @@
+"""
+Бенчмарк пропускной способности отправки писем.
+
+Поднимает локальный SMTP-приёмник (без TLS и авторизации) с искусственной
+задержкой ответа на каждое письмо, имитирующей сетевой RTT до реального
+сервера, и измеряет писем в секунду для трёх режимов:
+
+- `solo, connection per email` — прежнее поведение `send_email`
+  с `--pool=solo`: новое соединение на каждое письмо;
+- `solo, pooled` — одно соединение из `SMTPConnectionPool`;
+- `threads=N, pooled` — пул потоков воркера, у каждого своя SMTP-сессия.
+
+Запуск:
+    poetry run python -m benchmarks.smtp_throughput --emails 500 --threads 16 --latency-ms 20
+"""
+
+import argparse
+import logging
+import smtplib
+import socketserver
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from email.mime.text import MIMEText
+from typing import Callable
+
+from app.celery_tasks.smtp import SMTPConnectionPool
+
+logger = logging.getLogger(__name__)
+
+SENDER = "bench@example.com"
+
+
+class SMTPSinkHandler(socketserver.StreamRequestHandler):
+    """Минимальный SMTP-сервер: принимает и отбрасывает письма."""
+
+    latency = 0.0
+
+    def handle(self):
+        self._reply("220 sink ready")
+        while True:
+            line = self.rfile.readline()
+            if not line:
+                return
+            command = line.decode("ascii", "replace").strip().upper()
+            if command.startswith(("EHLO", "HELO")):
+                self._reply("250 sink")
+            elif command == "DATA":
+                self._reply("354 end with <CRLF>.<CRLF>")
+                while self.rfile.readline() not in (b".\r\n", b""):
+                    pass
+                time.sleep(self.latency)
+                self._reply("250 queued")
+            elif command == "QUIT":
+                self._reply("221 bye")
+                return
+            else:
+                self._reply("250 ok")
+
+    def _reply(self, text: str) -> None:
+        self.wfile.write(f"{text}\r\n".encode("ascii"))
+
+
+class SMTPSink(socketserver.ThreadingTCPServer):
+    """Многопоточный SMTP-приёмник на localhost."""
+
+    daemon_threads = True
+    allow_reuse_address = True
+
+
+def run_scenario(name: str, emails: int, threads: int, send: Callable[[int], None]) -> None:
+    """Отправляет `emails` писем функцией `send` в `threads` потоков и печатает результат."""
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as executor:
+        list(executor.map(send, range(emails)))
+    elapsed = time.perf_counter() - start
+    print(f"{name:<32} {emails / elapsed:>10.1f} emails/s  ({elapsed:.2f}s)")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--emails", type=int, default=500)
+    parser.add_argument("--threads", type=int, default=16)
+    parser.add_argument("--latency-ms", type=float, default=20.0)
+    args = parser.parse_args()
+
+    SMTPSinkHandler.latency = args.latency_ms / 1000
+    server = SMTPSink(("127.0.0.1", 0), SMTPSinkHandler)
+    host, port = server.server_address
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+
+    message = MIMEText("benchmark", "plain", "utf-8").as_string()
+
+    def send_with_new_connection(number: int) -> None:
+        with smtplib.SMTP(host, port, timeout=10) as smtp:
+            smtp.sendmail(SENDER, f"user{number}@example.com", message)
+
+    def pooled_sender(pool: SMTPConnectionPool) -> Callable[[int], None]:
+        def send(number: int) -> None:
+            with pool.connection() as smtp:
+                smtp.sendmail(SENDER, f"user{number}@example.com", message)
+        return send
+
+    print(f"{args.emails} emails, sink latency {args.latency_ms:.0f} ms/email")
+    run_scenario("solo, connection per email", args.emails, 1, send_with_new_connection)
+
+    solo_pool = SMTPConnectionPool(host, port, use_ssl=False, max_size=1)
+    run_scenario("solo, pooled", args.emails, 1, pooled_sender(solo_pool))
+    solo_pool.close_all()
+
+    threads_pool = SMTPConnectionPool(host, port, use_ssl=False, max_size=args.threads)
+    run_scenario(f"threads={args.threads}, pooled", args.emails, args.threads, pooled_sender(threads_pool))
+    threads_pool.close_all()
+
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
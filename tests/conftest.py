@@ -18,6 +18,7 @@ from httpx import ASGITransport, AsyncClient
 from sqlalchemy import text
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.cache.client import cache
 from app.db.database import get_async_session
 from app.db.models import User
 from app.main import app
@@ -97,9 +98,11 @@ async def auth_header(
 
 @pytest_asyncio.fixture(autouse=True)
 async def clear_test_users(db_session: AsyncSession):
-    """Удаление тестовых пользователей после тестов."""
+    """Удаление тестовых пользователей, сообщений outbox и очистка кэша после тестов."""
     yield
 
+    await cache.clear()
+
     await db_session.rollback()
     await db_session.execute(
         text("DELETE FROM users WHERE email IN (:email1, :email2, :email3)"),
@@ -109,4 +112,5 @@ async def clear_test_users(db_session: AsyncSession):
             "email3": NEW_USER_EMAIL,
         },
     )
+    await db_session.execute(text("DELETE FROM notification_outbox"))
     await db_session.commit()
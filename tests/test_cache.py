@@ -0,0 +1,217 @@
+"""
+Тесты read-through кэша задач и пользователей.
+
+Проверяется, что повторное чтение записи не обращается к БД, что запись
+сбрасывается при изменении и что одновременные промахи по одному ключу
+загружают запись один раз.
+"""
+
+import asyncio
+import logging
+
+import fakeredis
+import pytest
+from conftest import USER_TRUE_EMAIL, USER_TRUE_PASSWORD, USER_TRUE_USERNAME
+from httpx import AsyncClient
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, create_async_engine
+
+from app.cache import users as user_cache
+from app.cache.backends import CacheBackend, NullCacheBackend, build_cache
+from app.cache.entities import invalidate, read_through
+from app.core.config import CacheConfig
+from app.db.database import engine
+from app.db.models import Task
+from app.exceptions import TaskNotFoundException
+from app.schemas.user import TokenClaims
+from app.services.task_service import TaskService
+from app.services.user_service import UserService
+
+logger = logging.getLogger(__name__)
+
+
+class SelectCounter:
+    """Считает SELECT-запросы к таблице, выполненные движком (по умолчанию primary)."""
+
+    def __init__(self, table: str, target: AsyncEngine = engine):
+        self.table = table
+        self.target = target
+        self.count = 0
+
+    def __enter__(self):
+        event.listen(self.target.sync_engine, "before_cursor_execute", self._capture)
+        return self
+
+    def __exit__(self, *exc):
+        event.remove(self.target.sync_engine, "before_cursor_execute", self._capture)
+
+    def _capture(self, conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("SELECT") and f"FROM {self.table}" in statement:
+            self.count += 1
+
+
+@pytest.mark.asyncio
+async def test_task_cache(
+    async_client: AsyncClient, db_session: AsyncSession, create_user, auth_header
+) -> None:
+    """Тест кэширования задачи и её инвалидации при изменении."""
+    user = await create_user(USER_TRUE_EMAIL, USER_TRUE_USERNAME, USER_TRUE_PASSWORD)
+    task = Task(title="cached", user_id=user.id)
+    db_session.add(task)
+    await db_session.commit()
+    claims = TokenClaims(id=user.id, is_active=True)
+
+    with SelectCounter("tasks") as selects:
+        first = await TaskService.get_task(task.id, db_session, claims)
+        second = await TaskService.get_task(task.id, db_session, claims)
+    assert selects.count == 1
+    assert first == second
+
+    header = await auth_header(USER_TRUE_EMAIL, USER_TRUE_PASSWORD)
+    response = await async_client.patch(f"/tasks/{task.id}", json={"title": "changed"}, headers=header)
+    assert response.status_code == 200
+
+    response = await async_client.get(f"/tasks/{task.id}", headers=header)
+    assert response.status_code == 200
+    assert response.json()["title"] == "changed"
+
+    stranger = TokenClaims(id=user.id + 1, is_active=True)
+    with pytest.raises(TaskNotFoundException):
+        await TaskService.get_task(task.id, db_session, stranger)
+
+    response = await async_client.delete(f"/tasks/{task.id}", headers=header)
+    assert response.status_code == 200
+    response = await async_client.get(f"/tasks/{task.id}", headers=header)
+    assert response.status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_user_cache(
+    async_client: AsyncClient, db_session: AsyncSession, create_user, auth_header
+) -> None:
+    """Тест кэширования пользователя и его инвалидации при изменении."""
+    user = await create_user(USER_TRUE_EMAIL, USER_TRUE_USERNAME, USER_TRUE_PASSWORD)
+
+    with SelectCounter("users") as selects:
+        await UserService.get_user_by_id(user.id, db_session)
+        cached = await UserService.get_user_by_id(user.id, db_session)
+    assert selects.count == 1
+    assert cached.username == USER_TRUE_USERNAME
+
+    header = await auth_header(USER_TRUE_EMAIL, USER_TRUE_PASSWORD)
+    response = await async_client.patch(f"/users/{user.id}", json={"username": "renamed"}, headers=header)
+    assert response.status_code == 200
+
+    response = await async_client.get(f"/users/{user.id}", headers=header)
+    assert response.status_code == 200
+    assert response.json()["username"] == "renamed"
+
+
+@pytest.mark.asyncio
+async def test_revalidation_uses_cached_version(
+    async_client: AsyncClient, db_session: AsyncSession, create_user, auth_header, monkeypatch
+) -> None:
+    """Тест: при закэшированной записи и Redis отзывов `If-None-Match` проверяется без запроса к БД."""
+    monkeypatch.setattr(user_cache, "revocation_client", fakeredis.FakeAsyncRedis())
+    user = await create_user(USER_TRUE_EMAIL, USER_TRUE_USERNAME, USER_TRUE_PASSWORD)
+    task = Task(title="cached", user_id=user.id)
+    db_session.add(task)
+    await db_session.commit()
+    header = await auth_header(USER_TRUE_EMAIL, USER_TRUE_PASSWORD)
+
+    task_etag = (await async_client.get(f"/tasks/{task.id}", headers=header)).headers["ETag"]
+    user_etag = (await async_client.get(f"/users/{user.id}")).headers["ETag"]
+
+    with SelectCounter("tasks") as task_selects, SelectCounter("users") as user_selects:
+        response = await async_client.get(f"/tasks/{task.id}", headers={**header, "If-None-Match": task_etag})
+        assert response.status_code == 304
+        response = await async_client.get(f"/users/{user.id}", headers={"If-None-Match": user_etag})
+        assert response.status_code == 304
+    assert (task_selects.count, user_selects.count) == (0, 0)
+
+
+@pytest.mark.asyncio
+async def test_cache_is_filled_from_primary(db_session: AsyncSession, create_user) -> None:
+    """Тест заполнения кэша с primary, когда запрос читает с реплики; некэшируемые страницы читают реплику."""
+    user = await create_user(USER_TRUE_EMAIL, USER_TRUE_USERNAME, USER_TRUE_PASSWORD)
+    task = Task(title="cached", user_id=user.id)
+    db_session.add(task)
+    await db_session.commit()
+    claims = TokenClaims(id=user.id, is_active=True)
+
+    replica_engine = create_async_engine(engine.url.render_as_string(hide_password=False))
+    try:
+        async with AsyncSession(replica_engine) as replica_session:
+            with (
+                SelectCounter("tasks") as primary_tasks,
+                SelectCounter("users") as primary_users,
+                SelectCounter("tasks", replica_engine) as replica_tasks,
+                SelectCounter("users", replica_engine) as replica_users,
+            ):
+                assert (await TaskService.get_task(task.id, replica_session, claims)).title == "cached"
+                assert (await UserService.get_user_by_id(user.id, replica_session)).id == user.id
+                assert (await TaskService.get_user_stats(user.id, replica_session)).total == 1
+                assert (await TaskService.get_stats(replica_session)).overall.total == 1
+            with SelectCounter("tasks", replica_engine) as replica_page:
+                assert (await TaskService.get_stats(replica_session, limit=1)).users[0].user_id == user.id
+    finally:
+        await replica_engine.dispose()
+
+    assert (primary_tasks.count, primary_users.count) == (4, 1)
+    assert (replica_tasks.count, replica_users.count) == (0, 0)
+    assert replica_page.count == 2
+
+
+@pytest.mark.asyncio
+async def test_read_through_single_flight() -> None:
+    """Тест объединения одновременных промахов по одному ключу в одну загрузку."""
+    loads = 0
+    release = asyncio.Event()
+
+    async def load():
+        nonlocal loads
+        loads += 1
+        await release.wait()
+        return {"id": 1}
+
+    readers = [asyncio.create_task(read_through("test", 1, 60, load)) for _ in range(10)]
+    await asyncio.sleep(0)
+    release.set()
+
+    assert await asyncio.gather(*readers) == [{"id": 1}] * 10
+    assert loads == 1
+
+
+@pytest.mark.asyncio
+async def test_read_through_skips_invalidated_load() -> None:
+    """Тест: запись, инвалидированная во время загрузки, не попадает в кэш."""
+    loads = 0
+
+    async def load():
+        nonlocal loads
+        loads += 1
+        if loads == 1:
+            await invalidate("test", 2)
+        return {"load": loads}
+
+    assert await read_through("test", 2, 60, load) == {"load": 1}
+    assert await read_through("test", 2, 60, load) == {"load": 2}
+    assert await read_through("test", 2, 60, load) == {"load": 2}
+
+
+def test_incomplete_cache_backend_is_rejected() -> None:
+    """Тест: хранилище без одного из методов интерфейса не создаётся."""
+
+    class GetOnlyBackend(CacheBackend):
+        async def get(self, key):
+            return None
+
+    with pytest.raises(TypeError):
+        GetOnlyBackend()
+
+
+def test_build_null_cache() -> None:
+    """Тест выбора хранилища кэша настройкой CACHE_BACKEND."""
+    assert isinstance(build_cache(CacheConfig(backend="none")), NullCacheBackend)
+    with pytest.raises(ValueError):
+        build_cache(CacheConfig(backend="redis"))
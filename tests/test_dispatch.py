@@ -0,0 +1,80 @@
+"""
+Тесты неблокирующей постановки задач Celery.
+
+Публикация в брокер подменяется: `_publish` ждёт разрешения из теста,
+что позволяет переполнить очередь и проверить политику drop.
+"""
+
+import asyncio
+import logging
+import threading
+
+import pytest
+
+from app.celery_tasks.dispatch import CeleryDispatcher, DispatchDropped
+from app.celery_tasks.notifications import send_email
+
+logger = logging.getLogger(__name__)
+
+
+class GatedDispatcher(CeleryDispatcher):
+    """Диспетчер, публикующий задачи только после `release()`."""
+
+    def __init__(self, **kwargs):
+        super().__init__(max_size=1, **kwargs)
+        self.gate = threading.Event()
+        self.published = []
+
+    def release(self):
+        self.gate.set()
+
+    def _publish(self, name, args, kwargs):
+        self.gate.wait()
+        self.published.append((name, args, kwargs))
+        return f"id-{len(self.published)}"
+
+
+async def _fill_queue(dispatcher: GatedDispatcher) -> list:
+    """Занимает поток публикации и единственное место в очереди."""
+    first = asyncio.ensure_future(dispatcher.dispatch_confirmed(send_email, to_email="first@example.com"))
+    await _wait_for(lambda: dispatcher._thread is not None and dispatcher._queue.qsize() == 0)
+    second = asyncio.ensure_future(dispatcher.dispatch_confirmed(send_email, to_email="second@example.com"))
+    await _wait_for(lambda: dispatcher._queue.qsize() == 1)
+    return [first, second]
+
+
+async def _wait_for(condition) -> None:
+    for _ in range(300):
+        await asyncio.sleep(0.01)
+        if condition():
+            return
+    raise AssertionError("condition was not met")
+
+
+@pytest.mark.asyncio
+async def test_dispatch_returns_task_id():
+    """Проверяет, что dispatch_confirmed дожидается публикации и возвращает id задачи."""
+    dispatcher = GatedDispatcher()
+    dispatcher.release()
+
+    task_id = await dispatcher.dispatch_confirmed(send_email, to_email="user@example.com", subject="Тема", body="Текст")
+
+    assert task_id == "id-1"
+    assert dispatcher.published == [
+        (send_email.name, (), {"to_email": "user@example.com", "subject": "Тема", "body": "Текст"})
+    ]
+    dispatcher.stop(timeout=5)
+
+
+@pytest.mark.asyncio
+async def test_drop_policy_rejects_when_full():
+    """Проверяет, что при политике drop задача сверх очереди отбрасывается."""
+    dispatcher = GatedDispatcher(policy="drop")
+    pending = await _fill_queue(dispatcher)
+
+    with pytest.raises(DispatchDropped):
+        await dispatcher.dispatch_confirmed(send_email, to_email="dropped@example.com")
+
+    dispatcher.release()
+    assert await asyncio.gather(*pending) == ["id-1", "id-2"]
+    dispatcher.stop(timeout=5)
@@ -0,0 +1,26 @@
+"""
+Тесты эндпоинта метрик Prometheus.
+
+Проверяют, что инфраструктурные метрики приложения (пул соединений БД и т.п.)
+публикуются через существующий эндпоинт `/metrics`.
+"""
+
+import logging
+
+import pytest
+from httpx import AsyncClient
+
+logger = logging.getLogger(__name__)
+
+
+@pytest.mark.asyncio
+async def test_metrics_expose_pool_stats(async_client: AsyncClient) -> None:
+    """Тест публикации метрик пула соединений."""
+    response = await async_client.get("/users")
+    assert response.status_code == 200
+
+    response = await async_client.get("/metrics")
+    assert response.status_code == 200
+    assert 'db_pool_checked_out{pool="primary"}' in response.text
+    assert 'db_pool_checkouts_total{pool="primary"}' in response.text
+    assert "db_pool_checkout_wait_seconds_bucket" in response.text
@@ -0,0 +1,446 @@
+"""
+Тесты пула SMTP-соединений и пакетной отправки писем.
+
+Вместо реального SMTP-сервера используется фейковое соединение,
+подменяющее `SMTPConnectionPool._connect`.
+"""
+
+import logging
+import smtplib
+import time
+
+import fakeredis
+import pytest
+from celery.exceptions import Retry
+from kombu.exceptions import OperationalError
+from redis.asyncio import client as aioredis_client
+
+from app.celery_tasks import notifications, smtp
+from app.celery_tasks.digest import NotificationBuffer, build_digest
+from app.celery_tasks.idempotency import EmailInFlight
+from app.celery_tasks.smtp import SendRateLimiter, SMTPConnectionPool
+
+logger = logging.getLogger(__name__)
+
+
+class FakeSMTP:
+    """Фейковое SMTP-соединение, запоминающее отправленные письма."""
+
+    def __init__(self):
+        self.sent = []
+        self.closed = False
+
+    def sendmail(self, from_addr, to_addrs, msg):
+        self.sent.append(to_addrs)
+
+    def noop(self):
+        return (250, b"OK")
+
+    def rset(self):
+        return (250, b"OK")
+
+    def quit(self):
+        self.closed = True
+
+
+class FakePool(SMTPConnectionPool):
+    """Пул, создающий фейковые соединения и считающий подключения."""
+
+    def __init__(self, **kwargs):
+        super().__init__(host="localhost", port=25, use_ssl=False, **kwargs)
+        self.connections = []
+
+    def _connect(self):
+        server = FakeSMTP()
+        self.connections.append(server)
+        return server
+
+
+def test_pool_reuses_connection():
+    """Проверяет, что последовательные письма идут через одно соединение."""
+    pool = FakePool()
+
+    for _ in range(3):
+        with pool.connection() as server:
+            server.sendmail("from@example.com", "to@example.com", "body")
+
+    assert len(pool.connections) == 1
+    assert len(pool.connections[0].sent) == 3
+
+
+def test_pool_drops_idle_and_broken_connections(monkeypatch):
+    """Проверяет закрытие соединений по простою и после сетевой ошибки."""
+    pool = FakePool(idle_timeout=60)
+
+    with pool.connection():
+        pass
+    now = smtp.time.monotonic()
+    monkeypatch.setattr(smtp.time, "monotonic", lambda: now + 61)
+    with pool.connection():
+        pass
+    assert len(pool.connections) == 2
+    assert pool.connections[0].closed
+
+    monkeypatch.setattr(FakeSMTP, "rset", lambda self: (_ for _ in ()).throw(smtplib.SMTPServerDisconnected()))
+    with pytest.raises(smtplib.SMTPServerDisconnected):
+        with pool.connection():
+            raise smtplib.SMTPServerDisconnected()
+    assert pool.connections[1].closed
+
+    pool.close_all()
+
+
+def test_send_email_batch_uses_one_connection(monkeypatch):
+    """Проверяет, что пакет писем отправляется через одно соединение."""
+    pool = FakePool()
+    monkeypatch.setattr(notifications, "smtp_pool", pool)
+    messages = [
+        {"to_email": f"user{i}@example.com", "subject": "Тема", "body": "Текст"}
+        for i in range(5)
+    ]
+
+    notifications.send_email_batch.run(messages)
+
+    assert len(pool.connections) == 1
+    assert pool.connections[0].sent == [m["to_email"] for m in messages]
+
+
+def test_send_email_batch_retries_unsent_emails(monkeypatch):
+    """Проверяет, что после обрыва соединения повтор отправляет только оставшиеся письма."""
+    pool = FakePool()
+    monkeypatch.setattr(notifications, "smtp_pool", pool)
+    monkeypatch.setattr(notifications, "email_idempotency", None)
+    sendmail = FakeSMTP.sendmail
+    failures = []
+
+    def disconnect_once(self, from_addr, to_addrs, msg):
+        if to_addrs == "user2@example.com" and not failures:
+            failures.append(to_addrs)
+            raise smtplib.SMTPServerDisconnected()
+        sendmail(self, from_addr, to_addrs, msg)
+
+    monkeypatch.setattr(FakeSMTP, "sendmail", disconnect_once)
+    messages = [
+        {"to_email": f"user{i}@example.com", "subject": "Тема", "body": "Текст"}
+        for i in range(4)
+    ]
+
+    result = notifications.send_email_batch.apply((messages,))
+
+    assert result.successful()
+    assert failures == ["user2@example.com"]
+    assert [to for server in pool.connections for to in server.sent] == [m["to_email"] for m in messages]
+
+
+def test_sender_refused_is_not_retried(monkeypatch):
+    """Проверяет, что отказ отправителю пропускает письмо, а не обрывает пакет или ретраит его."""
+    pool = FakePool()
+    monkeypatch.setattr(notifications, "smtp_pool", pool)
+    monkeypatch.setattr(notifications, "email_idempotency", None)
+    sendmail = FakeSMTP.sendmail
+
+    def refuse_first(self, from_addr, to_addrs, msg):
+        if to_addrs == "user0@example.com":
+            raise smtplib.SMTPSenderRefused(553, b"sender not allowed", from_addr)
+        sendmail(self, from_addr, to_addrs, msg)
+
+    def retry(*args, **kwargs):
+        raise AssertionError("permanent sender refusal must not be retried")
+
+    monkeypatch.setattr(FakeSMTP, "sendmail", refuse_first)
+    monkeypatch.setattr(notifications.send_email, "retry", retry)
+    monkeypatch.setattr(notifications.send_email_batch, "retry", retry)
+    messages = [{"to_email": f"user{i}@example.com", "subject": "Тема", "body": "Текст"} for i in range(3)]
+
+    notifications.send_email_batch.run(messages)
+    notifications.send_email.run("user0@example.com", "Тема", "Текст")
+
+    assert pool.connections[0].sent == ["user1@example.com", "user2@example.com"]
+
+
+def test_rate_limiter_spaces_out_emails():
+    """Проверяет, что ограничитель пропускает не больше заданного числа писем в секунду."""
+    limiter = SendRateLimiter("20/s")
+    start = time.monotonic()
+    for _ in range(4):
+        limiter.acquire()
+    assert time.monotonic() - start >= 0.14
+
+
+def test_rate_limit_counts_every_email_in_batch(monkeypatch):
+    """Проверяет, что лимит расходуется на каждое письмо пачки, а не на задачу."""
+    acquired = []
+
+    class CountingLimiter:
+        def acquire(self):
+            acquired.append(True)
+
+    monkeypatch.setattr(notifications, "smtp_pool", FakePool())
+    monkeypatch.setattr(notifications, "email_idempotency", None)
+    monkeypatch.setattr(notifications, "email_rate_limiter", CountingLimiter())
+    messages = [{"to_email": f"user{i}@example.com", "subject": "Тема", "body": "Текст"} for i in range(3)]
+
+    notifications.send_email_batch.apply((messages,))
+
+    assert len(acquired) == 3
+
+
+def test_build_digest():
+    """Проверяет, что несколько событий собираются в одно письмо, а одно — отправляется как есть."""
+    single = [{"subject": "Новая задача", "body": "Ваша задача A успешно создана"}]
+    assert build_digest(single) == ("Новая задача", "Ваша задача A успешно создана")
+
+    events = single + [{"subject": "Новая задача", "body": "Ваша задача B успешно создана"}]
+    subject, body = build_digest(events)
+    assert subject == "Сводка уведомлений (2)"
+    assert body.splitlines() == ["- Ваша задача A успешно создана", "- Ваша задача B успешно создана"]
+
+
+@pytest.mark.asyncio
+async def test_notify_without_buffer_sends_immediately(monkeypatch):
+    """Проверяет, что без буфера дайджестов письмо ставится в очередь сразу."""
+    sent = []
+
+    async def dispatch(task, **kwargs):
+        sent.append((task.name, kwargs))
+
+    monkeypatch.setattr(notifications, "digest_buffer", None)
+    monkeypatch.setattr(notifications.celery_dispatcher, "dispatch_confirmed", dispatch)
+
+    await notifications.notify("user@example.com", "Тема", "Текст", event_id="outbox:1")
+
+    assert sent == [
+        (
+            notifications.send_email.name,
+            {"to_email": "user@example.com", "subject": "Тема", "body": "Текст", "idempotency_key": "outbox:1"},
+        )
+    ]
+
+
+def make_buffer(window_seconds=60):
+    """Буфер дайджестов поверх fakeredis: асинхронный и синхронный клиенты делят одно хранилище."""
+    server = fakeredis.FakeServer()
+    buffer = NotificationBuffer("redis://fake", window_seconds)
+    buffer._async_client = fakeredis.FakeAsyncRedis(server=server)
+    buffer._sync_client = fakeredis.FakeRedis(server=server)
+    return buffer
+
+
+@pytest.mark.asyncio
+async def test_digest_buffer_drains_due_recipients():
+    """Проверяет, что события получателя забираются только после окна накопления и удаляются."""
+    buffer = make_buffer()
+    assert await buffer.push("a@example.com", "Тема", "A", event_id="outbox:1")
+    assert await buffer.push("a@example.com", "Тема", "B", event_id="outbox:2")
+
+    assert buffer.drain_due() == {}
+    drained = buffer.drain_due(now=time.time() + 61)
+
+    assert drained == {"a@example.com": [{"subject": "Тема", "body": "A"}, {"subject": "Тема", "body": "B"}]}
+    assert buffer.drain_due(now=time.time() + 61) == {}
+
+
+@pytest.mark.asyncio
+async def test_digest_buffer_ignores_replayed_event():
+    """Проверяет, что повторная передача того же события не задваивает его ни до, ни после сброса."""
+    buffer = make_buffer()
+    assert await buffer.push("a@example.com", "Тема", "A", event_id="outbox:1")
+    assert not await buffer.push("a@example.com", "Тема", "A", event_id="outbox:1")
+
+    assert buffer.drain_due(now=time.time() + 61) == {"a@example.com": [{"subject": "Тема", "body": "A"}]}
+
+    assert not await buffer.push("a@example.com", "Тема", "A", event_id="outbox:1")
+    assert buffer.drain_due(now=time.time() + 61) == {}
+
+
+@pytest.mark.asyncio
+async def test_digest_buffer_concurrent_replay_is_a_duplicate(monkeypatch):
+    """Проверяет, что проигравший гонку повтор события считается дубликатом, а не ошибкой Redis."""
+    buffer = make_buffer()
+    exists = aioredis_client.Pipeline.exists
+
+    async def racing_exists(pipe, *names):
+        found = await exists(pipe, *names)
+        buffer._sync_client.set("digest:seen:outbox:1", 1)
+        return found
+
+    monkeypatch.setattr(aioredis_client.Pipeline, "exists", racing_exists)
+
+    assert not await buffer.push("a@example.com", "Тема", "A", event_id="outbox:1")
+    assert buffer.drain_due(now=time.time() + 61) == {}
+
+
+@pytest.mark.asyncio
+async def test_flush_digests_restores_events_on_enqueue_failure(monkeypatch):
+    """Проверяет, что при ошибке брокера забранные события возвращаются в буфер и уходят при следующем сбросе."""
+    buffer = make_buffer(window_seconds=0)
+    monkeypatch.setattr(notifications, "digest_buffer", buffer)
+    monkeypatch.setattr(notifications.config.mailing, "batch_size", 1)
+    await buffer.push("a@example.com", "Тема", "A", event_id="outbox:1")
+    await buffer.push("b@example.com", "Тема", "B", event_id="outbox:2")
+    published = []
+
+    def broker_down_after_first(args, priority=None):
+        if published:
+            raise OperationalError("broker unavailable")
+        published.append(args[0])
+
+    monkeypatch.setattr(notifications.send_email_batch, "apply_async", broker_down_after_first)
+    with pytest.raises(OperationalError):
+        notifications.flush_digests.run()
+    await buffer.push("b@example.com", "Тема", "C", event_id="outbox:3")
+
+    assert [message["to_email"] for batch in published for message in batch] == ["a@example.com"]
+    assert buffer.drain_due() == {"b@example.com": [{"subject": "Тема", "body": "B"}, {"subject": "Тема", "body": "C"}]}
+
+
+def test_notification_routing():
+    """Проверяет маршрутизацию писем в отдельную очередь и отказ от хранения результатов."""
+    router = notifications.celery_app.amqp.router
+    config = notifications.config.celery
+
+    urgent = router.route({}, notifications.send_email_batch.name)
+    digest = router.route({}, notifications.flush_digests.name)
+
+    assert urgent["queue"].name == config.notifications_queue
+    assert urgent["priority"] == config.notifications_priority
+    assert digest["priority"] == config.digest_priority
+    assert notifications.send_email.ignore_result is config.ignore_result
+
+
+class FakeIdempotencyStore:
+    """Хранилище ключей идемпотентности в памяти: ключи «отправляется» и «отправлено»."""
+
+    def __init__(self):
+        self.in_flight = set()
+        self.sent = set()
+
+    def claim(self, key):
+        if key in self.sent:
+            return False
+        if key in self.in_flight:
+            raise EmailInFlight(key)
+        self.in_flight.add(key)
+        return True
+
+    def mark_sent(self, key):
+        self.in_flight.discard(key)
+        self.sent.add(key)
+
+    def release(self, key):
+        self.in_flight.discard(key)
+
+    def expire_in_flight(self):
+        self.in_flight.clear()
+
+
+def test_duplicate_email_is_suppressed(monkeypatch):
+    """Проверяет, что повторная отправка с тем же ключом подавляется и учитывается в метрике."""
+    pool = FakePool()
+    monkeypatch.setattr(notifications, "smtp_pool", pool)
+    monkeypatch.setattr(notifications, "email_idempotency", FakeIdempotencyStore())
+    suppressed = notifications.EMAIL_DUPLICATES_SUPPRESSED.labels(notifications.send_email.name)
+    before = suppressed._value.get()
+
+    for _ in range(2):
+        notifications.send_email.run("user@example.com", "Тема", "Текст", idempotency_key="outbox:1")
+
+    assert pool.connections[0].sent == ["user@example.com"]
+    assert suppressed._value.get() == before + 1
+
+
+def test_rejected_email_releases_key(monkeypatch):
+    """Проверяет, что ключ освобождается, если сервер отклонил адресата до передачи письма."""
+    store = FakeIdempotencyStore()
+    monkeypatch.setattr(notifications, "email_idempotency", store)
+
+    def reject(self, from_addr, to_addrs, msg):
+        raise smtplib.SMTPRecipientsRefused({to_addrs: (550, b"no such user")})
+
+    monkeypatch.setattr(FakeSMTP, "sendmail", reject)
+
+    msg = notifications.build_message("user@example.com", "Тема", "Текст")
+    with pytest.raises(smtplib.SMTPRecipientsRefused):
+        notifications.send_once(FakeSMTP(), "outbox:2", "user@example.com", msg, "send_email")
+
+    assert store.in_flight == store.sent == set()
+
+
+def test_data_error_keeps_key_in_flight(monkeypatch):
+    """Проверяет, что после ошибки на DATA ключ остаётся занятым до истечения."""
+    store = FakeIdempotencyStore()
+    monkeypatch.setattr(notifications, "email_idempotency", store)
+
+    def fail_data(self, from_addr, to_addrs, msg):
+        raise smtplib.SMTPDataError(451, b"timeout")
+
+    monkeypatch.setattr(FakeSMTP, "sendmail", fail_data)
+
+    msg = notifications.build_message("user@example.com", "Тема", "Текст")
+    with pytest.raises(smtplib.SMTPDataError):
+        notifications.send_once(FakeSMTP(), "outbox:5", "user@example.com", msg, "send_email")
+
+    assert store.in_flight == {"outbox:5"}
+    assert store.sent == set()
+
+
+def test_interrupted_email_is_resent_after_in_flight_expires(monkeypatch):
+    """Проверяет, что обрыв до ответа сервера не помечает письмо отправленным."""
+    store = FakeIdempotencyStore()
+    monkeypatch.setattr(notifications, "email_idempotency", store)
+    msg = notifications.build_message("user@example.com", "Тема", "Текст")
+    server = FakeSMTP()
+
+    def disconnect(self, from_addr, to_addrs, msg):
+        raise smtplib.SMTPServerDisconnected()
+
+    with monkeypatch.context() as patch:
+        patch.setattr(FakeSMTP, "sendmail", disconnect)
+        with pytest.raises(smtplib.SMTPServerDisconnected):
+            notifications.send_once(server, "outbox:3", "user@example.com", msg, "send_email")
+    assert store.sent == set()
+
+    with pytest.raises(EmailInFlight):
+        notifications.send_once(server, "outbox:3", "user@example.com", msg, "send_email")
+
+    store.expire_in_flight()
+    assert notifications.send_once(server, "outbox:3", "user@example.com", msg, "send_email")
+    assert not notifications.send_once(server, "outbox:3", "user@example.com", msg, "send_email")
+    assert server.sent == ["user@example.com"]
+    assert store.sent == {"outbox:3"}
+
+
+def test_email_in_flight_is_retried(monkeypatch):
+    """Проверяет, что занятый другой попыткой ключ ведёт к ретраю, а не к потере письма."""
+    store = FakeIdempotencyStore()
+    store.in_flight.add("outbox:4")
+    monkeypatch.setattr(notifications, "email_idempotency", store)
+    monkeypatch.setattr(notifications, "smtp_pool", FakePool())
+    retries = []
+
+    def retry(*args, **kwargs):
+        retries.append(kwargs)
+        return Retry()
+
+    monkeypatch.setattr(notifications.send_email_batch, "retry", retry)
+    message = {"to_email": "user@example.com", "subject": "Тема", "body": "Текст", "idempotency_key": "outbox:4"}
+
+    with pytest.raises(Retry):
+        notifications.send_email_batch.run([message])
+
+    assert isinstance(retries[0]["exc"], EmailInFlight)
+    assert retries[0]["args"] == ([message],)
+    assert retries[0]["countdown"] > notifications.config.mailing.idempotency_in_flight_seconds
+
+
+def test_retry_countdown_grows_and_outlasts_in_flight(monkeypatch):
+    """Проверяет экспоненциальную задержку ретрая, ограниченную сверху и не короче срока ключа."""
+    mailing = notifications.config.mailing
+    monkeypatch.setattr(notifications.random, "uniform", lambda low, high: high)
+
+    assert notifications.retry_countdown(0) == mailing.idempotency_in_flight_seconds + mailing.retry_backoff_seconds
+    assert notifications.retry_countdown(1) == mailing.idempotency_in_flight_seconds + 2 * mailing.retry_backoff_seconds
+    assert notifications.retry_countdown(20) == mailing.idempotency_in_flight_seconds + mailing.retry_backoff_max_seconds
+
+    monkeypatch.setattr(notifications.random, "uniform", lambda low, high: low)
+    assert notifications.retry_countdown(0) == mailing.idempotency_in_flight_seconds + mailing.retry_backoff_seconds / 2
@@ -0,0 +1,77 @@
+"""
+Тесты transactional outbox для email-уведомлений.
+
+Проверяют, что уведомление записывается в outbox только вместе
+с успешным коммитом, и что ретранслятор передаёт сообщения и удаляет их.
+"""
+
+import logging
+
+import pytest
+from conftest import USER_TRUE_EMAIL, USER_TRUE_PASSWORD, USER_TRUE_USERNAME
+from httpx import AsyncClient
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.database import async_session_maker
+from app.db.models import OutboxMessage
+from app.services.outbox import OutboxRelay
+
+logger = logging.getLogger(__name__)
+
+
+async def _outbox(db_session: AsyncSession) -> list:
+    db_session.expire_all()
+    result = await db_session.execute(select(OutboxMessage).order_by(OutboxMessage.id))
+    return list(result.scalars().all())
+
+
+@pytest.mark.asyncio
+async def test_register_writes_outbox_and_relay_drains(
+    async_client: AsyncClient, db_session: AsyncSession
+) -> None:
+    """Тест записи письма о регистрации в outbox и его передачи ретранслятором."""
+    payload = {
+        "email": USER_TRUE_EMAIL,
+        "password": USER_TRUE_PASSWORD,
+        "username": USER_TRUE_USERNAME,
+    }
+
+    response = await async_client.post("/users", json=payload)
+    assert response.status_code == 201
+
+    messages = await _outbox(db_session)
+    assert [(m.to_email, m.subject, m.digest) for m in messages] == [(USER_TRUE_EMAIL, "Регистрация", False)]
+
+    published = []
+
+    async def publish(batch):
+        published.extend(m.to_email for m in batch)
+
+    relay = OutboxRelay(async_session_maker, publish, batch_size=10)
+    assert await relay.relay_once() == 1
+    assert published == [USER_TRUE_EMAIL]
+    assert await _outbox(db_session) == []
+
+
+@pytest.mark.asyncio
+async def test_failed_publish_keeps_outbox(
+    async_client: AsyncClient, db_session: AsyncSession, create_user, auth_header
+) -> None:
+    """Тест сохранения сообщений outbox, если передать их в Celery не удалось."""
+    await create_user(USER_TRUE_EMAIL, USER_TRUE_USERNAME, USER_TRUE_PASSWORD)
+    header = await auth_header(USER_TRUE_EMAIL, USER_TRUE_PASSWORD)
+
+    response = await async_client.post("/tasks", json={"title": "Outbox task"}, headers=header)
+    assert response.status_code == 201
+
+    async def publish(batch):
+        raise ConnectionError("broker is down")
+
+    relay = OutboxRelay(async_session_maker, publish, batch_size=10)
+    with pytest.raises(ConnectionError):
+        await relay.relay_once()
+
+    messages = await _outbox(db_session)
+    assert len(messages) == 1
+    assert messages[0].digest is True
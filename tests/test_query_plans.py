@@ -0,0 +1,118 @@
+"""
+Регрессионные тесты планов запросов TaskService.
+
+SQL, который выполняет сервис, перехватывается событием `before_cursor_execute`
+и передаётся в EXPLAIN; тест проверяет, что план использует ожидаемый индекс.
+На PostgreSQL последовательное сканирование отключается (`enable_seqscan = off`),
+чтобы на маленькой тестовой таблице планировщик выбирал индексы так же,
+как на реальном объёме данных. Перед проверкой таблица проходит `VACUUM ANALYZE`:
+без карты видимости index-only scan стоит столько же, сколько обычный,
+и планировщик выбирает любой индекс с `user_id` в начале.
+"""
+
+import logging
+from contextlib import contextmanager
+
+import pytest
+from conftest import USER_TRUE_EMAIL, USER_TRUE_PASSWORD, USER_TRUE_USERNAME
+from sqlalchemy import event
+
+from app.db.database import engine
+from app.db.models import Task
+from app.schemas.user import TokenClaims
+from app.services.pagination import encode_change_cursor, encode_cursor
+from app.services.task_service import TaskService
+
+logger = logging.getLogger(__name__)
+
+EXPLAIN = {
+    "postgresql": "EXPLAIN {}",
+    "sqlite": "EXPLAIN QUERY PLAN {}",
+}
+
+PRIMARY_KEY = {"postgresql": "tasks_pkey", "sqlite": "INTEGER PRIMARY KEY"}
+
+SCENARIOS = {
+    "get_task": (
+        lambda db, user_id, task_id: TaskService.get_task(task_id, db, TokenClaims(id=user_id, is_active=True)),
+        PRIMARY_KEY,
+    ),
+    "list_by_user": (
+        lambda db, user_id, task_id: TaskService.get_all_tasks(db, 10, encode_cursor(task_id), None, user_id),
+        "ix_tasks_user_id_id",
+    ),
+    "list_by_user_and_completed": (
+        lambda db, user_id, task_id: TaskService.get_all_tasks(db, 10, encode_cursor(task_id), False, user_id),
+        "ix_tasks_user_id_completed_id",
+    ),
+    "user_stats": (
+        lambda db, user_id, task_id: TaskService.get_user_stats(user_id, db),
+        "ix_tasks_user_id_completed_id",
+    ),
+    "changes": (
+        lambda db, user_id, task_id: TaskService.get_changes(db, user_id, 10, encode_change_cursor(0, task_id)),
+        "ix_tasks_user_id_change_seq",
+    ),
+    "stats": (
+        lambda db, user_id, task_id: TaskService.get_stats(db),
+        "ix_tasks_user_id_completed_id",
+    ),
+}
+
+
+@contextmanager
+def capture_task_selects():
+    """Собирает SELECT-запросы к таблице tasks, выполненные движком."""
+    statements = []
+
+    def _capture(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("SELECT") and "FROM tasks" in statement:
+            statements.append((statement, parameters))
+
+    event.listen(engine.sync_engine, "before_cursor_execute", _capture)
+    try:
+        yield statements
+    finally:
+        event.remove(engine.sync_engine, "before_cursor_execute", _capture)
+
+
+async def explain(statement: str, parameters) -> str:
+    """Возвращает план запроса одной строкой."""
+    dialect = engine.dialect.name
+    async with engine.connect() as conn:
+        if dialect == "postgresql":
+            await conn.exec_driver_sql("SET LOCAL enable_seqscan = off")
+        result = await conn.exec_driver_sql(EXPLAIN[dialect].format(statement), parameters)
+        plan = "\n".join(str(row[-1]) for row in result)
+        await conn.rollback()
+    return plan
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("scenario", SCENARIOS)
+async def test_task_queries_use_indexes(scenario, db_session, create_user) -> None:
+    """Тест использования индексов запросами TaskService."""
+    dialect = engine.dialect.name
+    if dialect not in EXPLAIN:
+        pytest.skip(f"EXPLAIN is not supported for {dialect}")
+
+    user = await create_user(USER_TRUE_EMAIL, USER_TRUE_USERNAME, USER_TRUE_PASSWORD)
+    tasks = [Task(title=f"Task {i}", completed=i % 2 == 0, user_id=user.id) for i in range(20)]
+    db_session.add_all(tasks)
+    await db_session.commit()
+    if dialect == "postgresql":
+        async with engine.connect() as conn:
+            await conn.execution_options(isolation_level="AUTOCOMMIT")
+            await conn.exec_driver_sql("VACUUM ANALYZE tasks")
+
+    query, expected = SCENARIOS[scenario]
+    if isinstance(expected, dict):
+        expected = expected[dialect]
+
+    with capture_task_selects() as statements:
+        await query(db_session, user.id, tasks[0].id)
+
+    assert statements, f"{scenario} did not query tasks"
+    for statement, parameters in statements:
+        plan = await explain(statement, parameters)
+        assert expected in plan, f"{scenario} does not use {expected}:\n{statement}\n{plan}"
@@ -0,0 +1,166 @@
+"""
+Тесты потока изменений задач (SSE).
+
+События доходят до подписчиков через `LISTEN` слушателя брокера. ASGI-клиент
+тестов не запускает lifespan приложения, поэтому слушатель запускается
+фикстурой `listening_broker`. Проверяются доставка только зафиксированных
+изменений, отключение медленных клиентов и закрытие потока по отзыву токена.
+"""
+
+import asyncio
+import logging
+
+import pytest
+import pytest_asyncio
+from conftest import USER_TRUE_EMAIL, USER_TRUE_PASSWORD, USER_TRUE_USERNAME
+from httpx import AsyncClient
+from sqlalchemy import insert, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.cache.users import revoke_tokens
+from app.db.models import Task, User
+from app.services.task_events import TaskEventBroker, task_event_broker
+
+logger = logging.getLogger(__name__)
+
+
+@pytest_asyncio.fixture
+async def listening_broker():
+    """Запускает слушатель `LISTEN` брокера событий и ждёт подключения."""
+    task_event_broker.start()
+    try:
+        for _ in range(500):
+            if task_event_broker.listening:
+                break
+            await asyncio.sleep(0.01)
+        assert task_event_broker.listening, "task event listener did not connect"
+        yield task_event_broker
+    finally:
+        await task_event_broker.stop()
+
+
+async def _collect(subscription, count: int) -> list:
+    """Ждёт `count` событий, затем проверяет, что лишних событий нет."""
+    events = []
+    for _ in range(count):
+        payload = await subscription.get(5)
+        assert payload is not None, f"expected {count} events, got {events}"
+        events.append((payload["type"], payload["ids"]))
+    assert await subscription.get(0.2) is None
+    return events
+
+
+@pytest.mark.asyncio
+async def test_task_changes_are_pushed(
+    async_client: AsyncClient, db_session: AsyncSession, create_user, auth_header, listening_broker
+) -> None:
+    """Тест доставки событий о создании, изменении и удалении задач владельцу."""
+    user = await create_user(USER_TRUE_EMAIL, USER_TRUE_USERNAME, USER_TRUE_PASSWORD)
+    header = await auth_header(USER_TRUE_EMAIL, USER_TRUE_PASSWORD)
+    subscription = task_event_broker.subscribe(user.id)
+    other = task_event_broker.subscribe(user.id + 1)
+    try:
+        response = await async_client.post("/tasks", json={"title": "pushed"}, headers=header)
+        task_id = response.json()["id"]
+        await async_client.patch(f"/tasks/{task_id}", json={"completed": True}, headers=header)
+        await async_client.delete(f"/tasks/{task_id}", headers=header)
+
+        await db_session.execute(update(Task).where(Task.user_id == user.id).values(completed=False))
+        await db_session.rollback()
+
+        assert await _collect(subscription, 3) == [
+            ("created", [task_id]),
+            ("updated", [task_id]),
+            ("deleted", [task_id]),
+        ]
+        assert await _collect(other, 0) == []
+    finally:
+        task_event_broker.unsubscribe(subscription)
+        task_event_broker.unsubscribe(other)
+
+
+@pytest.mark.asyncio
+async def test_bulk_changes_are_chunked(
+    db_session: AsyncSession, create_user, listening_broker
+) -> None:
+    """Тест разбиения события о массовой записи на части, помещающиеся в NOTIFY."""
+    user = await create_user(USER_TRUE_EMAIL, USER_TRUE_USERNAME, USER_TRUE_PASSWORD)
+    subscription = task_event_broker.subscribe(user.id)
+    try:
+        result = await db_session.execute(
+            insert(Task).values([{"title": f"bulk {i}", "user_id": user.id} for i in range(501)]).returning(Task.id)
+        )
+        ids = sorted(result.scalars().all())
+        await db_session.commit()
+
+        assert await _collect(subscription, 2) == [("created", ids[:500]), ("created", ids[500:])]
+    finally:
+        task_event_broker.unsubscribe(subscription)
+
+
+def test_slow_subscriber_is_disconnected() -> None:
+    """Тест закрытия подписки, которая не успевает читать события."""
+    broker = TaskEventBroker(buffer_size=2)
+    slow = broker.subscribe(1)
+
+    for task_id in range(3):
+        broker.publish({"user_id": 1, "type": "created", "ids": [task_id]})
+
+    assert slow.overflowed
+    fresh = broker.subscribe(1)
+    broker.publish({"user_id": 1, "type": "created", "ids": [3]})
+    assert not fresh.overflowed
+    assert broker._subscribers[1] == {fresh}
+
+
+@pytest.mark.asyncio
+async def test_task_events_stream(async_client: AsyncClient, create_user, auth_header) -> None:
+    """Тест SSE-потока: события доходят до клиента, переполнение закрывает поток."""
+    user = await create_user(USER_TRUE_EMAIL, USER_TRUE_USERNAME, USER_TRUE_PASSWORD)
+    header = await auth_header(USER_TRUE_EMAIL, USER_TRUE_PASSWORD)
+
+    request = asyncio.create_task(async_client.get("/tasks/events", headers=header))
+    for _ in range(100):
+        if task_event_broker._subscribers.get(user.id):
+            break
+        await asyncio.sleep(0.01)
+
+    task_event_broker.publish({"user_id": user.id, "type": "created", "ids": [1]})
+    await asyncio.sleep(0.05)
+    for task_id in range(task_event_broker.buffer_size + 1):
+        task_event_broker.publish({"user_id": user.id, "type": "updated", "ids": [task_id]})
+
+    response = await asyncio.wait_for(request, timeout=5)
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/event-stream")
+    assert response.text.startswith('event: created\ndata: {"ids": [1]}\n\n')
+    assert response.text.endswith('event: overflow\ndata: {"ids": []}\n\n')
+    assert not task_event_broker._subscribers.get(user.id)
+
+
+
+@pytest.mark.asyncio
+async def test_task_events_stream_closes_on_revoked_token(
+    async_client: AsyncClient, db_session: AsyncSession, create_user, auth_header, monkeypatch
+) -> None:
+    """Тест закрытия SSE-потока после отзыва токенов пользователя."""
+    user = await create_user(USER_TRUE_EMAIL, USER_TRUE_USERNAME, USER_TRUE_PASSWORD)
+    header = await auth_header(USER_TRUE_EMAIL, USER_TRUE_PASSWORD)
+    monkeypatch.setattr(task_event_broker, "heartbeat_seconds", 0.05)
+
+    request = asyncio.create_task(async_client.get("/tasks/events", headers=header))
+    for _ in range(100):
+        if task_event_broker._subscribers.get(user.id):
+            break
+        await asyncio.sleep(0.01)
+    assert task_event_broker._subscribers.get(user.id)
+
+    await db_session.execute(update(User).where(User.id == user.id).values(token_version=1))
+    await db_session.commit()
+    await revoke_tokens(user.id, 1)
+
+    response = await asyncio.wait_for(request, timeout=5)
+    assert response.status_code == 200
+    assert "event:" not in response.text
+    assert not task_event_broker._subscribers.get(user.id)
+
@@ -9,6 +9,7 @@
 - Ожидаемое поведение эндпоинтов при различных сценариях (успешный запрос, ошибка, неверные права доступа).
 """
 
+import json
 import logging
 
 import pytest
@@ -21,9 +22,13 @@ from conftest import (
     USER_TRUE_USERNAME,
 )
 from httpx import AsyncClient
+from sqlalchemy import func, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.db.models import Task
+from app.api import responses
+from app.cache.users import invalidate_user
+from app.db.models import Task, TaskTombstone, User
+from app.services import task_service
 
 logger = logging.getLogger(__name__)
 
@@ -83,25 +88,296 @@ async def test_get_task(async_client: AsyncClient, create_user, auth_header) ->
 
 
 @pytest.mark.asyncio
-async def test_get_all_tasks(
+async def test_create_tasks_bulk(
     async_client: AsyncClient, create_user, auth_header
 ) -> None:
-    """Тест получения всех задач."""
+    """Тест пакетного создания задач."""
+    true_user = await create_user(
+        USER_TRUE_EMAIL, USER_TRUE_USERNAME, USER_TRUE_PASSWORD
+    )
+    true_header = await auth_header(USER_TRUE_EMAIL, USER_TRUE_PASSWORD)
+
+    payload = {
+        "tasks": [
+            {"title": f"{TITLE} {i}", "description": DESCRIPTION, "completed": i == 0}
+            for i in range(3)
+        ]
+    }
+    response = await async_client.post("/tasks/bulk", json=payload, headers=true_header)
+    assert response.status_code == 201
+    data = response.json()
+    assert [task["title"] for task in data] == [f"{TITLE} {i}" for i in range(3)]
+    assert [task["completed"] for task in data] == [True, False, False]
+    assert all(task["user_id"] == true_user.id for task in data)
+
+    response = await async_client.post(
+        "/tasks/bulk", json={"tasks": []}, headers=true_header
+    )
+    assert response.status_code == 422
+
+
+@pytest.mark.asyncio
+async def test_search_tasks(async_client: AsyncClient, create_user, auth_header) -> None:
+    """Тест поиска задач текущего пользователя с пагинацией."""
     _ = await create_user(USER_TRUE_EMAIL, USER_TRUE_USERNAME, USER_TRUE_PASSWORD)
     true_header = await auth_header(USER_TRUE_EMAIL, USER_TRUE_PASSWORD)
+    _ = await create_user(USER_FALSE_EMAIL, USER_FALSE_USERNAME, USER_FALSE_PASSWORD)
+    false_header = await auth_header(USER_FALSE_EMAIL, USER_FALSE_PASSWORD)
+
+    payload = {
+        "tasks": [
+            {"title": "Купить молоко", "description": "Магазин у дома"},
+            {"title": "Завтрак", "description": "Овсянка на молоко"},
+            {"title": "Починить велосипед", "description": None},
+        ]
+    }
+    response = await async_client.post("/tasks/bulk", json=payload, headers=true_header)
+    own_ids = [task["id"] for task in response.json()]
+    await async_client.post("/tasks", json={"title": "Чужое молоко"}, headers=false_header)
+
+    response = await async_client.get("/tasks/search", params={"q": "молоко", "limit": 1}, headers=true_header)
+    assert response.status_code == 200
+    first_page = response.json()
+    assert len(first_page["items"]) == 1
+    assert first_page["next_cursor"] is not None
+
+    response = await async_client.get(
+        "/tasks/search",
+        params={"q": "молоко", "limit": 1, "after": first_page["next_cursor"]},
+        headers=true_header,
+    )
+    second_page = response.json()
+    found = [task["id"] for task in first_page["items"] + second_page["items"]]
+    assert sorted(found) == own_ids[:2]
+    assert second_page["next_cursor"] is None
+
+    response = await async_client.get("/tasks/search", params={"q": "молоко"})
+    assert response.status_code == 401
+
+
+async def _make_superuser(db_session: AsyncSession, user_id: int) -> None:
+    """Выдаёт пользователю права суперпользователя и сбрасывает его запись в кэше."""
+    await db_session.execute(update(User).where(User.id == user_id).values(is_superuser=True))
+    await db_session.commit()
+    await invalidate_user(user_id)
+
+
+@pytest.mark.asyncio
+async def test_task_stats(
+    async_client: AsyncClient, db_session: AsyncSession, create_user, auth_header
+) -> None:
+    """Тест статистики задач, прав на её просмотр и её сброса после изменения задачи."""
+    true_user = await create_user(
+        USER_TRUE_EMAIL, USER_TRUE_USERNAME, USER_TRUE_PASSWORD
+    )
+    true_header = await auth_header(USER_TRUE_EMAIL, USER_TRUE_PASSWORD)
+    _ = await create_user(USER_FALSE_EMAIL, USER_FALSE_USERNAME, USER_FALSE_PASSWORD)
+    false_header = await auth_header(USER_FALSE_EMAIL, USER_FALSE_PASSWORD)
+
+    payload = {"tasks": [{"title": f"{TITLE} {i}", "completed": i == 0} for i in range(4)]}
+    response = await async_client.post("/tasks/bulk", json=payload, headers=true_header)
+    task_ids = [task["id"] for task in response.json()]
+
+    assert (await async_client.get(f"/tasks/stats/{true_user.id}")).status_code == 401
+    assert (await async_client.get("/tasks/stats")).status_code == 401
+    assert (await async_client.get(f"/tasks/stats/{true_user.id}", headers=false_header)).status_code == 403
+    assert (await async_client.get("/tasks/stats", headers=true_header)).status_code == 403
+
+    response = await async_client.get(f"/tasks/stats/{true_user.id}", headers=true_header)
+    assert response.status_code == 200
+    assert response.json() == {
+        "user_id": true_user.id,
+        "total": 4,
+        "completed": 1,
+        "completion_rate": 0.25,
+    }
+
+    await _make_superuser(db_session, true_user.id)
+    response = await async_client.get("/tasks/stats", headers=true_header)
+    assert response.status_code == 200
+    data = response.json()
+    user_stats = next(stats for stats in data["users"] if stats["user_id"] == true_user.id)
+    assert user_stats["total"] == 4
+    assert data["overall"]["total"] >= 4
+
+    await async_client.patch(f"/tasks/{task_ids[1]}", json={"completed": True}, headers=true_header)
+
+    response = await async_client.get(f"/tasks/stats/{true_user.id}", headers=true_header)
+    assert response.json()["completed"] == 2
+    response = await async_client.get("/tasks/stats", headers=true_header)
+    user_stats = next(stats for stats in response.json()["users"] if stats["user_id"] == true_user.id)
+    assert user_stats["completion_rate"] == 0.5
+
+
+@pytest.mark.asyncio
+async def test_task_stats_pagination(
+    async_client: AsyncClient, db_session: AsyncSession, create_user, auth_header
+) -> None:
+    """Тест keyset-пагинации разбивки статистики по пользователям."""
+    user_ids = []
+    for email, username, password in (
+        (USER_TRUE_EMAIL, USER_TRUE_USERNAME, USER_TRUE_PASSWORD),
+        (USER_FALSE_EMAIL, USER_FALSE_USERNAME, USER_FALSE_PASSWORD),
+    ):
+        user = await create_user(email, username, password)
+        header = await auth_header(email, password)
+        response = await async_client.post("/tasks", json={"title": TITLE}, headers=header)
+        assert response.status_code == 201
+        user_ids.append(user.id)
+    await _make_superuser(db_session, user_ids[-1])
+
+    first_page = (await async_client.get("/tasks/stats", params={"limit": 1}, headers=header)).json()
+    assert [stats["user_id"] for stats in first_page["users"]] == sorted(user_ids)[:1]
+    assert first_page["overall"]["total"] == 2
+    assert first_page["next_cursor"] is not None
+
+    params = {"limit": 1, "after": first_page["next_cursor"]}
+    second_page = (await async_client.get("/tasks/stats", params=params, headers=header)).json()
+    assert [stats["user_id"] for stats in second_page["users"]] == sorted(user_ids)[1:]
+    assert second_page["next_cursor"] is None
+
+    response = await async_client.get("/tasks/stats", params={"limit": 0}, headers=header)
+    assert response.status_code == 422
+
+
+@pytest.mark.asyncio
+async def test_get_task_with_revoked_token(
+    async_client: AsyncClient, create_user, auth_header
+) -> None:
+    """Тест отказа быстрого пути аутентификации после удаления пользователя."""
+    true_user = await create_user(
+        USER_TRUE_EMAIL, USER_TRUE_USERNAME, USER_TRUE_PASSWORD
+    )
+    true_header = await auth_header(USER_TRUE_EMAIL, USER_TRUE_PASSWORD)
+
+    payload = {"title": TITLE, "description": DESCRIPTION}
+    response = await async_client.post("/tasks", json=payload, headers=true_header)
+    task = response.json()
+
+    response = await async_client.get(f"/tasks/{task['id']}")
+    assert response.status_code == 401
+
+    response = await async_client.delete(f"/users/{true_user.id}", headers=true_header)
+    assert response.status_code == 204
+
+    response = await async_client.get(f"/tasks/{task['id']}", headers=true_header)
+    assert response.status_code == 401
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("fast_list_responses", [False, True])
+async def test_get_all_tasks(
+    async_client: AsyncClient, create_user, auth_header, monkeypatch, fast_list_responses
+) -> None:
+    """Тест получения всех задач с валидацией `response_model` и через `FastJSONResponse`."""
+    monkeypatch.setattr(responses.config, "fast_list_responses", fast_list_responses)
+    true_user = await create_user(
+        USER_TRUE_EMAIL, USER_TRUE_USERNAME, USER_TRUE_PASSWORD
+    )
+    true_header = await auth_header(USER_TRUE_EMAIL, USER_TRUE_PASSWORD)
 
     for i in range(2):
         payload = {"title": f"{TITLE} {i}", "description": f"{DESCRIPTION} {i}"}
         response = await async_client.post("/tasks", json=payload, headers=true_header)
         assert response.status_code == 201
 
-    response = await async_client.get("/tasks", headers=true_header)
+    response = await async_client.get(
+        "/tasks", params={"user_id": true_user.id}, headers=true_header
+    )
     assert response.status_code == 200
-    tasks = response.json()
+    tasks = response.json()["items"]
     assert isinstance(tasks, list)
     assert any(task["title"] == "test title 0" for task in tasks)
     assert any(task["title"] == "test title 1" for task in tasks)
 
+    # Список собирается из строк запроса, но формат задачи тот же, что у response_model.
+    single = (await async_client.get(f"/tasks/{tasks[0]['id']}", headers=true_header)).json()
+    assert list(tasks[0].items()) == list(single.items())
+
+
+@pytest.mark.asyncio
+async def test_get_all_tasks_pagination(
+    async_client: AsyncClient, create_user, auth_header
+) -> None:
+    """Тест keyset-пагинации и фильтров списка задач."""
+    true_user = await create_user(
+        USER_TRUE_EMAIL, USER_TRUE_USERNAME, USER_TRUE_PASSWORD
+    )
+    true_header = await auth_header(USER_TRUE_EMAIL, USER_TRUE_PASSWORD)
+
+    created_ids = []
+    for i in range(3):
+        payload = {"title": f"{TITLE} {i}", "description": f"{DESCRIPTION} {i}"}
+        response = await async_client.post("/tasks", json=payload, headers=true_header)
+        assert response.status_code == 201
+        created_ids.append(response.json()["id"])
+
+    params = {"user_id": true_user.id, "limit": 2}
+    first_page = (await async_client.get("/tasks", params=params)).json()
+    assert [task["id"] for task in first_page["items"]] == created_ids[:2]
+    assert first_page["next_cursor"] is not None
+
+    params["after"] = first_page["next_cursor"]
+    second_page = (await async_client.get("/tasks", params=params)).json()
+    assert [task["id"] for task in second_page["items"]] == created_ids[2:]
+    assert second_page["next_cursor"] is None
+
+    response = await async_client.get(
+        "/tasks", params={"user_id": true_user.id, "completed": True}
+    )
+    assert response.json()["items"] == []
+
+    response = await async_client.get("/tasks", params={"after": "broken"})
+    assert response.status_code == 400
+
+    response = await async_client.get("/tasks", params={"limit": 10_000})
+    assert response.status_code == 422
+
+
+@pytest.mark.asyncio
+async def test_export_tasks(
+    async_client: AsyncClient, db_session: AsyncSession, create_user, auth_header
+) -> None:
+    """Тест потоковой выгрузки задач в NDJSON и CSV и прав на выгрузку чужих задач."""
+    true_user = await create_user(
+        USER_TRUE_EMAIL, USER_TRUE_USERNAME, USER_TRUE_PASSWORD
+    )
+    true_header = await auth_header(USER_TRUE_EMAIL, USER_TRUE_PASSWORD)
+
+    for i in range(2):
+        payload = {"title": f"{TITLE} {i}", "description": f"{DESCRIPTION} {i}"}
+        response = await async_client.post("/tasks", json=payload, headers=true_header)
+        assert response.status_code == 201
+
+    other_user = await create_user(USER_FALSE_EMAIL, USER_FALSE_USERNAME, USER_FALSE_PASSWORD)
+    other_header = await auth_header(USER_FALSE_EMAIL, USER_FALSE_PASSWORD)
+    response = await async_client.post("/tasks", json={"title": "foreign"}, headers=other_header)
+    assert response.status_code == 201
+
+    response = await async_client.get("/tasks/export", params={"user_id": true_user.id})
+    assert response.status_code == 401
+    response = await async_client.get("/tasks/export", params={"user_id": other_user.id}, headers=true_header)
+    assert response.status_code == 403
+
+    response = await async_client.get("/tasks/export", headers=true_header)
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    rows = [json.loads(line) for line in response.text.splitlines()]
+    assert [row["title"] for row in rows] == [f"{TITLE} 0", f"{TITLE} 1"]
+    assert all(row["user_id"] == true_user.id for row in rows)
+
+    response = await async_client.get(
+        "/tasks/export", params={"user_id": true_user.id, "format": "csv"}, headers=true_header
+    )
+    assert response.status_code == 200
+    lines = response.text.splitlines()
+    assert lines[0] == "id,title,description,completed,user_id"
+    assert len(lines) == 3
+
+    await _make_superuser(db_session, true_user.id)
+    response = await async_client.get("/tasks/export", params={"user_id": other_user.id}, headers=true_header)
+    assert [json.loads(line)["title"] for line in response.text.splitlines()] == ["foreign"]
+
 
 @pytest.mark.asyncio
 async def test_update_task(async_client: AsyncClient, create_user, auth_header) -> None:
@@ -133,6 +409,93 @@ async def test_update_task(async_client: AsyncClient, create_user, auth_header)
     )
     assert response_with_false_header.status_code == 403
 
+    response = await async_client.put(
+        f"/tasks/{task['id'] + 1000}", json=new_payload, headers=true_header
+    )
+    assert response.status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_patch_task(async_client: AsyncClient, create_user, auth_header) -> None:
+    """Тест частичного обновления задачи."""
+    _ = await create_user(USER_TRUE_EMAIL, USER_TRUE_USERNAME, USER_TRUE_PASSWORD)
+    true_header = await auth_header(USER_TRUE_EMAIL, USER_TRUE_PASSWORD)
+
+    _ = await create_user(USER_FALSE_EMAIL, USER_FALSE_USERNAME, USER_FALSE_PASSWORD)
+    false_header = await auth_header(USER_FALSE_EMAIL, USER_FALSE_PASSWORD)
+
+    payload = {"title": TITLE, "description": DESCRIPTION}
+    response = await async_client.post("/tasks", json=payload, headers=true_header)
+    task = response.json()
+
+    response = await async_client.patch(
+        f"/tasks/{task['id']}", json={"completed": True}, headers=true_header
+    )
+    assert response.status_code == 200
+    patched = response.json()
+    assert patched["completed"] is True
+    assert patched["title"] == TITLE
+    assert patched["description"] == DESCRIPTION
+
+    response = await async_client.patch(
+        f"/tasks/{task['id']}", json={}, headers=true_header
+    )
+    assert response.status_code == 200
+    assert response.json() == patched
+
+    response = await async_client.patch(
+        f"/tasks/{task['id']}", json={"title": None}, headers=true_header
+    )
+    assert response.status_code == 422
+
+    response = await async_client.patch(
+        f"/tasks/{task['id']}", json={"completed": False}, headers=false_header
+    )
+    assert response.status_code == 403
+
+    response = await async_client.patch(
+        f"/tasks/{task['id'] + 1000}", json={"completed": False}, headers=true_header
+    )
+    assert response.status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_update_tasks_bulk(
+    async_client: AsyncClient, create_user, auth_header
+) -> None:
+    """Тест пакетного обновления задач с проверкой владельца."""
+    _ = await create_user(USER_TRUE_EMAIL, USER_TRUE_USERNAME, USER_TRUE_PASSWORD)
+    true_header = await auth_header(USER_TRUE_EMAIL, USER_TRUE_PASSWORD)
+
+    _ = await create_user(USER_FALSE_EMAIL, USER_FALSE_USERNAME, USER_FALSE_PASSWORD)
+    false_header = await auth_header(USER_FALSE_EMAIL, USER_FALSE_PASSWORD)
+
+    payload = {"tasks": [{"title": f"{TITLE} {i}"} for i in range(2)]}
+    response = await async_client.post("/tasks/bulk", json=payload, headers=true_header)
+    own_ids = [task["id"] for task in response.json()]
+
+    response = await async_client.post("/tasks", json={"title": TITLE}, headers=false_header)
+    foreign_id = response.json()["id"]
+    missing_id = foreign_id + 1000
+
+    payload = {"ids": [*own_ids, foreign_id, missing_id], "completed": True}
+    response = await async_client.patch("/tasks/bulk", json=payload, headers=true_header)
+    assert response.status_code == 200
+    assert response.json() == {
+        "updated": own_ids,
+        "not_found": [missing_id],
+        "forbidden": [foreign_id],
+    }
+
+    for task_id in own_ids:
+        response = await async_client.get(f"/tasks/{task_id}", headers=true_header)
+        assert response.json()["completed"] is True
+
+    response = await async_client.patch(
+        "/tasks/bulk", json={"ids": own_ids}, headers=true_header
+    )
+    assert response.status_code == 422
+
 
 @pytest.mark.asyncio
 async def test_delete_task(async_client: AsyncClient, create_user, auth_header) -> None:
@@ -158,3 +521,122 @@ async def test_delete_task(async_client: AsyncClient, create_user, auth_header)
 
     response = await async_client.get(f"/tasks/{task['id']}", headers=true_header)
     assert response.status_code == 404
+
+    response = await async_client.delete(f"/tasks/{task['id']}", headers=true_header)
+    assert response.status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_task_etag(async_client: AsyncClient, create_user, auth_header) -> None:
+    """Тест ETag, ответа 304 и оптимистической блокировки PUT через If-Match."""
+    _ = await create_user(USER_TRUE_EMAIL, USER_TRUE_USERNAME, USER_TRUE_PASSWORD)
+    true_header = await auth_header(USER_TRUE_EMAIL, USER_TRUE_PASSWORD)
+
+    response = await async_client.post("/tasks", json={"title": TITLE}, headers=true_header)
+    task_id = response.json()["id"]
+
+    response = await async_client.get(f"/tasks/{task_id}", headers=true_header)
+    assert response.status_code == 200
+    etag = response.headers["ETag"]
+    assert etag.startswith('W/"')
+    assert "version" not in response.json()
+
+    response = await async_client.get(f"/tasks/{task_id}", headers={**true_header, "If-None-Match": etag})
+    assert response.status_code == 304
+    assert response.headers["ETag"] == etag
+    assert response.content == b""
+
+    payload = {"title": NEW_TITLE, "description": NEW_DESCRIPTION, "completed": True}
+    response = await async_client.put(f"/tasks/{task_id}", json=payload, headers={**true_header, "If-Match": etag})
+    assert response.status_code == 200
+    new_etag = response.headers["ETag"]
+    assert new_etag != etag
+
+    response = await async_client.put(f"/tasks/{task_id}", json=payload, headers={**true_header, "If-Match": etag})
+    assert response.status_code == 412
+
+    response = await async_client.get(f"/tasks/{task_id}", headers={**true_header, "If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.headers["ETag"] == new_etag
+    assert response.json()["title"] == NEW_TITLE
+
+
+@pytest.mark.asyncio
+async def test_task_changes(async_client: AsyncClient, create_user, auth_header, monkeypatch) -> None:
+    """Тест дельта-синхронизации: изменения и удаления после водяного знака."""
+    _ = await create_user(USER_TRUE_EMAIL, USER_TRUE_USERNAME, USER_TRUE_PASSWORD)
+    true_header = await auth_header(USER_TRUE_EMAIL, USER_TRUE_PASSWORD)
+
+    payload = {"tasks": [{"title": f"{TITLE} {i}"} for i in range(3)]}
+    response = await async_client.post("/tasks/bulk", json=payload, headers=true_header)
+    ids = [task["id"] for task in response.json()]
+
+    # Изменения моложе DB_CHANGE_SETTLE_SECONDS ещё не отдаются, но клиент знает, что они есть.
+    response = await async_client.get("/tasks/changes", headers=true_header)
+    assert response.json() == {"changed": [], "deleted": [], "watermark": None, "has_more": True}
+
+    monkeypatch.setattr(task_service.config.db, "change_settle_seconds", 0)
+    response = await async_client.get("/tasks/changes", headers=true_header)
+    assert response.status_code == 200
+    data = response.json()
+    assert [task["id"] for task in data["changed"]] == ids
+    assert data["deleted"] == []
+    assert data["has_more"] is False
+    watermark = data["watermark"]
+
+    response = await async_client.get("/tasks/changes", params={"since": watermark}, headers=true_header)
+    assert response.json() == {"changed": [], "deleted": [], "watermark": watermark, "has_more": False}
+
+    response = await async_client.patch(f"/tasks/{ids[0]}", json={"completed": True}, headers=true_header)
+    assert response.status_code == 200
+    response = await async_client.delete(f"/tasks/{ids[1]}", headers=true_header)
+    assert response.status_code == 200
+
+    response = await async_client.get(
+        "/tasks/changes", params={"since": watermark, "limit": 1}, headers=true_header
+    )
+    data = response.json()
+    assert [task["id"] for task in data["changed"]] == [ids[0]]
+    assert data["changed"][0]["completed"] is True
+    assert data["has_more"] is True
+
+    response = await async_client.get("/tasks/changes", params={"since": data["watermark"]}, headers=true_header)
+    data = response.json()
+    assert data["changed"] == []
+    assert data["deleted"] == [ids[1]]
+    assert data["has_more"] is False
+
+    response = await async_client.get("/tasks/changes", params={"since": "broken"}, headers=true_header)
+    assert response.status_code == 400
+
+
+@pytest.mark.asyncio
+async def test_pruned_tombstones_expire_watermarks(
+    async_client: AsyncClient, db_session: AsyncSession, create_user, auth_header, monkeypatch
+) -> None:
+    """Тест очистки старых надгробий: водяной знак до удалённого надгробия отклоняется."""
+    _ = await create_user(USER_TRUE_EMAIL, USER_TRUE_USERNAME, USER_TRUE_PASSWORD)
+    true_header = await auth_header(USER_TRUE_EMAIL, USER_TRUE_PASSWORD)
+    monkeypatch.setattr(task_service.config.db, "change_settle_seconds", 0)
+
+    payload = {"tasks": [{"title": f"{TITLE} {i}"} for i in range(2)]}
+    response = await async_client.post("/tasks/bulk", json=payload, headers=true_header)
+    ids = [task["id"] for task in response.json()]
+    response = await async_client.get("/tasks/changes", headers=true_header)
+    watermark = response.json()["watermark"]
+
+    await async_client.delete(f"/tasks/{ids[0]}", headers=true_header)
+    assert await task_service.TaskService.prune_tombstones(db_session, retention_days=30) == 0
+    await db_session.execute(
+        update(TaskTombstone).values(deleted_at=func.now() - func.make_interval(0, 0, 0, 31))
+    )
+    await db_session.commit()
+    assert await task_service.TaskService.prune_tombstones(db_session, retention_days=30) == 1
+
+    response = await async_client.get("/tasks/changes", params={"since": watermark}, headers=true_header)
+    assert response.status_code == 410
+
+    response = await async_client.get("/tasks/changes", headers=true_header)
+    assert response.status_code == 200
+    assert [task["id"] for task in response.json()["changed"]] == [ids[1]]
+    assert response.json()["deleted"] == []
@@ -14,6 +14,7 @@
 
 import logging
 
+import fakeredis
 import pytest
 from conftest import (
     USER_FALSE_EMAIL,
@@ -24,8 +25,12 @@ from conftest import (
     USER_TRUE_USERNAME,
 )
 from httpx import AsyncClient
+from redis.exceptions import ConnectionError as RedisConnectionError
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.cache import users as user_cache
+from app.cache.client import cache
+from app.cache.users import get_cached_user
 from app.db.models import User
 
 logger = logging.getLogger(__name__)
@@ -115,6 +120,9 @@ async def test_get_all_users(async_client: AsyncClient, create_user) -> None:
     assert any(u["email"] == "test@example.com" for u in data)
     assert any(u["email"] == "test.false@example.com" for u in data)
 
+    single = (await async_client.get(f"/users/{data[0]['id']}")).json()
+    assert list(data[0].items()) == list(single.items())
+
 
 @pytest.mark.asyncio
 async def test_update_user(async_client: AsyncClient, create_user, auth_header) -> None:
@@ -142,6 +150,59 @@ async def test_update_user(async_client: AsyncClient, create_user, auth_header)
     assert response_with_false_header.status_code == 403
 
 
+@pytest.mark.asyncio
+async def test_patch_user(async_client: AsyncClient, create_user, auth_header) -> None:
+    """Тест частичного обновления пользователя."""
+    true_user = await create_user(
+        USER_TRUE_EMAIL, USER_TRUE_USERNAME, USER_TRUE_PASSWORD
+    )
+    true_header = await auth_header(USER_TRUE_EMAIL, USER_TRUE_PASSWORD)
+
+    _ = await create_user(USER_FALSE_EMAIL, USER_FALSE_USERNAME, USER_FALSE_PASSWORD)
+    false_header = await auth_header(USER_FALSE_EMAIL, USER_FALSE_PASSWORD)
+
+    response = await async_client.patch(
+        f"/users/{true_user.id}", json={"username": NEW_USERNAME}, headers=true_header
+    )
+    assert response.status_code == 200
+    data = response.json()
+    assert data["username"] == NEW_USERNAME
+    assert data["email"] == USER_TRUE_EMAIL
+
+    response = await async_client.patch(
+        f"/users/{true_user.id}", json={"username": NEW_USERNAME}, headers=true_header
+    )
+    assert response.status_code == 200
+    assert response.json() == data
+
+    response_with_false_header = await async_client.patch(
+        f"/users/{true_user.id}", json={"username": NEW_USERNAME}, headers=false_header
+    )
+    assert response_with_false_header.status_code == 403
+
+
+@pytest.mark.asyncio
+async def test_auth_user_cache(async_client: AsyncClient, create_user, auth_header) -> None:
+    """Тест кэширования пользователя при аутентификации и его инвалидации."""
+    true_user = await create_user(
+        USER_TRUE_EMAIL, USER_TRUE_USERNAME, USER_TRUE_PASSWORD
+    )
+    true_header = await auth_header(USER_TRUE_EMAIL, USER_TRUE_PASSWORD)
+    assert await get_cached_user(true_user.id) is None
+
+    response = await async_client.post("/tasks", json={"title": "cached"}, headers=true_header)
+    assert response.status_code == 201
+    cached = await get_cached_user(true_user.id)
+    assert cached is not None
+    assert cached.email == USER_TRUE_EMAIL
+
+    response = await async_client.patch(
+        f"/users/{true_user.id}", json={"username": NEW_USERNAME}, headers=true_header
+    )
+    assert response.status_code == 200
+    assert await get_cached_user(true_user.id) is None
+
+
 @pytest.mark.asyncio
 async def test_delete_user(async_client: AsyncClient, create_user, auth_header) -> None:
     """Тест удаления пользователя."""
@@ -163,3 +224,67 @@ async def test_delete_user(async_client: AsyncClient, create_user, auth_header)
 
     response_check = await async_client.get(f"/users/{true_user.id}")
     assert response_check.status_code == 404
+
+
+class BrokenRedis:
+    """Redis отзывов, который недоступен."""
+
+    async def get(self, *args, **kwargs):
+        raise RedisConnectionError("down")
+
+    async def set(self, *args, **kwargs):
+        raise RedisConnectionError("down")
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("store", ["database", "redis", "broken_redis"])
+async def test_deleted_user_tokens_are_revoked(
+    async_client: AsyncClient, create_user, auth_header, monkeypatch, store
+) -> None:
+    """Тест: токен удалённого пользователя отклоняется, даже если общий кэш сброшен."""
+    if store == "redis":
+        monkeypatch.setattr(user_cache, "revocation_client", fakeredis.FakeAsyncRedis())
+    elif store == "broken_redis":
+        monkeypatch.setattr(user_cache, "revocation_client", BrokenRedis())
+    true_user = await create_user(USER_TRUE_EMAIL, USER_TRUE_USERNAME, USER_TRUE_PASSWORD)
+    true_header = await auth_header(USER_TRUE_EMAIL, USER_TRUE_PASSWORD)
+    assert (await async_client.get("/tasks/changes", headers=true_header)).status_code == 200
+
+    response = await async_client.delete(f"/users/{true_user.id}", headers=true_header)
+    assert response.status_code in (200, 204)
+    await cache.clear()
+
+    response = await async_client.get("/tasks/changes", headers=true_header)
+    assert response.status_code == 401
+
+
+@pytest.mark.asyncio
+async def test_user_etag(async_client: AsyncClient, create_user, auth_header) -> None:
+    """Тест ETag, ответа 304 и оптимистической блокировки PUT через If-Match."""
+    true_user = await create_user(
+        USER_TRUE_EMAIL, USER_TRUE_USERNAME, USER_TRUE_PASSWORD
+    )
+    true_header = await auth_header(USER_TRUE_EMAIL, USER_TRUE_PASSWORD)
+
+    response = await async_client.get(f"/users/{true_user.id}")
+    assert response.status_code == 200
+    etag = response.headers["ETag"]
+
+    response = await async_client.get(f"/users/{true_user.id}", headers={"If-None-Match": etag})
+    assert response.status_code == 304
+
+    payload = {"email": USER_TRUE_EMAIL, "username": NEW_USERNAME}
+    response = await async_client.put(
+        f"/users/{true_user.id}", json=payload, headers={**true_header, "If-Match": etag}
+    )
+    assert response.status_code == 200
+    assert response.headers["ETag"] != etag
+
+    response = await async_client.put(
+        f"/users/{true_user.id}", json=payload, headers={**true_header, "If-Match": etag}
+    )
+    assert response.status_code == 412
+
+    response = await async_client.get(f"/users/{true_user.id}", headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.json()["username"] == NEW_USERNAME